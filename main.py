@@ -1,10 +1,42 @@
-from sys import argv as sys_argv
+from sys import argv as sys_argv, stdin as sys_stdin
+from typing import Optional, Tuple
 from ns_engine import __version__ as ns_version, wrapper as ns_wrapper
-from ns_engine.utils.misc import get_filedata, look_like_path
+from ns_engine.utils.misc import load_source, look_like_path
+
+# stdin is read in blocks this big when running a script for each line
+STDIN_BUFFER_SIZE = 1 << 16
 
 def argument(shortflag: str, flag: str) -> bool:
     return (shortflag in sys_argv and shortflag != None) or (flag in sys_argv and flag != None)
 
+# The argument given after a flag, if the flag was given
+def option(shortflag: str, flag: str) -> Optional[str]:
+    for index, arg in enumerate(sys_argv[1:-1], 1):
+        if arg in (shortflag, flag): return sys_argv[index + 1]
+    
+    return None
+
+FLAGS = ("-ni", "--no-inline", "-v", "--version")
+OPTIONS = ("-e", "--eval", "-l", "--each-line", "--begin", "--end")
+
+# The first argument that isn't a flag or the value of an option, wherever the flags are, and the first flag that
+# isn't known
+def parse_arguments() -> Tuple[Optional[str], Optional[str]]:
+    script_arg = unknown_flag = None
+    args = iter(sys_argv[1:])
+    
+    for arg in args:
+        if arg in OPTIONS:
+            next(args, None)
+        elif arg in FLAGS:
+            continue
+        elif arg.startswith("-"):
+            unknown_flag = unknown_flag or arg
+        else:
+            script_arg = script_arg or arg
+    
+    return script_arg, unknown_flag
+
 def shell():
     print(f"Welcome to NakaScript v{ns_version} Shell")
     while True:
@@ -21,18 +53,34 @@ def shell():
         except KeyboardInterrupt:
             break
 
-def run(filename: str):
+def load(filename: str) -> Optional[str]:
     try:
-        source_code = get_filedata(filename)
+        return load_source(filename)
             
     except FileNotFoundError as e:
         print(f"Failed to load script \"{filename}\": {e}")
-        source_code = None
-         
+        return None
+
+def run(filename: str, **kwargs):
+    source_code = load(filename)
     if source_code is None or not source_code.strip(): return
 
     try:
-        _, error, _ = ns_wrapper.interpret(filename, source_code)
+        _, error, _ = ns_wrapper.interpret(filename, source_code, **kwargs)
+        if error: print(error.as_string())
+        
+    except KeyboardInterrupt:
+        return
+
+# Runs the script for every line of stdin like awk, with --begin and --end code ran before and after
+def each_line(filename: str, source_code: str, **kwargs):
+    # Logs aren't always valid UTF-8, a bad byte shows up as U+FFFD in its line instead of stopping the filter
+    stdin = open(sys_stdin.fileno(), "r", encoding="utf-8", errors="replace", buffering=STDIN_BUFFER_SIZE, closefd=False)
+    
+    try:
+        error, _ = ns_wrapper.interpret_each_line(
+            filename, source_code, stdin, option(None, "--begin"), option(None, "--end"), **kwargs
+        )
         if error: print(error.as_string())
         
     except KeyboardInterrupt:
@@ -40,14 +88,23 @@ def run(filename: str):
 
 if __name__ == "__main__":
     args_len = len(sys_argv) - 1
-    is_first_arg_scriptfile = False
+    script_arg, unknown_flag = parse_arguments()
+    
+    if unknown_flag is not None:
+        print(f"Unknown option \"{unknown_flag}\"")
+        raise SystemExit(2)
     
-    if args_len >= 1:
-        first_arg = sys_argv[1]
-        is_first_arg_scriptfile = look_like_path(first_arg)
+    optimizations = {"inlining": 0} if argument("-ni", "--no-inline") else None
+    inline_code = option("-e", "--eval")
+    each_line_filename = option("-l", "--each-line")
     
-    if is_first_arg_scriptfile:
-        run(first_arg)
+    if inline_code is not None:
+        each_line("<command line>", inline_code, optimizations=optimizations)
+    elif each_line_filename is not None:
+        source_code = load(each_line_filename)
+        if source_code is not None: each_line(each_line_filename, source_code, optimizations=optimizations)
+    elif script_arg is not None and look_like_path(script_arg):
+        run(script_arg, optimizations=optimizations)
     else:
         if not args_len:
             shell() 
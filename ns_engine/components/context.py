@@ -15,6 +15,10 @@ class Context:
     parent: Self = field(default=None)
     parent_entry_pos: Position = field(default=None)
     symbol_table: SymbolTable = field(default=None, init=False)
+    depth: int = field(default=0, init=False)
+    tail_calls: int = field(default=0, init=False)
+    # Something made in this frame can outlive the call, like a function, so it's never given back to the pool
+    pinned: bool = field(default=False, init=False)
     
     def __repr__(self) -> str:
         return f"Context(\"{self.name}\", {self.symbol_table}, {self.parent})"
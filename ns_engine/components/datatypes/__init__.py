@@ -1,10 +1,21 @@
 from typing import Any, TypeVar, TYPE_CHECKING, List as type_List, Dict as type_Dict
 from types import NoneType
+from array import array as type_array
+from builtins import range as type_range, set as type_set
 from .datatype import Datatype
 from .number import Number
 from .string import String
 from .list import List
 from .dict import Dict
+from .set import Set
+from .range import Range
+from .array import Array, numpy
+from .table import Table, Row, records_to_table
+from .generator import Generator
+from .stream import Stream
+from .deque import Deque
+from .heap import Heap
+from .file import File, MappedFile
 from .module import Module
 
 if TYPE_CHECKING:
@@ -22,17 +33,31 @@ def convert_to_datatype(value: Any) -> Datatype:
     elif isinstance(value, str):
         return String(value)
     elif isinstance(value, type_List):
+        # Records with the same fields are loaded straight into columns
+        if value and all(isinstance(v, type_Dict) for v in value) and (table := records_to_table(value)):
+            return table
+        
         new_value: list[Datatype] = [
             convert_to_datatype(v) if not isinstance(v, Datatype) else v for v in value
         ]
         return List(new_value)
     elif isinstance(value, type_Dict):
-        new_value: dict[str, Datatype] = {}
+        new_value: dict[int | float | str, Datatype] = {}
         
         for k, v in value.items():
-            new_value[str(k)] = convert_to_datatype(v) if not isinstance(v, Datatype) else v
+            key = k if isinstance(k, (int, float, str)) and not isinstance(k, bool) else str(k)
+            new_value[key] = convert_to_datatype(v) if not isinstance(v, Datatype) else v
         
         return Dict(new_value)
+    elif isinstance(value, (type_set, frozenset)) and all(isinstance(v, (int, float, str)) and not isinstance(v, bool) for v in value):
+        return Set(value)
+    elif isinstance(value, type_range):
+        return Range(value)
+    # Numbers already packed next to each other are used as they are
+    elif isinstance(value, type_array) and value.typecode not in ("u", "w"):
+        return Array(value)
+    elif numpy is not None and isinstance(value, numpy.ndarray) and value.ndim == 1 and value.dtype.kind in "iuf":
+        return Array(value)
     else:
         raise TypeError(f"Could not convert '{value}' to a Datatype")
 
@@ -42,6 +67,17 @@ __all__ = [
     "String",
     "List",
     "Dict",
+    "Set",
+    "Range",
+    "Array",
+    "Table",
+    "Row",
+    "Generator",
+    "Stream",
+    "Deque",
+    "Heap",
+    "File",
+    "MappedFile",
     "Module",
     
     "convert_to_datatype"
@@ -0,0 +1,238 @@
+from dataclasses import dataclass
+from array import array
+from itertools import repeat
+from operator import add, sub, mul, truediv, mod, lt, gt, le, ge
+from typing import Iterable, Iterator, Optional, Self, Tuple
+from .datatype import Datatype, DATATYPE_OR_ERROR
+from .number import Number
+from .range import Range
+from ..errors import NSRuntimeError
+
+# NumPy is optional, arrays are made with it when it's installed and with the array module otherwise
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+OPERATIONS = {
+    "+": add,
+    "-": sub,
+    "*": mul,
+    "/": truediv,
+    "**": pow,
+    "%": mod,
+    "<": lt,
+    ">": gt,
+    "<=": le,
+    ">=": ge
+}
+
+NUMPY_OPERATIONS = {
+    "+": "add",
+    "-": "subtract",
+    "*": "multiply",
+    "/": "true_divide",
+    "**": "power",
+    "%": "mod",
+    "<": "less",
+    ">": "greater",
+    "<=": "less_equal",
+    ">=": "greater_equal"
+}
+
+# Packs numbers into an int array if they are all ints that fit in 64 bits, into a float array otherwise
+def pack_numbers(numbers: Iterable[int | float]) -> array:
+    numbers = numbers if isinstance(numbers, (list, range)) else list(numbers)
+
+    if numpy is not None:
+        packed = numpy.array(numbers)
+        return packed if packed.dtype.kind in "if" else packed.astype(float)
+
+    try:
+        return array("q", numbers)
+    except (TypeError, OverflowError):
+        return array("d", numbers)
+
+def _python_number(number) -> int | float:
+    return number.item() if numpy is not None and isinstance(number, numpy.generic) else number
+
+# Numbers packed next to each other instead of one Number each. Arithmetic and < > <= >= with another Array or a
+# Number go through every element at once and give back a new Array, an Array itself is never changed
+@dataclass(slots=True)
+class Array(Datatype):
+    value: array
+
+    def __repr__(self) -> str:
+        return f"array([{', '.join([str(number) for number in self.value.tolist()])}])"
+
+    def __eq__(self, other: object) -> bool:
+        return self._same_numbers(other)
+
+    def _number(self, value: int | float) -> DATATYPE_OR_ERROR:
+        return Number(value).set_context(self.context), None
+
+    def _number_bool(self, value: bool) -> DATATYPE_OR_ERROR:
+        return self._number(int(value))
+
+    def _is_numpy(self, *values) -> bool:
+        return numpy is not None and any(isinstance(value, numpy.ndarray) for value in values)
+
+    def _operate(self, other: Datatype, operation: str) -> DATATYPE_OR_ERROR:
+        if isinstance(other, Array):
+            if len(other.value) != len(self.value):
+                return None, NSRuntimeError(
+                    "Both arrays must have the same length",
+                    other.pos_start, other.pos_end, self.context
+                )
+            right = other.value
+        elif isinstance(other, Number):
+            right = other.value
+        else:
+            return self._illegal_operation(other)
+
+        left = self.value
+
+        if self._is_numpy(left, right):
+            if operation in ("/", "%") and not numpy.all(right):
+                return None, NSRuntimeError(
+                    "Division by zero",
+                    other.pos_start, other.pos_end, self.context
+                )
+
+            try:
+                values = getattr(numpy, NUMPY_OPERATIONS[operation])(left, right)
+            except ValueError as e:
+                return None, NSRuntimeError(str(e), other.pos_start, other.pos_end, self.context)
+
+            # Comparisons give an array of 1 and 0 like they give a Number elsewhere
+            return self.new(values.astype(numpy.int64) if values.dtype.kind == "b" else values)
+
+        try:
+            values = list(map(OPERATIONS[operation], left, right if isinstance(other, Array) else repeat(right)))
+        except ZeroDivisionError:
+            return None, NSRuntimeError(
+                "Division by zero",
+                other.pos_start, other.pos_end, self.context
+            )
+        except OverflowError:
+            return None, NSRuntimeError(
+                "Result too large",
+                other.pos_start, other.pos_end, self.context
+            )
+
+        return self.new(pack_numbers(values))
+
+    def index_at(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        if isinstance(other, Number) and isinstance(other.value, int):
+            try:
+                return self._number(_python_number(self.value[other.value]))
+            except IndexError:
+                return None, NSRuntimeError(
+                    "Element at index doesn't exist, Out of bounds",
+                    other.pos_start, other.pos_end, self.context
+                )
+        elif isinstance(other, Range):
+            # NumPy slices are views of the same memory, array module slices are copied
+            indices = other.value
+            return self.new(self.value[indices.start:indices.stop:indices.step])
+        else:
+            return None, NSRuntimeError(
+                "'Array' datatype can be only indexed by 'Number: int' or 'Range'",
+                other.pos_start, other.pos_end, self.context
+            )
+
+    def slice_at(self, start: Optional[int], end: Optional[int], step: Optional[int]) -> DATATYPE_OR_ERROR:
+        return self.new(self.value[start:end:step])
+
+    def added_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._operate(other, "+")
+
+    def subtracted_by(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._operate(other, "-")
+
+    def multiplied_by(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._operate(other, "*")
+
+    def divided_by(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._operate(other, "/")
+
+    def powered_by(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._operate(other, "**")
+
+    def modulo_by(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._operate(other, "%")
+
+    def is_less_than(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._operate(other, "<")
+
+    def is_greater_than(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._operate(other, ">")
+
+    def is_less_equal_than(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._operate(other, "<=")
+
+    def is_greater_equal_than(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._operate(other, ">=")
+
+    def iterate(self) -> Tuple[Iterator[Datatype], None]:
+        context = self.context
+        value = self.value
+        return (Number(number).set_context(context) for number in (value.tolist() if self._is_numpy(value) else value)), None
+
+    def _same_numbers(self, other: Datatype) -> bool:
+        return isinstance(other, Array) and self.numbers() == other.numbers()
+
+    def equality_parts(self, other: Self) -> bool:
+        return self._same_numbers(other)
+
+    def is_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self._same_numbers(other))
+
+    def is_not_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(not self._same_numbers(other))
+
+    def and_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() and other.is_true())
+
+    def or_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() or other.is_true())
+
+    def notted(self) -> DATATYPE_OR_ERROR:
+        return self._number(0 if len(self.value) else 1)
+
+    def is_true(self) -> bool:
+        return len(self.value) != 0
+
+    # Native versions of the builtins working on numbers, used by them when they are given an Array
+
+    def numbers(self) -> list[int | float]:
+        return self.value.tolist()
+
+    def total(self) -> int | float:
+        value = self.value
+        return _python_number(value.sum()) if self._is_numpy(value) else sum(value)
+
+    def mean(self) -> float:
+        return self.total() / len(self.value)
+
+    def smallest(self) -> int | float:
+        value = self.value
+        return _python_number(value.min()) if self._is_numpy(value) else min(value)
+
+    def largest(self) -> int | float:
+        value = self.value
+        return _python_number(value.max()) if self._is_numpy(value) else max(value)
+
+    def sorted(self) -> Self:
+        value = self.value
+
+        if self._is_numpy(value):
+            return Array(numpy.sort(value))
+
+        return Array(array(value.typecode, sorted(value)))
+
+    def dot(self, other: Self) -> int | float:
+        if self._is_numpy(self.value, other.value):
+            return _python_number(numpy.dot(self.value, other.value))
+
+        return sum(map(mul, self.value, other.value))
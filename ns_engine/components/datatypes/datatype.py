@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Any, Self, Tuple, Optional
+from typing import Any, ClassVar, Iterable, Iterator, Self, Tuple, Optional
 from copy import deepcopy
 from ..position import Position
 from ..context import Context
@@ -16,9 +16,20 @@ class Datatype:
     
     _values_to_copy: Tuple[str] = field(default=None, init=False)
     
+    # Bumped by every in place change of a datatype, values cached from reading datatypes are stale once it moves
+    mutations: ClassVar[int] = 0
+    
+    # Datatypes whose value is a plain Python value, values_equal and compare_values compare it directly
+    compared_by_value: ClassVar[bool] = False
+    
     def _value_copy(self) -> Any:
         return deepcopy(self.value)
     
+    # Datatypes changed in place (List, Dict) get a value of their own when bound to another name, so changing one
+    # name doesn't change the other
+    def detached(self) -> Self:
+        return self
+    
     def _illegal_operation(self, other: Self = None) -> Tuple[None, NSRuntimeError]:
         other = other or self
         
@@ -27,6 +38,9 @@ class Datatype:
             self.pos_start, other.pos_end, self.context
             )
     
+    def _mutated(self):
+        Datatype.mutations += 1
+    
     def _readonly_state(self, other: Self = None) -> Tuple[None, NSRuntimeError]:
         other = other or self
         
@@ -76,6 +90,10 @@ class Datatype:
     def access_at(self, attribute_name: str) -> Tuple[Optional[Self], Optional[Error]]:
         return self._illegal_operation()
 
+    # Python slice bounds, each one None when it was left out
+    def slice_at(self, start: Optional[int], end: Optional[int], step: Optional[int]) -> Tuple[Optional[Self], Optional[Error]]:
+        return self._illegal_operation()
+
     def update_index_at(self, other: Self, new: Self) -> Tuple[Optional[Self], Optional[Error]]:
         return self._illegal_operation(other)
  
@@ -130,7 +148,88 @@ class Datatype:
     def execute(self) -> Tuple[Optional[Self], Optional[Error]]:
         return self._illegal_operation()
     
+    # Iterator over the elements a for-in loop goes through, taken when the loop starts. Producing an element can
+    # fail, the iterator then gives back the Error as its last element
+    def iterate(self) -> Tuple[Optional[Iterator[Self]], Optional[Error]]:
+        return None, NSRuntimeError(
+            f"'{type(self).__name__}' datatypes are not iterable",
+            self.pos_start, self.pos_end, self.context
+        )
+    
     def is_true(self) -> bool:
         return False
     
+    # What values_equal still has to check once both datatypes have the same type, either the answer or the pairs of
+    # children that must all be equal too. Datatypes without children fall back to their is_equal_to
+    def equality_parts(self, other: Self) -> bool | Iterable[Tuple[Self, Self]]:
+        result, error = self.is_equal_to(other)
+        return error is None and result.is_true()
+    
+    # Same for compare_values, either -1, 0 or 1, None when they can't be ordered, or the pairs of children to compare
+    # in order where an int decides once every pair before it compared equal
+    def ordering_parts(self, other: Self) -> Optional[int | Iterable[Tuple[Self, Self] | int]]:
+        return None
+    
 DATATYPE_OR_ERROR = Tuple[Optional[Datatype], Optional[Error]]
+
+# Structural equality and ordering by value only. Nested datatypes are walked with a stack of iterators instead of
+# recursion, so how deep they nest doesn't matter
+
+def values_equal(left: Datatype, right: Datatype) -> bool:
+    stack = [iter(((left, right), ))]
+    
+    while stack:
+        pairs = stack.pop()
+        
+        for left, right in pairs:
+            if left is right: continue
+            if type(left) is not type(right): return False
+            
+            if left.compared_by_value:
+                if left.value != right.value: return False
+                continue
+            
+            parts = left.equality_parts(right)
+            
+            if parts is True: continue
+            if parts is False: return False
+            
+            # Finish the children first, then come back to the rest of these pairs
+            stack.append(pairs)
+            stack.append(iter(parts))
+            break
+    
+    return True
+
+def compare_values(left: Datatype, right: Datatype) -> Optional[int]:
+    stack = [iter(((left, right), ))]
+    
+    while stack:
+        parts = stack.pop()
+        
+        for part in parts:
+            if type(part) is int:
+                if part: return part
+                continue
+            
+            left, right = part
+            if left is right: continue
+            if type(left) is not type(right): return None
+            
+            if left.compared_by_value:
+                value, other_value = left.value, right.value
+                if value != other_value: return -1 if value < other_value else 1
+                continue
+            
+            children = left.ordering_parts(right)
+            
+            if children is None: return None
+            if type(children) is int:
+                if children: return children
+                continue
+            
+            stack.append(parts)
+            stack.append(iter(children))
+            break
+    
+    return 0
@@ -0,0 +1,114 @@
+from dataclasses import dataclass
+from collections import deque
+from typing import Iterable, Iterator, Self, Tuple
+from .datatype import Datatype, DATATYPE_OR_ERROR, values_equal
+from .number import Number
+from .list import List
+from ..errors import NSRuntimeError
+from ns_engine.utils.persistent import CopyOnWrite
+
+# Elements pushed and popped at both ends in constant time, where popping the front of a List moves every element
+# after it. Copies share the deque until one of them changes it, see CopyOnWrite. The pushes and pops other than +
+# are methods, see deque_methods
+@dataclass(slots=True)
+class Deque(Datatype):
+    value: CopyOnWrite
+
+    def __post_init__(self):
+        if not isinstance(self.value, CopyOnWrite):
+            self.value = CopyOnWrite(deque(self.value))
+
+    def __repr__(self) -> str:
+        return f"deque([{', '.join([repr(x) for x in self.value])}])"
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is Deque and values_equal(self, other)
+
+    def _value_copy(self) -> CopyOnWrite:
+        return self.value.copy()
+
+    def detached(self) -> Self:
+        detached = self.copy()
+        detached.value = self._value_copy()
+        return detached
+
+    def _number(self, value: int | float) -> DATATYPE_OR_ERROR:
+        return Number(value).set_context(self.context), None
+
+    def _number_bool(self, value: bool) -> DATATYPE_OR_ERROR:
+        return self._number(int(value))
+
+    def access_at(self, attribute_name: str) -> DATATYPE_OR_ERROR:
+        from .functions import bound_method, deque_methods
+        return bound_method(self, attribute_name, deque_methods)
+
+    def _checked_index(self, other: Datatype) -> Tuple[int, NSRuntimeError]:
+        if not isinstance(other, Number) or not isinstance(other.value, int):
+            return None, NSRuntimeError(
+                "'Deque' datatype can be only indexed by 'Number: int'",
+                other.pos_start, other.pos_end, self.context
+            )
+
+        if not -len(self.value) <= other.value < len(self.value):
+            return None, NSRuntimeError(
+                "Element at index doesn't exist, Out of bounds",
+                other.pos_start, other.pos_end, self.context
+            )
+
+        return other.value, None
+
+    def index_at(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        index, error = self._checked_index(other)
+        if error: return None, error
+
+        return self.value[index], None
+
+    def update_index_at(self, other: Datatype, new: Datatype) -> DATATYPE_OR_ERROR:
+        index, error = self._checked_index(other)
+        if error: return None, error
+
+        self.value.writable()[index] = new
+        self._mutated()
+        return None, None
+
+    def added_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        self.value.writable().append(other.detached())
+        self._mutated()
+        return None, None
+
+    def multiplied_by(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        if isinstance(other, (List, Deque)):
+            self.value.writable().extend(other.value)
+            self._mutated()
+            return None, None
+        else:
+            return self._illegal_operation(other)
+
+    def iterate(self) -> Tuple[Iterator[Datatype], None]:
+        # Changing a deque while going through it is an error in Python, so the loop goes through a copy that only
+        # gets made if the deque is changed
+        return iter(self.value.copy()), None
+
+    def equality_parts(self, other: Self) -> bool | Iterable[Tuple[Datatype, Datatype]]:
+        elements, other_elements = self.value, other.value
+
+        if len(elements) != len(other_elements): return False
+        return zip(elements, other_elements)
+
+    def is_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(values_equal(self, other))
+
+    def is_not_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(not values_equal(self, other))
+
+    def and_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() and other.is_true())
+
+    def or_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() or other.is_true())
+
+    def notted(self) -> DATATYPE_OR_ERROR:
+        return self._number(0 if self.value else 1)
+
+    def is_true(self) -> bool:
+        return len(self.value) != 0
@@ -1,29 +1,58 @@
 from dataclasses import dataclass
-from .datatype import Datatype, DATATYPE_OR_ERROR
+from typing import Iterable, Iterator, Self, Tuple
+from .datatype import Datatype, DATATYPE_OR_ERROR, values_equal
 from .number import Number
 from .string import String
 from ..errors import NSRuntimeError
+from ns_engine.utils.persistent import HashMap
+
+KEY_TYPES = (Number, String)
+
+# Keys are kept as the Python value of their Number or String, this gives them back as one
+def box_key(key: int | float | str) -> Datatype:
+    return String(key) if type(key) is str else Number(key)
 
 @dataclass(slots=True)
 class Dict(Datatype):
-    value: dict[str, Datatype]
+    value: HashMap
+
+    def __post_init__(self):
+        if not isinstance(self.value, HashMap):
+            self.value = HashMap(self.value)
 
     def __repr__(self) -> str:
         display = ""
 
         for index, (k, v) in enumerate(self.value.items()):
-            display += f"\"{k}\": {repr(v)}" + (", " if index < len(self.value) - 1 and len(self.value) > 1 else "")
+            display += f"{repr(box_key(k))}: {repr(v)}" + (", " if index < len(self.value) - 1 and len(self.value) > 1 else "")
         
         return f"{{{display}}}"
 
+    def __eq__(self, other: object) -> bool:
+        return type(other) is Dict and values_equal(self, other)
+
+    def _value_copy(self) -> HashMap:
+        return self.value.copy()
+    
+    def detached(self) -> Self:
+        detached = self.copy()
+        detached.value = self._value_copy()
+        return detached
+
     def _number(self, value: int | float) -> DATATYPE_OR_ERROR:
         return Number(value).set_context(self.context), None
 
     def _number_bool(self, value: bool) -> DATATYPE_OR_ERROR:
         return self._number(int(value))
 
+    def _wrong_key(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return None, NSRuntimeError(
+            "'Dict' datatype can be only indexed by 'String' or 'Number'",
+            other.pos_start, other.pos_end, self.context
+        )
+
     def index_at(self, other: Datatype) -> DATATYPE_OR_ERROR:
-        if isinstance(other, String):
+        if isinstance(other, KEY_TYPES):
             try:
                 return self.value[other.value], None
             except KeyError:
@@ -32,32 +61,28 @@ class Dict(Datatype):
                     other.pos_start, other.pos_end, self.context
                 )
         else:
-            return None, NSRuntimeError(
-                "'Dict' datatype can be only indexed by 'String'",
-                other.pos_start, other.pos_end, self.context
-            )
+            return self._wrong_key(other)
     
     def update_index_at(self, other: Datatype, new: Datatype) -> DATATYPE_OR_ERROR:
         if on_readonly := self._readonly_state(other): return on_readonly
         
-        if isinstance(other, String):
+        if isinstance(other, KEY_TYPES):
             self.value[other.value] = new
+            self._mutated()
             return None, None
         else:
-            return None, NSRuntimeError(
-                "'Dict' datatype can be only indexed by 'String'",
-                other.pos_start, other.pos_end, self.context
-            )
+            return self._wrong_key(other)
     
     def subtracted_by(self, other: Datatype) -> DATATYPE_OR_ERROR:
         if on_readonly := self._readonly_state(other): return on_readonly
             
-        if isinstance(other, String):
+        if isinstance(other, KEY_TYPES):
             try:
                 del self.value[other.value]
+                self._mutated()
                 return None, None
             except KeyError:
-                None, NSRuntimeError(
+                return None, NSRuntimeError(
                     f"Key '{other.value}' doesn't exist",
                     other.pos_start, other.pos_end, self.context
                 )
@@ -69,25 +94,43 @@ class Dict(Datatype):
             
         if isinstance(other, Dict):
             self.value.update(other.value)
+            self._mutated()
             return None, None
         else:
             return self._illegal_operation(other)
 
+    def iterate(self) -> Tuple[Iterator[Datatype], None]:
+        keys = self.value.copy()
+        return (box_key(key).set_context(self.context) for key in keys), None
+
+    def equality_parts(self, other: Self) -> bool | Iterable[Tuple[Datatype, Datatype]]:
+        entries, other_entries = self.value, other.value
+        
+        if entries.shares_contents(other_entries): return True
+        if len(entries) != len(other_entries): return False
+        
+        return self._value_pairs(other_entries)
+    
+    def _value_pairs(self, other_entries: HashMap) -> Iterator[Tuple[Datatype, Datatype]]:
+        for key, value in self.value.items():
+            # A missing key pairs the value with None, which never equals a datatype
+            yield value, other_entries.get(key)
+
     def is_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
-        return self._number_bool(self.value == other.value)
+        return self._number_bool(values_equal(self, other))
     
     def is_not_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
-        return self._number_bool(self.value != other.value)
+        return self._number_bool(not values_equal(self, other))
      
     def and_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
-        return self._number_bool(self.value and other.value)
+        return self._number_bool(self.is_true() and other.is_true())
     
     def or_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
-        return self._number_bool(self.value or other.value)
+        return self._number_bool(self.is_true() or other.is_true())
     
     def notted(self) -> DATATYPE_OR_ERROR:
-        return self._number(1 if self.value == {} else 0)
+        return self._number(0 if self.value else 1)
 
     def is_true(self) -> bool:
-        return self.value != {}
+        return len(self.value) != 0
     
\ No newline at end of file
@@ -0,0 +1,231 @@
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import islice
+from mmap import mmap
+from typing import Iterator, Optional, TextIO, Tuple
+from .datatype import Datatype, DATATYPE_OR_ERROR
+from .number import Number
+from .string import String
+from ..errors import Error, NSRuntimeError
+from ns_engine.utils.rope import Rope
+
+READ = "r"
+WRITE = "w"
+APPEND = "a"
+
+FILE_MODES = (READ, WRITE, APPEND)
+
+# A file read or written a piece at a time through a buffered handle, so its size doesn't matter. Reading gives its
+# lines without the newline, or chunks of chunk_size characters, and a File without a handle opens the file again
+# for every pass and closes it once the pass is done, see readLines. The reads and writes are methods, see
+# file_methods
+@dataclass(slots=True)
+class File(Datatype):
+    value: Optional[TextIO]
+    path: str
+    mode: str = field(default=READ)
+    chunk_size: int = field(default=None)
+
+    def __post_init__(self):
+        self._values_to_copy = ("value", "path", "mode", "chunk_size")
+
+    def __repr__(self) -> str:
+        return f"<file \"{self.path}\" ({self.mode})>"
+
+    def _number_bool(self, value: bool) -> DATATYPE_OR_ERROR:
+        return Number(int(value)).set_context(self.context), None
+
+    def _error(self, details: str) -> NSRuntimeError:
+        return NSRuntimeError(details, self.pos_start, self.pos_end, self.context)
+
+    def with_chunk_size(self, chunk_size: Optional[int]) -> "File":
+        return File(self.value, self.path, self.mode, chunk_size).set_context(self.context)
+
+    def access_at(self, attribute_name: str) -> DATATYPE_OR_ERROR:
+        from .functions import bound_method, file_methods
+        return bound_method(self, attribute_name, file_methods)
+
+    def usable_for(self, mode: str) -> Error:
+        if self.value is not None and self.value.closed:
+            return self._error(f"File \"{self.path}\" is closed")
+
+        if (mode == READ) != (self.mode == READ):
+            return self._error(f"File \"{self.path}\" isn't open for {'reading' if mode == READ else 'writing'}")
+
+        return None
+
+    def iterate(self) -> Tuple[Iterator[Datatype], Error]:
+        error = self.usable_for(READ)
+        if error: return None, error
+
+        return self._pieces(), None
+
+    def _pieces(self) -> Iterator[Datatype]:
+        handle = self.value
+
+        try:
+            if handle is None: handle = open(self.path, "r", encoding="utf-8")
+
+            if self.chunk_size:
+                for chunk in iter(partial(handle.read, self.chunk_size), ""):
+                    yield String(chunk).set_context(self.context)
+            else:
+                for line in handle:
+                    yield String(line[:-1] if line[-1:] == "\n" else line).set_context(self.context)
+        except (OSError, UnicodeDecodeError) as e:
+            yield self._error(f"Failed to read \"{self.path}\": {e}")
+        finally:
+            if self.value is None and handle is not None: handle.close()
+
+    def write(self, data: Datatype) -> Error:
+        error = self.usable_for(WRITE)
+        if error: return error
+
+        return write_datatype(self.value, data, self.path)
+
+    def close(self):
+        if self.value is not None: self.value.close()
+        self._mutated()
+
+    def _same_file(self, other: Datatype) -> bool:
+        return isinstance(other, File) and self.value is other.value and self.path == other.path
+
+    def is_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self._same_file(other))
+
+    def is_not_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(not self._same_file(other))
+
+    def and_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() and other.is_true())
+
+    def or_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() or other.is_true())
+
+    def is_true(self) -> bool:
+        return True
+
+# Writes a String as it is, the pieces of a Rope one by one instead of joining them first. Anything else is iterated
+# and each element is written on a line of its own, so a Stream is written as it's produced
+def write_datatype(handle: TextIO, data: Datatype, path: str) -> Error:
+    try:
+        if isinstance(data, String):
+            text = data.text
+
+            if type(text) is Rope:
+                handle.writelines(islice(text.pieces, text.count))
+            else:
+                handle.write(text)
+
+            return None
+
+        elements, error = data.iterate()
+        if error: return error
+
+        for element in elements:
+            if isinstance(element, Error): return element
+            handle.write(f"{element}\n")
+    except OSError as e:
+        return NSRuntimeError(f"Failed to write \"{path}\": {e}", data.pos_start, data.pos_end, data.context)
+
+    return None
+
+# The bytes of a file mapped into memory and left there, read-only. Only what gets taken out of it is decoded into a
+# String, a line at a time when iterating or a range of bytes when slicing, so scanning or searching a file doesn't
+# copy it. Empty files can't be mapped and are held as empty bytes
+@dataclass(slots=True)
+class MappedFile(Datatype):
+    value: mmap | bytes
+    path: str
+
+    def __post_init__(self):
+        self._values_to_copy = ("value", "path")
+
+    def __repr__(self) -> str:
+        return f"<mapped file \"{self.path}\">"
+
+    def _number(self, value: int | float) -> DATATYPE_OR_ERROR:
+        return Number(value).set_context(self.context), None
+
+    def _number_bool(self, value: bool) -> DATATYPE_OR_ERROR:
+        return self._number(int(value))
+
+    def _decoded(self, data: bytes) -> Tuple[String, Error]:
+        try:
+            return String(data.decode("utf-8")).set_context(self.context), None
+        except UnicodeDecodeError as e:
+            return None, NSRuntimeError(
+                f"Failed to decode \"{self.path}\": {e}",
+                self.pos_start, self.pos_end, self.context
+            )
+
+    def is_closed(self) -> bool:
+        return getattr(self.value, "closed", False)
+
+    def closed_error(self) -> Error:
+        if not self.is_closed(): return None
+
+        return NSRuntimeError(
+            f"Mapped file \"{self.path}\" is closed",
+            self.pos_start, self.pos_end, self.context
+        )
+
+    def access_at(self, attribute_name: str) -> DATATYPE_OR_ERROR:
+        from .functions import bound_method, mapped_file_methods
+        return bound_method(self, attribute_name, mapped_file_methods)
+
+    # Offsets are in bytes
+    def slice_at(self, start: Optional[int], end: Optional[int], step: Optional[int]) -> DATATYPE_OR_ERROR:
+        error = self.closed_error()
+        if error: return None, error
+
+        return self._decoded(self.value[start:end:step])
+
+    def find(self, text: str, start: int = 0) -> int:
+        return self.value.find(text.encode("utf-8"), start)
+
+    def iterate(self) -> Tuple[Iterator[Datatype], Error]:
+        error = self.closed_error()
+        if error: return None, error
+
+        return self._lines(), None
+
+    def _lines(self) -> Iterator[Datatype]:
+        data = self.value
+        start, size = 0, len(data)
+
+        while start < size:
+            newline = data.find(b"\n", start)
+            if newline == -1: newline = size
+
+            end = newline - 1 if newline > start and data[newline - 1] == 13 else newline
+            line, error = self._decoded(data[start:end])
+            if error:
+                yield error
+                return
+
+            yield line
+            start = newline + 1
+
+    def close(self):
+        if isinstance(self.value, mmap): self.value.close()
+        self._mutated()
+
+    def is_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(isinstance(other, MappedFile) and self.value is other.value)
+
+    def is_not_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(not isinstance(other, MappedFile) or self.value is not other.value)
+
+    def and_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() and other.is_true())
+
+    def or_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() or other.is_true())
+
+    def notted(self) -> DATATYPE_OR_ERROR:
+        return self._number(0 if self.is_true() else 1)
+
+    # A closed mapping has no size anymore, it's false like an empty one
+    def is_true(self) -> bool:
+        return not self.is_closed() and len(self.value) != 0
@@ -1,9 +1,13 @@
 from .base_function import BaseFunction
 from .function import Function
-from .builtin_functions import BuiltInFunction, built_in_functions
+from .builtin_functions import (
+    BuiltInFunction, built_in_functions, pure_built_in_functions, stream_methods, deque_methods, heap_methods,
+    file_methods, mapped_file_methods, bound_method
+)
 
 __all__ = [
     "BaseFunction",
     "Function",
-    "BuiltInFunction", "built_in_functions"
+    "BuiltInFunction", "built_in_functions", "pure_built_in_functions", "stream_methods", "deque_methods", "heap_methods",
+    "file_methods", "mapped_file_methods", "bound_method"
 ]
\ No newline at end of file
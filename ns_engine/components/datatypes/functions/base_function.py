@@ -4,6 +4,47 @@ from ..datatype import Datatype
 from ns_engine.components.errors import NSRuntimeError
 from ns_engine.components.runtime import RuntimeResult
 from ns_engine.components.context import Context
+from ns_engine.components.position import Position
+
+# Frames (a Context and its SymbolTable) given back by finished calls, so the next calls can reuse them
+FRAME_POOL_SIZE = 64
+frame_pool: list[Context] = []
+
+def acquire_frame(name: str, parent: Context, parent_entry_pos: Position) -> Context:
+    if frame_pool:
+        frame = frame_pool.pop()
+        frame.name = name
+        frame.parent = parent
+        frame.parent_entry_pos = parent_entry_pos
+        frame.symbol_table.parent = parent.symbol_table
+        frame.depth = parent.depth + 1
+        return frame
+    
+    from ns_engine.components.symbol_table import SymbolTable
+    
+    frame = Context(name, parent, parent_entry_pos)
+    frame.symbol_table = SymbolTable(parent.symbol_table)
+    frame.depth = parent.depth + 1
+    return frame
+
+# Keeps context and every frame it looks names up through out of the pool, a function defined in it or a generator
+# running in it still needs them after their calls have returned
+def pin_frames(context: Context):
+    while context and not context.pinned:
+        context.pinned = True
+        context = context.parent
+
+def release_frame(frame: Context):
+    if frame.pinned or len(frame_pool) >= FRAME_POOL_SIZE: return
+    
+    symbol_table = frame.symbol_table
+    symbol_table.reset()
+    symbol_table.parent = None
+    frame.parent = None
+    frame.parent_entry_pos = None
+    frame.tail_calls = 0
+    
+    frame_pool.append(frame)
 
 @dataclass(slots=True)
 class BaseFunction(Datatype):
@@ -18,6 +59,7 @@ class BaseFunction(Datatype):
 
         new_context = Context(self.name, self.context, self.pos_start)
         new_context.symbol_table = SymbolTable(new_context.parent.symbol_table)
+        new_context.depth = new_context.parent.depth + 1
         
         return new_context
     
@@ -1,6 +1,16 @@
-from .builtin_function import BuiltInFunction, built_in_functions
+from .builtin_function import (
+    BuiltInFunction, built_in_functions, pure_built_in_functions, stream_methods, deque_methods, heap_methods,
+    file_methods, mapped_file_methods, bound_method
+)
 
 __all__ = [
     "BuiltInFunction",
-    "built_in_functions"
+    "built_in_functions",
+    "pure_built_in_functions",
+    "stream_methods",
+    "deque_methods",
+    "heap_methods",
+    "file_methods",
+    "mapped_file_methods",
+    "bound_method"
 ]
\ No newline at end of file
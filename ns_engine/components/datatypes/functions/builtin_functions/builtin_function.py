@@ -1,25 +1,40 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Callable
 from types import MethodType, NoneType
 from os import name as os_name, system as os_system
-from os.path import abspath as osp_abspath
+from os.path import abspath as osp_abspath, getsize as osp_getsize
 from random import random, randint
+from mmap import mmap, ACCESS_READ
+from time import perf_counter
+from operator import mul
 from ..base_function import BaseFunction
-from ns_engine.components.datatypes import Datatype, Number, String, List, Module
-from ns_engine.components.errors import NSRuntimeError
+from ..function import Function
+from ns_engine.components.datatypes import Datatype, Number, String, List, Dict, Set, Range, Array, Table, Stream, Deque, Heap, File, MappedFile, Module
+from ns_engine.components.datatypes.dict import KEY_TYPES
+from ns_engine.components.datatypes.array import pack_numbers
+from ns_engine.components.datatypes.table import COLUMN, make_column, records_to_table, column_values
+from ns_engine.components.datatypes.stream import MAP, FILTER, TAKE, SKIP, CHUNK
+from ns_engine.components.datatypes.file import READ, WRITE, APPEND, FILE_MODES, write_datatype
+from ns_engine.components.errors import Error, NSRuntimeError
 from ns_engine.components.runtime import RuntimeResult
 from ns_engine.components.context import Context
-from ns_engine.utils.misc import get_filedata
+from ns_engine.components import output
+from ns_engine.utils.misc import load_source
 
 @dataclass(slots=True)
 class BuiltInFunction(BaseFunction):
     arg_names: tuple[str]
     logic_function: Callable
+    # The datatype a method was accessed on, see stream_methods
+    bound_datatype: Datatype = field(default=None)
 
     def __post_init__(self):
-        self._values_to_copy = ("name", "arg_names", "logic_function")
+        self._values_to_copy = ("name", "arg_names", "logic_function", "bound_datatype")
 
     def __repr__(self) -> str:
+        if self.bound_datatype is not None:
+            return f"<built-in method \"{self.name}\">"
+        
         return f"<built-in function \"{self.name}\">"
 
     def _rt_result_success(self, datatype: Datatype) -> RuntimeResult:
@@ -41,27 +56,51 @@ class BuiltInFunction(BaseFunction):
         
         arg_names = tuple([self.arg_names]) if not isinstance(self.arg_names, (list, tuple, NoneType)) else self.arg_names
 
-        rt_result.register(self.check_populate_args(arg_names or tuple(), args, context))
-        if rt_result.should_return():
-            return rt_result
+        # "*name" takes any number of arguments, given to the logic function as one List
+        if arg_names and arg_names[0][0] == "*":
+            for arg in args: arg.set_context(context)
+            context.symbol_table.set(arg_names[0][1:], List(args), "symbols")
+        else:
+            rt_result.register(self.check_populate_args(arg_names or tuple(), args, context))
+            if rt_result.should_return():
+                return rt_result
 
         value = rt_result.register(method(context) or self._rt_result_success(Number.null))
         if rt_result.should_return():
             return rt_result
 
         return rt_result.success(value)
+    
+    def call_back(self, function: BaseFunction, args: list[Datatype]) -> RuntimeResult:
+        # Errors inside the callback point at the builtin's call
+        if type(function) is Function:
+            return function.call(function.interpreter, args, self.pos_start, self.pos_end)
+        
+        return function.copy().set_pos(self.pos_start, self.pos_end).execute(args)
 
 def _print(_, context: Context):
-    print(str(context.get_symbol("value")))
+    values = context.get_symbol("values").value
+    
+    # One piece per print, the values are only joined with the rest of the buffer when it's flushed
+    if len(values) == 1:
+        output.channel.write(f"{values[0]}\n")
+    else:
+        output.channel.write(" ".join([str(value) for value in values]) + "\n")
+
+def _flush(_, __):
+    output.channel.flush()
 
 def _to_string(self: BuiltInFunction, context: Context):
     return self._rt_result_success(String(str(context.get_symbol("value"))))
 
 def _input(self: BuiltInFunction, _):
+    # Whatever was printed before, like a prompt, is shown before waiting
+    output.channel.flush()
     text = input()
     return self._rt_result_success(String(text))
 
 def _input_number(self: BuiltInFunction, _):
+    output.channel.flush()
     text = input()
     try:
         number = float(text) if "." in text else int(text)
@@ -70,6 +109,7 @@ def _input_number(self: BuiltInFunction, _):
         return None
 
 def _clear(*_):
+    output.channel.flush()
     os_system("cls" if os_name == "nt" else "clear")
 
 def _is_number(self: BuiltInFunction, context: Context):
@@ -84,6 +124,22 @@ def _is_list(self: BuiltInFunction, context: Context):
     is_list = isinstance(context.get_symbol("value"), List)
     return self._rt_result_success(Number.true if is_list else Number.false)
 
+def _is_array(self: BuiltInFunction, context: Context):
+    is_array = isinstance(context.get_symbol("value"), Array)
+    return self._rt_result_success(Number.true if is_array else Number.false)
+
+def _is_set(self: BuiltInFunction, context: Context):
+    is_set = isinstance(context.get_symbol("value"), Set)
+    return self._rt_result_success(Number.true if is_set else Number.false)
+
+def _is_deque(self: BuiltInFunction, context: Context):
+    is_deque = isinstance(context.get_symbol("value"), Deque)
+    return self._rt_result_success(Number.true if is_deque else Number.false)
+
+def _is_heap(self: BuiltInFunction, context: Context):
+    is_heap = isinstance(context.get_symbol("value"), Heap)
+    return self._rt_result_success(Number.true if is_heap else Number.false)
+
 def _is_function(self: BuiltInFunction, context: Context):
     is_function = isinstance(context.get_symbol("value"), BaseFunction)
     return self._rt_result_success(Number.true if is_function else Number.false)
@@ -104,6 +160,780 @@ def _random_int(self: BuiltInFunction, context: Context):
         
     return self._rt_result_success(Number(randint(min_.value, max_.value)))
 
+def _range(self: BuiltInFunction, context: Context):
+    return _make_range(self, context, Number(1))
+
+def _range_step(self: BuiltInFunction, context: Context):
+    return _make_range(self, context, context.get_symbol("step"))
+
+def _make_range(self: BuiltInFunction, context: Context, step: Datatype):
+    start = context.get_symbol("start")
+    end = context.get_symbol("end")
+    
+    if not all(isinstance(number, Number) and isinstance(number.value, int) for number in (start, end, step)):
+        return self._rt_result_failure(
+            "All arguments must be 'Number: int'",
+            context
+        )
+    
+    if step.value == 0:
+        return self._rt_result_failure(
+            "Step cannot be 0",
+            context
+        )
+    
+    return self._rt_result_success(Range(range(start.value, end.value, step.value)))
+
+def _elements(iterable: Datatype) -> tuple[list[Datatype], Error]:
+    if type(iterable) is List:
+        return list(iterable.value), None
+    
+    elements, error = iterable.iterate()
+    if error: return None, error
+    
+    elements = list(elements)
+    if elements and isinstance(elements[-1], Error): return None, elements[-1]
+    
+    return elements, None
+
+# The Python values of elements that are all Numbers or all Strings, so they can be added and compared natively
+def _unboxed(elements: list[Datatype]) -> list[int | float | str]:
+    element_type = type(elements[0]) if elements else Number
+    
+    if element_type is not Number and element_type is not String: return None
+    
+    for element in elements:
+        if type(element) is not element_type: return None
+    
+    return [element.value for element in elements]
+
+def _map(self: BuiltInFunction, context: Context):
+    return _call_for_each(self, context, False)
+
+def _filter(self: BuiltInFunction, context: Context):
+    return _call_for_each(self, context, True)
+
+def _call_for_each(self: BuiltInFunction, context: Context, is_filter: bool):
+    rt_result = RuntimeResult()
+    function = context.get_symbol("function")
+    
+    if not isinstance(function, BaseFunction):
+        return self._rt_result_failure(
+            "Argument 'function' must be a function",
+            context
+        )
+    
+    iterable = context.get_symbol("iterable")
+    
+    elements, error = iterable.iterate()
+    if error: return rt_result.failure(error)
+    
+    new_elements: list[Datatype] = []
+    
+    # A filtered Table stays a Table, the rows kept are taken from each column at once at the end
+    if is_filter and type(iterable) is Table:
+        mask: list[bool] = []
+        
+        for element in elements:
+            value = rt_result.register(self.call_back(function, [element]))
+            if rt_result.should_return(): return rt_result
+            
+            mask.append(value.is_true())
+        
+        return rt_result.success(iterable.masked(mask))
+    
+    for element in elements:
+        if isinstance(element, Error): return rt_result.failure(element)
+        
+        value = rt_result.register(self.call_back(function, [element]))
+        if rt_result.should_return(): return rt_result
+        
+        if not is_filter:
+            new_elements.append(value.detached())
+        elif value.is_true():
+            new_elements.append(element.detached())
+    
+    return rt_result.success(List(new_elements))
+
+def _reduce(self: BuiltInFunction, context: Context):
+    return _fold(self, context, context.get_symbol("iterable"))
+
+def _fold(self: BuiltInFunction, context: Context, iterable: Datatype):
+    rt_result = RuntimeResult()
+    function = context.get_symbol("function")
+    
+    if not isinstance(function, BaseFunction):
+        return self._rt_result_failure(
+            "Argument 'function' must be a function",
+            context
+        )
+    
+    elements, error = iterable.iterate()
+    if error: return rt_result.failure(error)
+    
+    value = context.get_symbol("initial")
+    
+    for element in elements:
+        if isinstance(element, Error): return rt_result.failure(element)
+        
+        value = rt_result.register(self.call_back(function, [value, element]))
+        if rt_result.should_return(): return rt_result
+    
+    return rt_result.success(value)
+
+def _sum(self: BuiltInFunction, context: Context):
+    iterable = context.get_symbol("iterable")
+    
+    if type(iterable) is Array:
+        return self._rt_result_success(Number(iterable.total()))
+    
+    numbers, failure = _numbers(self, context, iterable)
+    if failure: return failure
+    
+    return self._rt_result_success(Number(sum(numbers)))
+
+def _mean(self: BuiltInFunction, context: Context):
+    iterable = context.get_symbol("iterable")
+    
+    if type(iterable) is Array:
+        if not len(iterable.value):
+            return self._rt_result_failure("Cannot take the mean of an empty array", context)
+        
+        return self._rt_result_success(Number(iterable.mean()))
+    
+    numbers, failure = _numbers(self, context, iterable)
+    if failure: return failure
+    
+    if not len(numbers):
+        return self._rt_result_failure("Cannot take the mean of nothing", context)
+    
+    return self._rt_result_success(Number(sum(numbers) / len(numbers)))
+
+def _dot(self: BuiltInFunction, context: Context):
+    left = context.get_symbol("left")
+    right = context.get_symbol("right")
+    
+    if type(left) is Array and type(right) is Array:
+        if len(left.value) != len(right.value):
+            return self._rt_result_failure("Both arrays must have the same length", context)
+        
+        return self._rt_result_success(Number(left.dot(right)))
+    
+    left_numbers, failure = _numbers(self, context, left)
+    if failure: return failure
+    
+    right_numbers, failure = _numbers(self, context, right)
+    if failure: return failure
+    
+    if len(left_numbers) != len(right_numbers):
+        return self._rt_result_failure("Both arguments must have the same length", context)
+    
+    return self._rt_result_success(Number(sum(map(mul, left_numbers, right_numbers))))
+
+# The Python numbers an iterable goes through, when they are all Numbers
+def _numbers(self: BuiltInFunction, context: Context, iterable: Datatype) -> tuple[list[int | float], RuntimeResult]:
+    if type(iterable) is Range:
+        return iterable.value, None
+    
+    if type(iterable) is Array:
+        return iterable.numbers(), None
+    
+    elements, error = _elements(iterable)
+    if error: return None, RuntimeResult().failure(error)
+    
+    numbers = _unboxed(elements)
+    
+    if numbers is None or (elements and type(elements[0]) is not Number):
+        return None, self._rt_result_failure(
+            "All elements must be 'Number'",
+            context
+        )
+    
+    return numbers, None
+
+def _min(self: BuiltInFunction, context: Context):
+    return _extreme(self, context, min, Array.smallest, "minimum")
+
+def _max(self: BuiltInFunction, context: Context):
+    return _extreme(self, context, max, Array.largest, "maximum")
+
+def _extreme(self: BuiltInFunction, context: Context, pick: Callable, array_pick: Callable, description: str):
+    iterable = context.get_symbol("iterable")
+    
+    if type(iterable) is Array:
+        if not len(iterable.value):
+            return self._rt_result_failure(f"Cannot take the {description} of an empty array", context)
+        
+        return self._rt_result_success(Number(array_pick(iterable)))
+    
+    if type(iterable) is Range:
+        numbers = iterable.value
+        if not numbers:
+            return self._rt_result_failure(f"Cannot take the {description} of an empty range", context)
+        
+        # A range is already sorted one way or the other
+        ends = (numbers[0], numbers[-1])
+        return self._rt_result_success(Number(pick(ends)))
+    
+    elements, error = _elements(iterable)
+    if error: return RuntimeResult().failure(error)
+    
+    if not elements:
+        return self._rt_result_failure(f"Cannot take the {description} of nothing", context)
+    
+    values = _unboxed(elements)
+    
+    if values is None:
+        return self._rt_result_failure(
+            "Elements must be all 'Number' or all 'String'",
+            context
+        )
+    
+    return self._rt_result_success(elements[values.index(pick(values))])
+
+def _sort(self: BuiltInFunction, context: Context):
+    iterable = context.get_symbol("iterable")
+    
+    if type(iterable) is Array:
+        return self._rt_result_success(iterable.sorted())
+    
+    if type(iterable) is Range:
+        return self._rt_result_success(List([Number(number) for number in sorted(iterable.value)]))
+    
+    elements, error = _elements(iterable)
+    if error: return RuntimeResult().failure(error)
+    
+    values = _unboxed(elements)
+    
+    if values is None:
+        return self._rt_result_failure(
+            "Elements must be all 'Number' or all 'String'",
+            context
+        )
+    
+    return self._rt_result_success(List(_sorted_by(elements, values)))
+
+def _sort_by(self: BuiltInFunction, context: Context):
+    rt_result = RuntimeResult()
+    function = context.get_symbol("function")
+    
+    if not isinstance(function, BaseFunction):
+        return self._rt_result_failure(
+            "Argument 'function' must be a function",
+            context
+        )
+    
+    elements, error = _elements(context.get_symbol("iterable"))
+    if error: return rt_result.failure(error)
+    
+    # The key function is called once per element, not once per comparison
+    keys: list[Datatype] = []
+    
+    for element in elements:
+        keys.append(rt_result.register(self.call_back(function, [element])))
+        if rt_result.should_return(): return rt_result
+    
+    values = _unboxed(keys)
+    
+    if values is None:
+        return self._rt_result_failure(
+            "Keys must be all 'Number' or all 'String'",
+            context
+        )
+    
+    return rt_result.success(List(_sorted_by(elements, values)))
+
+# Sorts the elements by their unboxed keys, equal keys keep their order
+def _sorted_by(elements: list[Datatype], keys: list[int | float | str]) -> list[Datatype]:
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    return [elements[i].detached() for i in order]
+
+def _array(self: BuiltInFunction, context: Context):
+    numbers, failure = _numbers(self, context, context.get_symbol("iterable"))
+    if failure: return failure
+    
+    return self._rt_result_success(Array(pack_numbers(numbers)))
+
+def _table(self: BuiltInFunction, context: Context):
+    data = context.get_symbol("data")
+    
+    # A Dict of columns, or a List of records
+    if type(data) is Dict:
+        columns: dict[str, COLUMN] = {}
+        
+        for name, column in data.value.items():
+            name = str(name)
+            
+            if type(column) is Array:
+                columns[name] = column.value
+                continue
+            
+            elements, error = _elements(column)
+            if error: return RuntimeResult().failure(error)
+            
+            values = _unboxed(elements)
+            columns[name] = make_column(values) if values is not None else None
+            
+            if columns[name] is None:
+                return self._rt_result_failure(f"Column '{name}' must be all 'Number' or all 'String'", context)
+        
+        if len({len(column) for column in columns.values()}) > 1:
+            return self._rt_result_failure("All columns must have the same length", context)
+        
+        return self._rt_result_success(Table(columns))
+    
+    elements, error = _elements(data)
+    if error: return RuntimeResult().failure(error)
+    
+    records: list[dict] = []
+    
+    for element in elements:
+        if type(element) is not Dict:
+            return self._rt_result_failure("Records must be 'Dict'", context)
+        
+        record = {}
+        
+        for name, value in element.value.items():
+            if type(value) is not Number and type(value) is not String:
+                return self._rt_result_failure(f"Field '{name}' must be a 'Number' or a 'String'", context)
+            
+            record[name] = value.value
+        
+        records.append(record)
+    
+    table = records_to_table(records)
+    
+    if table is None:
+        return self._rt_result_failure(
+            "Records must all have the same fields, each one always a 'Number' or always a 'String'",
+            context
+        )
+    
+    return self._rt_result_success(table)
+
+def _select(self: BuiltInFunction, context: Context):
+    table = context.get_symbol("table")
+    
+    if type(table) is not Table:
+        return self._rt_result_failure("Argument 'table' must be a 'Table'", context)
+    
+    elements, error = _elements(context.get_symbol("columns"))
+    if error: return RuntimeResult().failure(error)
+    
+    for element in elements:
+        if type(element) is not String or element.value not in table.value:
+            return self._rt_result_failure(f"Column {element!r} doesn't exist", context)
+    
+    return self._rt_result_success(table.selected([element.value for element in elements]))
+
+def _where(self: BuiltInFunction, context: Context):
+    table = context.get_symbol("table")
+    
+    if type(table) is not Table:
+        return self._rt_result_failure("Argument 'table' must be a 'Table'", context)
+    
+    mask, failure = _numbers(self, context, context.get_symbol("mask"))
+    if failure: return failure
+    
+    if len(mask) != table.row_count():
+        return self._rt_result_failure("The mask must have an entry for every row", context)
+    
+    return self._rt_result_success(table.masked(mask))
+
+AGGREGATIONS = {
+    "sum": sum,
+    "mean": lambda numbers: sum(numbers) / len(numbers),
+    "min": min,
+    "max": max,
+    "count": len
+}
+
+def _aggregate(self: BuiltInFunction, context: Context):
+    table = context.get_symbol("table")
+    by = context.get_symbol("by")
+    column = context.get_symbol("column")
+    operation = context.get_symbol("operation")
+    
+    if type(table) is not Table:
+        return self._rt_result_failure("Argument 'table' must be a 'Table'", context)
+    
+    for name in (by, column):
+        if type(name) is not String or name.value not in table.value:
+            return self._rt_result_failure(f"Column {name!r} doesn't exist", context)
+    
+    if type(operation) is not String or operation.value not in AGGREGATIONS:
+        return self._rt_result_failure(f"Operation must be one of {', '.join(AGGREGATIONS)}", context)
+    
+    values = column_values(table.value[column.value])
+    
+    if operation.value != "count" and (values and type(values[0]) is str):
+        return self._rt_result_failure(f"Column '{column.value}' must be made of 'Number'", context)
+    
+    # Rows grouped by their value in the 'by' column, in the order each value first shows up
+    groups: dict[int | float | str, list] = {}
+    
+    for key, value in zip(column_values(table.value[by.value]), values):
+        group = groups.get(key)
+        
+        if group is None:
+            groups[key] = [value]
+        else:
+            group.append(value)
+    
+    aggregation = AGGREGATIONS[operation.value]
+    
+    return self._rt_result_success(Table({
+        by.value: make_column(list(groups)),
+        column.value: pack_numbers([aggregation(group) for group in groups.values()])
+    }))
+
+def _set(self: BuiltInFunction, context: Context):
+    elements, error = _elements(context.get_symbol("iterable"))
+    if error: return RuntimeResult().failure(error)
+    
+    for element in elements:
+        if not isinstance(element, KEY_TYPES):
+            return self._rt_result_failure("'Set' datatype can only hold 'Number' and 'String'", context)
+    
+    return self._rt_result_success(Set([element.value for element in elements]))
+
+def _union(self: BuiltInFunction, context: Context):
+    return _set_operation(self, context, Set.union)
+
+def _intersection(self: BuiltInFunction, context: Context):
+    return _set_operation(self, context, Set.intersection)
+
+def _difference(self: BuiltInFunction, context: Context):
+    return _set_operation(self, context, Set.difference)
+
+def _set_operation(self: BuiltInFunction, context: Context, operation: Callable):
+    left = context.get_symbol("left")
+    right = context.get_symbol("right")
+    
+    if type(left) is not Set or type(right) is not Set:
+        return self._rt_result_failure("Both arguments must be 'Set'", context)
+    
+    return self._rt_result_success(operation(left, right))
+
+def _contains(self: BuiltInFunction, context: Context):
+    collection = context.get_symbol("collection")
+    element = context.get_symbol("element")
+    
+    if type(collection) is Set:
+        is_contained = collection.contains(element)
+    elif type(collection) is Dict:
+        is_contained = isinstance(element, KEY_TYPES) and element.value in collection.value
+    elif type(collection) is String:
+        is_contained = type(element) is String and element.value in collection.value
+    elif type(collection) is MappedFile:
+        error = collection.closed_error()
+        if error: return RuntimeResult().failure(error)
+        
+        is_contained = type(element) is String and collection.find(element.value) != -1
+    else:
+        elements, error = _elements(collection)
+        if error: return RuntimeResult().failure(error)
+        
+        is_contained = element in elements
+    
+    return self._rt_result_success(Number.true if is_contained else Number.false)
+
+def _stream(self: BuiltInFunction, context: Context):
+    iterable = context.get_symbol("iterable")
+    
+    _, error = iterable.iterate()
+    if error: return RuntimeResult().failure(error)
+    
+    return self._rt_result_success(Stream(iterable))
+
+def _stream_map(self: BuiltInFunction, context: Context):
+    return _with_function_stage(self, context, MAP)
+
+def _stream_filter(self: BuiltInFunction, context: Context):
+    return _with_function_stage(self, context, FILTER)
+
+def _with_function_stage(self: BuiltInFunction, context: Context, kind: str):
+    function = context.get_symbol("function")
+    
+    if not isinstance(function, BaseFunction):
+        return self._rt_result_failure(
+            "Argument 'function' must be a function",
+            context
+        )
+    
+    # Errors inside the function point at the method call that added it
+    function = function.copy().set_pos(self.pos_start, self.pos_end)
+    return self._rt_result_success(self.bound_datatype.with_stage(kind, function))
+
+def _stream_take(self: BuiltInFunction, context: Context):
+    return _with_count_stage(self, context, TAKE, 0)
+
+def _stream_skip(self: BuiltInFunction, context: Context):
+    return _with_count_stage(self, context, SKIP, 0)
+
+def _stream_chunk(self: BuiltInFunction, context: Context):
+    return _with_count_stage(self, context, CHUNK, 1)
+
+def _with_count_stage(self: BuiltInFunction, context: Context, kind: str, smallest: int):
+    count = context.get_symbol("count")
+    
+    if not isinstance(count, Number) or not isinstance(count.value, int) or count.value < smallest:
+        return self._rt_result_failure(
+            f"Argument 'count' must be a 'Number: int' of at least {smallest}",
+            context
+        )
+    
+    return self._rt_result_success(self.bound_datatype.with_stage(kind, count.value))
+
+def _stream_collect(self: BuiltInFunction, context: Context):
+    elements, error = _elements(self.bound_datatype)
+    if error: return RuntimeResult().failure(error)
+    
+    return self._rt_result_success(List(elements))
+
+def _stream_count(self: BuiltInFunction, context: Context):
+    elements, error = self.bound_datatype.iterate()
+    if error: return RuntimeResult().failure(error)
+    
+    count = 0
+    
+    for element in elements:
+        if isinstance(element, Error): return RuntimeResult().failure(element)
+        count += 1
+    
+    return self._rt_result_success(Number(count))
+
+def _stream_reduce(self: BuiltInFunction, context: Context):
+    return _fold(self, context, self.bound_datatype)
+
+def _deque(self: BuiltInFunction, context: Context):
+    elements, error = _elements(context.get_symbol("iterable"))
+    if error: return RuntimeResult().failure(error)
+    
+    return self._rt_result_success(Deque([element.detached() for element in elements]))
+
+def _deque_push_back(self: BuiltInFunction, context: Context):
+    self.bound_datatype.value.writable().append(context.get_symbol("element").detached())
+    self.bound_datatype._mutated()
+
+def _deque_push_front(self: BuiltInFunction, context: Context):
+    self.bound_datatype.value.writable().appendleft(context.get_symbol("element").detached())
+    self.bound_datatype._mutated()
+
+def _deque_pop_back(self: BuiltInFunction, context: Context):
+    return _deque_end(self, context, True, True)
+
+def _deque_pop_front(self: BuiltInFunction, context: Context):
+    return _deque_end(self, context, False, True)
+
+def _deque_back(self: BuiltInFunction, context: Context):
+    return _deque_end(self, context, True, False)
+
+def _deque_front(self: BuiltInFunction, context: Context):
+    return _deque_end(self, context, False, False)
+
+def _deque_end(self: BuiltInFunction, context: Context, is_back: bool, is_pop: bool):
+    elements = self.bound_datatype.value
+    
+    if not elements:
+        return self._rt_result_failure("Deque is empty", context)
+    
+    if not is_pop:
+        return self._rt_result_success(elements[-1 if is_back else 0])
+    
+    elements = elements.writable()
+    self.bound_datatype._mutated()
+    return self._rt_result_success(elements.pop() if is_back else elements.popleft())
+
+def _heap(self: BuiltInFunction, context: Context):
+    elements, error = _elements(context.get_symbol("iterable"))
+    if error: return RuntimeResult().failure(error)
+    
+    keys = _unboxed(elements)
+    
+    if keys is None:
+        return self._rt_result_failure(
+            "Elements must be all 'Number' or all 'String'",
+            context
+        )
+    
+    return self._rt_result_success(Heap.build(elements, keys))
+
+def _heap_by(self: BuiltInFunction, context: Context):
+    rt_result = RuntimeResult()
+    function = context.get_symbol("function")
+    
+    if not isinstance(function, BaseFunction):
+        return self._rt_result_failure(
+            "Argument 'function' must be a function",
+            context
+        )
+    
+    elements, error = _elements(context.get_symbol("iterable"))
+    if error: return rt_result.failure(error)
+    
+    keys: list[Datatype] = []
+    
+    for element in elements:
+        keys.append(rt_result.register(self.call_back(function, [element])))
+        if rt_result.should_return(): return rt_result
+    
+    values = _unboxed(keys)
+    
+    if values is None:
+        return self._rt_result_failure(
+            "Keys must be all 'Number' or all 'String'",
+            context
+        )
+    
+    # Elements pushed later get their key from the same function, errors inside it point at this call
+    key_function = function.copy().set_pos(self.pos_start, self.pos_end)
+    return rt_result.success(Heap.build(elements, values, key_function))
+
+def _heap_push(self: BuiltInFunction, context: Context):
+    error = self.bound_datatype.push(context.get_symbol("element"))
+    if error: return RuntimeResult().failure(error)
+
+def _heap_pop(self: BuiltInFunction, context: Context):
+    return _heap_top(self, context, True)
+
+def _heap_peek(self: BuiltInFunction, context: Context):
+    return _heap_top(self, context, False)
+
+def _heap_top(self: BuiltInFunction, context: Context, is_pop: bool):
+    heap = self.bound_datatype
+    
+    if not heap.value:
+        return self._rt_result_failure("Heap is empty", context)
+    
+    return self._rt_result_success(heap.pop() if is_pop else heap.peek())
+
+def _filename(self: BuiltInFunction, context: Context) -> tuple[str, RuntimeResult]:
+    filename = context.get_symbol("filename")
+    
+    if not isinstance(filename, String):
+        return None, self._rt_result_failure(
+            "Argument 'filename' must be a 'String'",
+            context
+        )
+    
+    return osp_abspath(filename.value), None
+
+def _open(self: BuiltInFunction, context: Context):
+    path, failure = _filename(self, context)
+    if failure: return failure
+    
+    mode = context.get_symbol("mode")
+    
+    if not isinstance(mode, String) or mode.value not in FILE_MODES:
+        return self._rt_result_failure(
+            f"Argument 'mode' must be one of {', '.join(f'{mode!r}' for mode in FILE_MODES)}",
+            context
+        )
+    
+    try:
+        handle = open(path, mode.value, encoding="utf-8")
+    except OSError as e:
+        return self._rt_result_failure(f"Failed to open \"{path}\": {e}", context)
+    
+    return self._rt_result_success(File(handle, path, mode.value))
+
+def _read_lines(self: BuiltInFunction, context: Context):
+    path, failure = _filename(self, context)
+    if failure: return failure
+    
+    # Nothing is read yet, the file is opened each time the stream is iterated
+    file = File(None, path).set_context(context).set_pos(self.pos_start, self.pos_end)
+    return self._rt_result_success(Stream(file))
+
+def _write(self: BuiltInFunction, context: Context):
+    return _write_file(self, context, WRITE)
+
+def _append(self: BuiltInFunction, context: Context):
+    return _write_file(self, context, APPEND)
+
+def _write_file(self: BuiltInFunction, context: Context, mode: str):
+    path, failure = _filename(self, context)
+    if failure: return failure
+    
+    try:
+        with open(path, mode, encoding="utf-8") as handle:
+            error = write_datatype(handle, context.get_symbol("data"), path)
+    except OSError as e:
+        return self._rt_result_failure(f"Failed to open \"{path}\": {e}", context)
+    
+    if error: return RuntimeResult().failure(error)
+
+def _mmap_file(self: BuiltInFunction, context: Context):
+    path, failure = _filename(self, context)
+    if failure: return failure
+    
+    try:
+        with open(path, "rb") as handle:
+            # The mapping stays valid after the file is closed
+            data = mmap(handle.fileno(), 0, access=ACCESS_READ) if osp_getsize(path) else b""
+    except (OSError, ValueError) as e:
+        return self._rt_result_failure(f"Failed to map \"{path}\": {e}", context)
+    
+    return self._rt_result_success(MappedFile(data, path))
+
+def _file_read_lines(self: BuiltInFunction, context: Context):
+    return _file_pieces(self, context, None)
+
+def _file_read_chunks(self: BuiltInFunction, context: Context):
+    size = context.get_symbol("size")
+    
+    if not isinstance(size, Number) or not isinstance(size.value, int) or size.value < 1:
+        return self._rt_result_failure(
+            "Argument 'size' must be a 'Number: int' of at least 1",
+            context
+        )
+    
+    return _file_pieces(self, context, size.value)
+
+def _file_pieces(self: BuiltInFunction, context: Context, chunk_size: int):
+    file = self.bound_datatype
+    
+    error = file.usable_for(READ)
+    if error: return RuntimeResult().failure(error)
+    
+    return self._rt_result_success(Stream(file.with_chunk_size(chunk_size)))
+
+def _file_write(self: BuiltInFunction, context: Context):
+    error = self.bound_datatype.write(context.get_symbol("data"))
+    if error: return RuntimeResult().failure(error)
+
+def _file_close(self: BuiltInFunction, context: Context):
+    self.bound_datatype.close()
+
+def _mapped_file_find(self: BuiltInFunction, context: Context):
+    mapped_file = self.bound_datatype
+    text = context.get_symbol("text")
+    
+    if mapped_file.is_closed(): return _mapped_file_closed(self, context)
+    
+    if not isinstance(text, String):
+        return self._rt_result_failure(
+            "Argument 'text' must be a 'String'",
+            context
+        )
+    
+    return self._rt_result_success(Number(mapped_file.find(text.value)))
+
+def _mapped_file_size(self: BuiltInFunction, context: Context):
+    if self.bound_datatype.is_closed(): return _mapped_file_closed(self, context)
+    
+    return _size(self, context)
+
+def _mapped_file_closed(self: BuiltInFunction, context: Context):
+    return self._rt_result_failure(f"Mapped file \"{self.bound_datatype.path}\" is closed", context)
+
+def _size(self: BuiltInFunction, context: Context):
+    return self._rt_result_success(Number(len(self.bound_datatype.value)))
+
+def _clock(self: BuiltInFunction, _):
+    return self._rt_result_success(Number(perf_counter()))
+
 def _run(self: BuiltInFunction, context: Context):
     from ns_engine.wrapper import interpret 
     
@@ -125,7 +955,7 @@ def _run(self: BuiltInFunction, context: Context):
         )
         
     try:
-        script_code = get_filedata(filename)
+        script_code = load_source(filename)
             
     except FileNotFoundError as e:
         return self._rt_result_failure(
@@ -165,7 +995,7 @@ def _import(self: BuiltInFunction, context: Context):
     
     if not already_imported_module:
         try:
-            script_code = get_filedata(filename)
+            script_code = load_source(filename)
                 
         except FileNotFoundError as e:
             return self._rt_result_failure(
@@ -190,10 +1020,17 @@ def _import(self: BuiltInFunction, context: Context):
     return self._rt_result_success(already_imported_module or imported_module)
 
 built_in_functions = {
-    "print": ("value", _print),
+    "print": ("*values", _print),
+    "flush": (None, _flush),
     "clear": (None, _clear),
     "run": ("filename", _run),
     "import": ("filename", _import),
+    
+    "open": (("filename", "mode"), _open),
+    "readLines": ("filename", _read_lines),
+    "write": (("filename", "data"), _write),
+    "append": (("filename", "data"), _append),
+    "mmapFile": ("filename", _mmap_file),
 
     "toString": ("value", _to_string),
 
@@ -203,8 +1040,114 @@ built_in_functions = {
     "isNumber": ("value", _is_number),
     "isString": ("value", _is_string),
     "isList": ("value", _is_list),
+    "isArray": ("value", _is_array),
+    "isSet": ("value", _is_set),
+    "isDeque": ("value", _is_deque),
+    "isHeap": ("value", _is_heap),
     "isFunction": ("value", _is_function),
     
     "random": (None, _random),
-    "randomInt": (("min", "max"), _random_int)
+    "randomInt": (("min", "max"), _random_int),
+    
+    "range": (("start", "end"), _range),
+    "rangeStep": (("start", "end", "step"), _range_step),
+    
+    "map": (("iterable", "function"), _map),
+    "filter": (("iterable", "function"), _filter),
+    "reduce": (("iterable", "function", "initial"), _reduce),
+    "sum": ("iterable", _sum),
+    "min": ("iterable", _min),
+    "max": ("iterable", _max),
+    "sort": ("iterable", _sort),
+    "sortBy": (("iterable", "function"), _sort_by),
+    "stream": ("iterable", _stream),
+    
+    "array": ("iterable", _array),
+    "mean": ("iterable", _mean),
+    "dot": (("left", "right"), _dot),
+    
+    "set": ("iterable", _set),
+    "union": (("left", "right"), _union),
+    "intersection": (("left", "right"), _intersection),
+    "difference": (("left", "right"), _difference),
+    "contains": (("collection", "element"), _contains),
+    
+    "deque": ("iterable", _deque),
+    "heap": ("iterable", _heap),
+    "heapBy": (("iterable", "function"), _heap_by),
+    
+    "table": ("data", _table),
+    "select": (("table", "columns"), _select),
+    "where": (("table", "mask"), _where),
+    "aggregate": (("table", "by", "column", "operation"), _aggregate),
+    
+    "clock": (None, _clock)
+}
+
+# Builtins without side effects whose result only depends on their arguments, calling them again with the same
+# arguments can be skipped
+pure_built_in_functions = {
+    "toString",
+    "range", "rangeStep",
+    "isNumber", "isString", "isList", "isArray", "isSet", "isDeque", "isHeap", "isFunction"
+}
+
+# Methods of a Stream, each call gives back a new Stream with one more stage except for collect, count and reduce
+# which run it
+stream_methods = {
+    "map": ("function", _stream_map),
+    "filter": ("function", _stream_filter),
+    "take": ("count", _stream_take),
+    "skip": ("count", _stream_skip),
+    "chunk": ("count", _stream_chunk),
+    
+    "collect": (None, _stream_collect),
+    "count": (None, _stream_count),
+    "reduce": (("function", "initial"), _stream_reduce)
+}
+
+# Methods of a Deque, the pushes and pops change the deque they are called on
+deque_methods = {
+    "pushBack": ("element", _deque_push_back),
+    "pushFront": ("element", _deque_push_front),
+    "popBack": (None, _deque_pop_back),
+    "popFront": (None, _deque_pop_front),
+    "back": (None, _deque_back),
+    "front": (None, _deque_front),
+    "size": (None, _size)
+}
+
+# Methods of a Heap, pop and peek give the element with the smallest key
+heap_methods = {
+    "push": ("element", _heap_push),
+    "pop": (None, _heap_pop),
+    "peek": (None, _heap_peek),
+    "size": (None, _size)
+}
+
+# Methods of a File, readLines and readChunks give a Stream that reads from where the file is when it's iterated
+file_methods = {
+    "readLines": (None, _file_read_lines),
+    "readChunks": ("size", _file_read_chunks),
+    "write": ("data", _file_write),
+    "close": (None, _file_close)
 }
+
+# Methods of a MappedFile, find gives the offset in bytes of the first match or -1
+mapped_file_methods = {
+    "find": ("text", _mapped_file_find),
+    "size": (None, _mapped_file_size),
+    "close": (None, _file_close)
+}
+
+# The method of a datatype called attribute_name, bound to it
+def bound_method(datatype: Datatype, attribute_name: str, methods: dict[str, tuple]) -> tuple[BuiltInFunction, Error]:
+    if attribute_name not in methods:
+        return None, NSRuntimeError(
+            f"Attribute '{attribute_name}' doesn't exist",
+            datatype.pos_start, datatype.pos_end, datatype.context
+        )
+    
+    arg_names, logic_function = methods[attribute_name]
+    method = BuiltInFunction(attribute_name, arg_names, logic_function, datatype)
+    return method.set_context(datatype.context), None
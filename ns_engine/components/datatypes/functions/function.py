@@ -1,10 +1,18 @@
 from dataclasses import dataclass, field
-from typing import Never
-from .base_function import BaseFunction
+from typing import Never, ClassVar, TypeVar, TYPE_CHECKING
+from .base_function import BaseFunction, acquire_frame, release_frame, pin_frames
 from ..datatype import Datatype
 from ..number import Number
+from ..generator import Generator
 from ns_engine.components.node import Node
 from ns_engine.components.runtime import RuntimeResult
+from ns_engine.components.errors import NSRuntimeError
+from ns_engine.components.position import Position
+
+if TYPE_CHECKING:
+    from ns_engine.components.interpreter import Interpreter
+else:
+    Interpreter = TypeVar("Interpreter")
 
 @dataclass(slots=True)
 class Function(BaseFunction):
@@ -12,25 +20,80 @@ class Function(BaseFunction):
     body_node: Node
     arg_names: list[str]
     should_auto_return: bool
+    # Body nodes with a yield inside them when it's a generator function, see FuncDefNode
+    yielding_nodes: set[int] = field(default=None)
+    
+    # Shared by every call, set by the interpreter module once it's defined
+    interpreter: ClassVar[Interpreter] = None
 
     def __post_init__(self):
-        self._values_to_copy = ("name", "body_node", "arg_names", "should_auto_return")
+        self._values_to_copy = ("name", "body_node", "arg_names", "should_auto_return", "yielding_nodes")
 
     def __repr__(self) -> str:
         return f"<function \"{self.name}\">"
     
-    def execute(self, args: list[Datatype]) -> Datatype:
-        from ns_engine.components.interpreter import Interpreter
-
+    def execute(self, args: list[Datatype]) -> RuntimeResult:
+        return self.call(self.interpreter, args, self.pos_start, self.pos_end)
+    
+    def call(self, interpreter: Interpreter, args: list[Datatype], pos_start: Position, pos_end: Position) -> RuntimeResult:
         rt_result = RuntimeResult()
-        interpreter = Interpreter()
+        arg_names = self.arg_names
+        
+        if len(args) != len(arg_names):
+            return self.copy().set_pos(pos_start, pos_end).check_args(arg_names, args)
+        
+        if self.context.depth >= interpreter.max_call_depth:
+            return rt_result.failure(NSRuntimeError(
+                f"Maximum call depth exceeded ({interpreter.max_call_depth} calls)",
+                pos_start, pos_end, self.context
+            ))
+        
+        frame = acquire_frame(self.name, self.context, pos_start)
+        symbols = frame.symbol_table.symbols
+        
+        # Nothing can have cached a lookup through a brand new frame yet, so the arguments skip SymbolTable.set
+        for i in range(len(args)):
+            symbols[arg_names[i]] = args[i].detached()
         
-        context = self.generate_new_context()
+        # The body runs as the generator gets iterated, in a frame kept for as long as the generator is, along with
+        # the frames it looks names up through
+        if self.yielding_nodes is not None:
+            pin_frames(frame)
+            elements = interpreter.run_generator(self.body_node, frame, self.yielding_nodes)
+            return rt_result.success(Generator(elements, self.name).set_context(self.context))
         
-        rt_result.register(self.check_populate_args(self.arg_names, args, context))
-        if rt_result.should_return(): return rt_result
+        while True:
+            try:
+                value = rt_result.register(interpreter.visit(self.body_node, frame))
+            except RecursionError:
+                # Deeply nested expressions can still run out of Python frames before max_call_depth is reached
+                return rt_result.failure(NSRuntimeError(
+                    "Maximum recursion depth exceeded",
+                    pos_start, pos_end, self.context
+                ))
+            
+            # The frame is still referenced by the error traceback
+            if rt_result.error: return rt_result
+            
+            if rt_result.tail_call_args is None: break
+            
+            # Self-recursive tail call, start over in the same frame with the new arguments instead of nesting a call.
+            # A pinned frame is still used by a function or generator made in it, so the call moves to a new one
+            args = rt_result.tail_call_args
+            tail_calls = frame.tail_calls + 1
+            
+            if frame.pinned:
+                frame = acquire_frame(self.name, self.context, pos_start)
+            else:
+                frame.symbol_table.reset()
+            
+            frame.tail_calls = tail_calls
+            symbol_table = frame.symbol_table
+            
+            for i in range(len(args)):
+                symbol_table.set(arg_names[i], args[i].detached(), "symbols")
         
-        value = rt_result.register(interpreter.visit(self.body_node, context))
+        release_frame(frame)
         if rt_result.should_return() and rt_result.func_return_value is None: return rt_result
         
         return_value = (value if self.should_auto_return else None) or rt_result.func_return_value or Number.null
@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+from typing import Iterator, Tuple
+from .datatype import Datatype, DATATYPE_OR_ERROR
+from .number import Number
+
+# What calling a generator function gives back, its body only runs as far as the next yield each time the next
+# element is needed. Copies share the same run of the body, so an element taken through one is gone for all of them
+@dataclass(slots=True)
+class Generator(Datatype):
+    value: Iterator[Datatype]
+    name: str
+
+    def __post_init__(self):
+        self._values_to_copy = ("value", "name")
+
+    def __repr__(self) -> str:
+        return f"<generator \"{self.name}\">"
+
+    def _number_bool(self, value: bool) -> DATATYPE_OR_ERROR:
+        return Number(int(value)).set_context(self.context), None
+
+    def iterate(self) -> Tuple[Iterator[Datatype], None]:
+        return self.value, None
+
+    def is_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.value is other.value)
+
+    def is_not_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.value is not other.value)
+
+    def and_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() and other.is_true())
+
+    def or_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() or other.is_true())
+
+    def is_true(self) -> bool:
+        return True
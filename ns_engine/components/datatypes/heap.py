@@ -0,0 +1,131 @@
+from dataclasses import dataclass, field
+from heapq import heapify, heappush, heappop
+from itertools import count
+from typing import Iterable, Iterator, Self, Tuple
+from .datatype import Datatype, DATATYPE_OR_ERROR, values_equal
+from .number import Number
+from .string import String
+from ..errors import Error, NSRuntimeError
+from ns_engine.utils.persistent import CopyOnWrite
+
+HEAP_ENTRY = tuple[int | float | str, int, Datatype]
+
+# Elements kept so the one with the smallest key is always first, pushing and popping take log n steps. The key is
+# the element itself, or what the key function gives back for it, and is only worked out once when it's pushed.
+# Entries are (key, order, element), the order keeps elements with the same key first in first out and means
+# elements are never compared themselves. Copies share the entries until one of them changes them, see CopyOnWrite
+@dataclass(slots=True)
+class Heap(Datatype):
+    value: CopyOnWrite
+    key_function: Datatype = field(default=None)
+    order: count = field(default_factory=count)
+
+    def __post_init__(self):
+        self._values_to_copy = ("value", "key_function", "order")
+
+        if not isinstance(self.value, CopyOnWrite):
+            self.value = CopyOnWrite(self.value)
+
+    def __repr__(self) -> str:
+        return f"heap([{', '.join([repr(element) for element in self.elements()])}])"
+
+    def __eq__(self, other: object) -> bool:
+        return type(other) is Heap and values_equal(self, other)
+
+    @classmethod
+    def build(cls, elements: list[Datatype], keys: list[int | float | str], key_function: Datatype = None) -> Self:
+        order = count()
+        entries = [(key, next(order), element.detached()) for key, element in zip(keys, elements)]
+        heapify(entries)
+        return cls(entries, key_function, order)
+
+    def _value_copy(self) -> CopyOnWrite:
+        return self.value.copy()
+
+    def detached(self) -> Self:
+        detached = self.copy()
+        detached.value = self._value_copy()
+        return detached
+
+    def _number(self, value: int | float) -> DATATYPE_OR_ERROR:
+        return Number(value).set_context(self.context), None
+
+    def _number_bool(self, value: bool) -> DATATYPE_OR_ERROR:
+        return self._number(int(value))
+
+    def access_at(self, attribute_name: str) -> DATATYPE_OR_ERROR:
+        from .functions import bound_method, heap_methods
+        return bound_method(self, attribute_name, heap_methods)
+
+    def _key_of(self, element: Datatype) -> Tuple[int | float | str, Error]:
+        key = element
+
+        if self.key_function is not None:
+            rt_result = self.key_function.execute([element])
+            if rt_result.error: return None, rt_result.error
+            key = rt_result.value
+
+        if not isinstance(key, (Number, String)):
+            return None, NSRuntimeError(
+                "Heap keys must be 'Number' or 'String'",
+                element.pos_start, element.pos_end, self.context
+            )
+
+        # Numbers and strs can't be ordered against each other
+        if self.value and (type(key.value) is str) != (type(self.value[0][0]) is str):
+            return None, NSRuntimeError(
+                "Heap keys must be all 'Number' or all 'String'",
+                element.pos_start, element.pos_end, self.context
+            )
+
+        return key.value, None
+
+    def push(self, element: Datatype) -> Error:
+        key, error = self._key_of(element)
+        if error: return error
+
+        heappush(self.value.writable(), (key, next(self.order), element.detached()))
+        self._mutated()
+        return None
+
+    # Both are only called on heaps that aren't empty
+    def pop(self) -> Datatype:
+        element = heappop(self.value.writable())[2]
+        self._mutated()
+        return element
+
+    def peek(self) -> Datatype:
+        return self.value[0][2]
+
+    def elements(self) -> list[Datatype]:
+        return [entry[2] for entry in sorted(self.value)]
+
+    def added_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return None, self.push(other)
+
+    def iterate(self) -> Tuple[Iterator[Datatype], None]:
+        # From the smallest key to the largest, the order popping would give them in
+        return iter(self.elements()), None
+
+    # Equal when they'd pop the same elements in the same order
+    def equality_parts(self, other: Self) -> bool | Iterable[Tuple[Datatype, Datatype]]:
+        if len(self.value) != len(other.value): return False
+        return zip(self.elements(), other.elements())
+
+    def is_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(values_equal(self, other))
+
+    def is_not_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(not values_equal(self, other))
+
+    def and_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() and other.is_true())
+
+    def or_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() or other.is_true())
+
+    def notted(self) -> DATATYPE_OR_ERROR:
+        return self._number(0 if self.value else 1)
+
+    def is_true(self) -> bool:
+        return len(self.value) != 0
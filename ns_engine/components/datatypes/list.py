@@ -1,18 +1,36 @@
 from dataclasses import dataclass
-from .datatype import Datatype, DATATYPE_OR_ERROR
+from itertools import chain
+from typing import Callable, Iterable, Iterator, Optional, Self, Tuple
+from .datatype import Datatype, DATATYPE_OR_ERROR, values_equal, compare_values
 from .number import Number
 from ..errors import NSRuntimeError
+from ns_engine.utils.persistent import Vector
 
 @dataclass(slots=True)
 class List(Datatype):
-    value: list[Datatype]
+    value: Vector
+
+    def __post_init__(self):
+        if not isinstance(self.value, Vector):
+            self.value = Vector(self.value)
 
     def __repr__(self) -> str:
         return f"[{self._elements_repr()}]"
+    
+    def __eq__(self, other: object) -> bool:
+        return type(other) is List and values_equal(self, other)
 
     def _elements_repr(self):
         return ", ".join([repr(x) for x in self.value])
     
+    def _value_copy(self) -> Vector:
+        return self.value.copy()
+    
+    def detached(self) -> Self:
+        detached = self.copy()
+        detached.value = self._value_copy()
+        return detached
+    
     def _number(self, value: int | float) -> DATATYPE_OR_ERROR:
         return Number(value).set_context(self.context), None
 
@@ -34,10 +52,15 @@ class List(Datatype):
                 other.pos_start, other.pos_end, self.context
             )
 
+    # A view of the elements, only copied once the slice gets changed
+    def slice_at(self, start: Optional[int], end: Optional[int], step: Optional[int]) -> DATATYPE_OR_ERROR:
+        return self.new(self.value.sliced(start, end, step))
+
     def update_index_at(self, other: Datatype, new: Datatype) -> DATATYPE_OR_ERROR:
         if isinstance(other, Number):
             try:
                 self.value[other.value] = new
+                self._mutated()
                 return None, None
             except IndexError:
                 return None, NSRuntimeError(
@@ -51,13 +74,15 @@ class List(Datatype):
             )
        
     def added_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
-        self.value.append(other)
+        self.value.append(other.detached())
+        self._mutated()
         return None, None
     
     def subtracted_by(self, other: Datatype) -> DATATYPE_OR_ERROR:
         if isinstance(other, Number):
             try:
                 self.value.pop(other.value)
+                self._mutated()
                 return None, None
             except IndexError:
                 None, NSRuntimeError(
@@ -70,25 +95,65 @@ class List(Datatype):
     def multiplied_by(self, other: Datatype) -> DATATYPE_OR_ERROR:
         if isinstance(other, List):
             self.value.extend(other.value)
+            self._mutated()
             return None, None
         else:
             return self._illegal_operation(other)
 
+    def iterate(self) -> Tuple[Iterator[Datatype], None]:
+        # Goes through the elements as they were when the loop started, even if the loop changes the list
+        return iter(self.value.copy()), None
+
+    def equality_parts(self, other: Self) -> bool | Iterable[Tuple[Datatype, Datatype]]:
+        elements, other_elements = self.value, other.value
+        
+        if elements.shares_contents(other_elements): return True
+        if len(elements) != len(other_elements): return False
+        
+        return zip(elements, other_elements)
+    
+    # Element by element, then the shorter list comes first
+    def ordering_parts(self, other: Self) -> int | Iterable[Tuple[Datatype, Datatype] | int]:
+        elements, other_elements = self.value, other.value
+        
+        if elements.shares_contents(other_elements): return 0
+        
+        length, other_length = len(elements), len(other_elements)
+        return chain(zip(elements, other_elements), ((length > other_length) - (length < other_length), ))
+    
+    def _ordered(self, other: Datatype, test: Callable[[int], bool]) -> DATATYPE_OR_ERROR:
+        order = compare_values(self, other)
+        if order is None: return self._illegal_operation(other)
+        
+        return self._number_bool(test(order))
+
     def is_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
-        return self._number_bool(self.value == other.value)
+        return self._number_bool(values_equal(self, other))
     
     def is_not_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
-        return self._number_bool(self.value != other.value)
+        return self._number_bool(not values_equal(self, other))
+    
+    def is_less_than(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._ordered(other, lambda order: order < 0)
+    
+    def is_greater_than(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._ordered(other, lambda order: order > 0)
+    
+    def is_less_equal_than(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._ordered(other, lambda order: order <= 0)
+    
+    def is_greater_equal_than(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._ordered(other, lambda order: order >= 0)
      
     def and_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
-        return self._number_bool(self.value and other.value)
+        return self._number_bool(self.is_true() and other.is_true())
     
     def or_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
-        return self._number_bool(self.value or other.value)
+        return self._number_bool(self.is_true() or other.is_true())
     
     def notted(self) -> DATATYPE_OR_ERROR:
-        return self._number(1 if self.value == [] else 0)
+        return self._number(0 if self.value else 1)
         
     def is_true(self) -> bool:
-        return self.value != []
+        return len(self.value) != 0
     
\ No newline at end of file
@@ -49,5 +49,6 @@ class Module(Datatype):
                 )
 
         symbol_table.set(attribute_name, new, symbols_dict_type)
+        self._mutated()
         return Number.null, None
         
\ No newline at end of file
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import ClassVar
 from .datatype import Datatype, DATATYPE_OR_ERROR
 from ..errors import NSRuntimeError
 
@@ -6,9 +7,18 @@ from ..errors import NSRuntimeError
 class Number(Datatype):
     value: int | float
     
+    compared_by_value: ClassVar[bool] = True
+    
     def __repr__(self) -> str:
         return str(self.value)
     
+    # Equal and hashed by value only, where and how the Number was made doesn't matter
+    def __eq__(self, other: object) -> bool:
+        return type(other) is Number and self.value == other.value
+    
+    def __hash__(self) -> int:
+        return hash(self.value)
+    
     def _number_bool(self, value: bool) -> DATATYPE_OR_ERROR:
         return self.new(int(value))
 
@@ -71,10 +81,10 @@ class Number(Datatype):
         return self._number_bool(self.value >= other.value)
     
     def and_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
-        return self._number_bool(self.value and other.value)
+        return self._number_bool(self.is_true() and other.is_true())
     
     def or_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
-        return self._number_bool(self.value or other.value)
+        return self._number_bool(self.is_true() or other.is_true())
     
     def notted(self) -> DATATYPE_OR_ERROR:
         return self.new(1 if self.value == 0 else 0)
@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+from typing import Iterator, Optional, Self, Tuple
+from .datatype import Datatype, DATATYPE_OR_ERROR
+from .number import Number
+from ..errors import NSRuntimeError
+
+# Numbers from start up to end, made one at a time when they're needed instead of being kept in a List
+@dataclass(slots=True)
+class Range(Datatype):
+    value: range
+
+    def __repr__(self) -> str:
+        value = self.value
+
+        if value.step == 1:
+            return f"range({value.start}, {value.stop})"
+
+        return f"range({value.start}, {value.stop}, {value.step})"
+
+    def __eq__(self, other: object) -> bool:
+        return self._same_range(other)
+
+    # A Range is never changed, so it can be hashed like a Number
+    def __hash__(self) -> int:
+        return hash(self.value)
+
+    def _number(self, value: int | float) -> DATATYPE_OR_ERROR:
+        return Number(value).set_context(self.context), None
+
+    def _number_bool(self, value: bool) -> DATATYPE_OR_ERROR:
+        return self._number(int(value))
+
+    def index_at(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        if isinstance(other, Number) and isinstance(other.value, int):
+            try:
+                return self._number(self.value[other.value])
+            except IndexError:
+                return None, NSRuntimeError(
+                    "Element at index doesn't exist, Out of bounds",
+                    other.pos_start, other.pos_end, self.context
+                )
+        else:
+            return None, NSRuntimeError(
+                "'Range' datatype can be only indexed by 'Number: int'",
+                other.pos_start, other.pos_end, self.context
+            )
+
+    def slice_at(self, start: Optional[int], end: Optional[int], step: Optional[int]) -> DATATYPE_OR_ERROR:
+        return self.new(self.value[start:end:step])
+
+    def iterate(self) -> Tuple[Iterator[Datatype], None]:
+        context = self.context
+        return (Number(i).set_context(context) for i in self.value), None
+
+    def _same_range(self, other: Datatype) -> bool:
+        return isinstance(other, Range) and self.value == other.value
+
+    def equality_parts(self, other: Self) -> bool:
+        return self._same_range(other)
+
+    def is_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self._same_range(other))
+
+    def is_not_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(not self._same_range(other))
+
+    def and_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() and other.is_true())
+
+    def or_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() or other.is_true())
+
+    def notted(self) -> DATATYPE_OR_ERROR:
+        return self._number(0 if self.value else 1)
+
+    def is_true(self) -> bool:
+        return len(self.value) != 0
@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+from typing import Iterator, Self, Tuple
+from .datatype import Datatype, DATATYPE_OR_ERROR
+from .number import Number
+from .dict import KEY_TYPES, box_key
+from ..errors import NSRuntimeError
+from ns_engine.utils.persistent import HashMap
+
+# Numbers and Strings without duplicates, kept in the order they were first added. Like Dict it holds the Python
+# value of each element as a key of a HashMap, so membership is a hash lookup and copies share everything
+@dataclass(slots=True)
+class Set(Datatype):
+    value: HashMap
+
+    def __post_init__(self):
+        if not isinstance(self.value, HashMap):
+            self.value = HashMap((key, None) for key in self.value)
+
+    def __repr__(self) -> str:
+        return f"set([{', '.join([repr(box_key(key)) for key in self.value])}])"
+
+    def __eq__(self, other: object) -> bool:
+        return self._same_keys(other)
+
+    def _value_copy(self) -> HashMap:
+        return self.value.copy()
+
+    def detached(self) -> Self:
+        detached = self.copy()
+        detached.value = self._value_copy()
+        return detached
+
+    def _number(self, value: int | float) -> DATATYPE_OR_ERROR:
+        return Number(value).set_context(self.context), None
+
+    def _number_bool(self, value: bool) -> DATATYPE_OR_ERROR:
+        return self._number(int(value))
+
+    def _wrong_element(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return None, NSRuntimeError(
+            "'Set' datatype can only hold 'Number' and 'String'",
+            other.pos_start, other.pos_end, self.context
+        )
+
+    # The operations below work on the keys of both sets natively and give back a new Set
+
+    def union(self, other: Self) -> Self:
+        keys = self.value.copy()
+
+        for key in other.value:
+            if key not in keys: keys[key] = None
+
+        return Set(keys).set_context(self.context)
+
+    def intersection(self, other: Self) -> Self:
+        keys, other_keys = self.value, other.value
+        return Set([key for key in keys if key in other_keys]).set_context(self.context)
+
+    def difference(self, other: Self) -> Self:
+        keys, other_keys = self.value, other.value
+        return Set([key for key in keys if key not in other_keys]).set_context(self.context)
+
+    def contains(self, element: Datatype) -> bool:
+        return isinstance(element, KEY_TYPES) and element.value in self.value
+
+    def added_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        if not isinstance(other, KEY_TYPES): return self._wrong_element(other)
+
+        self.value[other.value] = None
+        self._mutated()
+        return None, None
+
+    def subtracted_by(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        if not isinstance(other, KEY_TYPES): return self._wrong_element(other)
+
+        try:
+            del self.value[other.value]
+            self._mutated()
+            return None, None
+        except KeyError:
+            return None, NSRuntimeError(
+                f"Element '{other.value}' doesn't exist",
+                other.pos_start, other.pos_end, self.context
+            )
+
+    def multiplied_by(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        if isinstance(other, Set):
+            keys = self.value
+
+            for key in other.value:
+                if key not in keys: keys[key] = None
+
+            self._mutated()
+            return None, None
+        else:
+            return self._illegal_operation(other)
+
+    def iterate(self) -> Tuple[Iterator[Datatype], None]:
+        keys = self.value.copy()
+        return (box_key(key).set_context(self.context) for key in keys), None
+
+    def _same_keys(self, other: Datatype) -> bool:
+        if not isinstance(other, Set) or len(self.value) != len(other.value): return False
+
+        other_keys = other.value
+        return all(key in other_keys for key in self.value)
+
+    def equality_parts(self, other: Self) -> bool:
+        return self._same_keys(other)
+
+    def is_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self._same_keys(other))
+
+    def is_not_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(not self._same_keys(other))
+
+    def and_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() and other.is_true())
+
+    def or_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() or other.is_true())
+
+    def notted(self) -> DATATYPE_OR_ERROR:
+        return self._number(0 if len(self.value) else 1)
+
+    def is_true(self) -> bool:
+        return len(self.value) != 0
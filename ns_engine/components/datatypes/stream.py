@@ -0,0 +1,130 @@
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Self, Tuple
+from .datatype import Datatype, DATATYPE_OR_ERROR
+from .number import Number
+from .list import List
+from ..errors import Error
+
+# Stages added by the stream methods, see stream_methods
+MAP = "map"
+FILTER = "filter"
+TAKE = "take"
+SKIP = "skip"
+CHUNK = "chunk"
+
+# Elements of another iterable going through a chain of stages. Nothing runs until the stream gets iterated, the
+# stages then pass each element along one at a time, so no List is made between them
+@dataclass(slots=True)
+class Stream(Datatype):
+    value: Datatype
+    stages: tuple[tuple[str, Any], ...] = field(default=())
+
+    def __post_init__(self):
+        self._values_to_copy = ("value", "stages")
+
+    def __repr__(self) -> str:
+        return f"<stream of {type(self.value).__name__}>"
+
+    def _number_bool(self, value: bool) -> DATATYPE_OR_ERROR:
+        return Number(int(value)).set_context(self.context), None
+
+    def with_stage(self, kind: str, argument: Any) -> Self:
+        return Stream(self.value, self.stages + ((kind, argument),)).set_context(self.context)
+
+    def access_at(self, attribute_name: str) -> DATATYPE_OR_ERROR:
+        from .functions import bound_method, stream_methods
+        return bound_method(self, attribute_name, stream_methods)
+
+    def iterate(self) -> Tuple[Iterator[Datatype], Error]:
+        elements, error = self.value.iterate()
+        if error: return None, error
+
+        for kind, argument in self.stages:
+            elements = STAGES[kind](elements, argument)
+
+        return elements, None
+
+    def is_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self is other)
+
+    def is_not_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self is not other)
+
+    def and_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() and other.is_true())
+
+    def or_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() or other.is_true())
+
+    def is_true(self) -> bool:
+        return True
+
+# An Error element is the last one, every stage passes it along as it is and stops
+
+def _mapped(elements: Iterator[Datatype], function: Datatype) -> Iterator[Datatype]:
+    for element in elements:
+        if isinstance(element, Error):
+            yield element
+            return
+
+        rt_result = function.execute([element])
+        if rt_result.error:
+            yield rt_result.error
+            return
+
+        yield rt_result.value.detached()
+
+def _filtered(elements: Iterator[Datatype], function: Datatype) -> Iterator[Datatype]:
+    for element in elements:
+        if isinstance(element, Error):
+            yield element
+            return
+
+        rt_result = function.execute([element])
+        if rt_result.error:
+            yield rt_result.error
+            return
+
+        if rt_result.value.is_true(): yield element
+
+def _taken(elements: Iterator[Datatype], count: int) -> Iterator[Datatype]:
+    # Stops pulling from the stages before it once it has enough, they may never end
+    if count <= 0: return
+
+    for element in elements:
+        yield element
+
+        count -= 1
+        if count == 0: return
+
+def _skipped(elements: Iterator[Datatype], count: int) -> Iterator[Datatype]:
+    for element in elements:
+        if count > 0 and not isinstance(element, Error):
+            count -= 1
+            continue
+
+        yield element
+
+def _chunked(elements: Iterator[Datatype], size: int) -> Iterator[Datatype]:
+    chunk: list[Datatype] = []
+
+    for element in elements:
+        if isinstance(element, Error):
+            yield element
+            return
+
+        chunk.append(element)
+
+        if len(chunk) == size:
+            yield List(chunk)
+            chunk = []
+
+    if chunk: yield List(chunk)
+
+STAGES = {
+    MAP: _mapped,
+    FILTER: _filtered,
+    TAKE: _taken,
+    SKIP: _skipped,
+    CHUNK: _chunked
+}
@@ -1,11 +1,28 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Callable, ClassVar, Iterator, Optional, Tuple
 from .datatype import Datatype, DATATYPE_OR_ERROR
 from .number import Number
 from ..errors import NSRuntimeError
+from ns_engine.utils.rope import Rope, concatenate
 
 @dataclass(slots=True)
 class String(Datatype):
-    value: str
+    # A str, or a Rope when it comes from chained concatenations, which is only joined once the text is read
+    text: str | Rope = field(init=False, compare=False, repr=False)
+    
+    compared_by_value: ClassVar[bool] = True
+    
+    def __post_init__(self):
+        self._values_to_copy = ("text", )
+    
+    def _get_value(self) -> str:
+        text = self.text
+        if type(text) is Rope:
+            text = self.text = text.flatten()
+        return text
+    
+    def _set_value(self, text: str | Rope):
+        self.text = text
     
     def __str__(self) -> str:
         return self.value
@@ -13,6 +30,13 @@ class String(Datatype):
     def __repr__(self) -> str:
         return f'"{self.value}"'
     
+    # Equal and hashed by text only, like Number
+    def __eq__(self, other: object) -> bool:
+        return type(other) is String and self.value == other.value
+    
+    def __hash__(self) -> int:
+        return hash(self.value)
+    
     def _number(self, value: int | float) -> DATATYPE_OR_ERROR:
         return Number(value).set_context(self.context), None
 
@@ -34,9 +58,13 @@ class String(Datatype):
                 other.pos_start, other.pos_end, self.context
             )
             
+    # A str slice is a copy, made in one go, Python strs can't share their text
+    def slice_at(self, start: Optional[int], end: Optional[int], step: Optional[int]) -> DATATYPE_OR_ERROR:
+        return self.new(self.value[start:end:step])
+    
     def added_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
         if isinstance(other, String):
-            result = self.value + other.value
+            result = concatenate(self.text, other.text)
             return self.new(result)
         else:
             return self._illegal_operation(other)
@@ -48,21 +76,42 @@ class String(Datatype):
         else:
             return self._illegal_operation(other)
         
+    def iterate(self) -> Tuple[Iterator[Datatype], None]:
+        return (String(char).set_context(self.context) for char in self.value), None
+
     def is_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
         return self._number_bool(self.value == other.value)
     
     def is_not_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
         return self._number_bool(self.value != other.value)
      
+    def _ordered(self, other: Datatype, test: Callable[[str, str], bool]) -> DATATYPE_OR_ERROR:
+        if not isinstance(other, String): return self._illegal_operation(other)
+        return self._number_bool(test(self.value, other.value))
+    
+    def is_less_than(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._ordered(other, lambda a, b: a < b)
+    
+    def is_greater_than(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._ordered(other, lambda a, b: a > b)
+    
+    def is_less_equal_than(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._ordered(other, lambda a, b: a <= b)
+    
+    def is_greater_equal_than(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._ordered(other, lambda a, b: a >= b)
+    
     def and_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
-        return self._number_bool(self.value and other.value)
+        return self._number_bool(self.is_true() and other.is_true())
     
     def or_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
-        return self._number_bool(self.value or other.value)
+        return self._number_bool(self.is_true() or other.is_true())
     
     def notted(self) -> DATATYPE_OR_ERROR:
-        return self._number(1 if self.value == "" else 0)
+        return self._number(0 if len(self.text) else 1)
         
     def is_true(self) -> bool:
-        return self.value != ""
-    
\ No newline at end of file
+        return len(self.text) != 0
+
+# Set once the class is made, dataclass would drop a value attribute defined in its body since value is a field
+String.value = property(String._get_value, String._set_value)
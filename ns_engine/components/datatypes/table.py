@@ -0,0 +1,218 @@
+from dataclasses import dataclass
+from array import array
+from itertools import compress
+from sys import intern
+from typing import Iterator, Self, Sequence, Tuple
+from .datatype import Datatype, DATATYPE_OR_ERROR
+from .number import Number
+from .string import String
+from .list import List
+from .array import Array, pack_numbers, numpy
+from ..errors import NSRuntimeError
+
+COLUMN = array | list[str]
+
+# A column of Python values, packed into an array when they are all numbers and kept as interned strs when they are
+# all strs. Anything else can't be a column
+def make_column(values: Sequence) -> COLUMN:
+    if all(type(value) is str for value in values):
+        return [intern(value) for value in values]
+
+    if all(type(value) is int or type(value) is float for value in values):
+        return pack_numbers(values)
+
+    return None
+
+# Builds the columns of records that all have the same fields, None when they don't or a field can't be a column
+def records_to_table(records: Sequence[dict]) -> "Table":
+    names = list(records[0]) if records else []
+    columns: dict[str, COLUMN] = {}
+
+    for record in records:
+        if len(record) != len(names): return None
+
+    for name in names:
+        try:
+            column = make_column([record[name] for record in records])
+        except KeyError:
+            return None
+
+        if column is None: return None
+        columns[name] = column
+
+    return Table(columns)
+
+def column_values(column: COLUMN) -> list[int | float | str]:
+    return column if isinstance(column, list) else column.tolist()
+
+def _is_numbers(column: COLUMN) -> bool:
+    return not isinstance(column, list)
+
+# Records kept as one column per field instead of one Dict per record. Every column has an entry for every row, rows
+# are read through Row views. A Table is never changed, the builtins working on them give back new ones
+@dataclass(slots=True)
+class Table(Datatype):
+    value: dict[str, COLUMN]
+
+    def __repr__(self) -> str:
+        return f"<table of {self.row_count()} rows: {', '.join(self.value)}>"
+
+    def __eq__(self, other: object) -> bool:
+        return self._same_columns(other)
+
+    # Not __len__, an empty Table would be falsy where results are picked with "or"
+    def row_count(self) -> int:
+        for column in self.value.values():
+            return len(column)
+        return 0
+
+    def _number_bool(self, value: bool) -> DATATYPE_OR_ERROR:
+        return Number(int(value)).set_context(self.context), None
+
+    def column(self, name: str) -> Datatype:
+        column = self.value[name]
+
+        if _is_numbers(column):
+            return Array(column).set_context(self.context)
+
+        return List([String(text) for text in column]).set_context(self.context)
+
+    def field(self, name: str, index: int) -> Datatype:
+        value = self.value[name][index]
+
+        if type(value) is str:
+            return String(value).set_context(self.context)
+
+        if numpy is not None and isinstance(value, numpy.generic):
+            value = value.item()
+
+        return Number(value).set_context(self.context)
+
+    # Only the rows whose mask entry is true
+    def masked(self, mask: Sequence[bool]) -> Self:
+        columns: dict[str, COLUMN] = {}
+
+        for name, column in self.value.items():
+            if numpy is not None and isinstance(column, numpy.ndarray):
+                columns[name] = column[numpy.array(mask, dtype=bool)]
+            elif _is_numbers(column):
+                columns[name] = array(column.typecode, compress(column, mask))
+            else:
+                columns[name] = list(compress(column, mask))
+
+        return Table(columns).set_context(self.context)
+
+    def selected(self, names: list[str]) -> Self:
+        return Table({name: self.value[name] for name in names}).set_context(self.context)
+
+    def _missing_column(self, name: str) -> Tuple[None, NSRuntimeError]:
+        return None, NSRuntimeError(
+            f"Column '{name}' doesn't exist",
+            self.pos_start, self.pos_end, self.context
+        )
+
+    def access_at(self, attribute_name: str) -> DATATYPE_OR_ERROR:
+        if attribute_name not in self.value: return self._missing_column(attribute_name)
+        return self.column(attribute_name), None
+
+    def index_at(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        if isinstance(other, String):
+            if other.value not in self.value: return self._missing_column(other.value)
+            return self.column(other.value), None
+        elif isinstance(other, Number) and isinstance(other.value, int):
+            index = other.value
+            row_count = self.row_count()
+
+            if not -row_count <= index < row_count:
+                return None, NSRuntimeError(
+                    "Row at index doesn't exist, Out of bounds",
+                    other.pos_start, other.pos_end, self.context
+                )
+
+            return Row(self, index % row_count).set_context(self.context), None
+        else:
+            return None, NSRuntimeError(
+                "'Table' datatype can be only indexed by 'String' or 'Number: int'",
+                other.pos_start, other.pos_end, self.context
+            )
+
+    def iterate(self) -> Tuple[Iterator[Datatype], None]:
+        context = self.context
+        return (Row(self, index).set_context(context) for index in range(self.row_count())), None
+
+    def _same_columns(self, other: Datatype) -> bool:
+        return isinstance(other, Table) and self._columns() == other._columns()
+
+    def equality_parts(self, other: Self) -> bool:
+        return self._same_columns(other)
+
+    def is_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self._same_columns(other))
+
+    def is_not_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(not self._same_columns(other))
+
+    def _columns(self) -> dict[str, list]:
+        return {name: column_values(column) for name, column in self.value.items()}
+
+    def and_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() and other.is_true())
+
+    def or_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() or other.is_true())
+
+    def notted(self) -> DATATYPE_OR_ERROR:
+        return self._number_bool(not self.is_true())
+
+    def is_true(self) -> bool:
+        return self.row_count() != 0
+
+# One row of a Table, its fields are only boxed when they're read
+@dataclass(slots=True)
+class Row(Datatype):
+    value: Table
+    index: int
+
+    def __post_init__(self):
+        self._values_to_copy = ("value", "index")
+
+    def __repr__(self) -> str:
+        table = self.value
+        fields = [f"\"{name}\": {repr(table.field(name, self.index))}" for name in table.value]
+        return f"{{{', '.join(fields)}}}"
+
+    def _number_bool(self, value: bool) -> DATATYPE_OR_ERROR:
+        return Number(int(value)).set_context(self.context), None
+
+    def access_at(self, attribute_name: str) -> DATATYPE_OR_ERROR:
+        table = self.value
+        if attribute_name not in table.value: return table._missing_column(attribute_name)
+        return table.field(attribute_name, self.index), None
+
+    def index_at(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        if isinstance(other, String):
+            return self.access_at(other.value)
+        else:
+            return None, NSRuntimeError(
+                "'Row' datatype can be only indexed by 'String'",
+                other.pos_start, other.pos_end, self.context
+            )
+
+    def iterate(self) -> Tuple[Iterator[Datatype], None]:
+        context = self.context
+        return (String(name).set_context(context) for name in self.value.value), None
+
+    def is_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(isinstance(other, Row) and self.value is other.value and self.index == other.index)
+
+    def is_not_equal_to(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(not isinstance(other, Row) or self.value is not other.value or self.index != other.index)
+
+    def and_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() and other.is_true())
+
+    def or_with(self, other: Datatype) -> DATATYPE_OR_ERROR:
+        return self._number_bool(self.is_true() or other.is_true())
+
+    def is_true(self) -> bool:
+        return True
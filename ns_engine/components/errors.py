@@ -55,14 +55,33 @@ class NSRuntimeError(Error):
         return message
     
     def generate_traceback(self) -> str:
-        traceback_string = ""
+        traceback_lines: list[str] = []
         pos = self.pos_start
         ctx = self.context
         
         while ctx:
-            traceback_string = f"    File {pos.filename}, line {pos.line + 1}, in {ctx.name}\n" + traceback_string
+            if ctx.tail_calls:
+                traceback_lines.append(f"    [{ctx.tail_calls} tail calls to {ctx.name} elided]\n")
+            traceback_lines.append(f"    File {pos.filename}, line {pos.line + 1}, in {ctx.name}\n")
             pos = ctx.parent_entry_pos
             ctx = ctx.parent
+        
+        traceback_string = ""
+        repeated_count = 0
+        
+        # Deep recursions would print thousands of identical lines, so repeats are collapsed like Python does
+        for line in reversed(traceback_lines):
+            if traceback_string.endswith(line):
+                repeated_count += 1
+                if repeated_count > 2: continue
+            else:
+                if repeated_count > 2:
+                    traceback_string += f"    [Previous line repeated {repeated_count - 2} more times]\n"
+                repeated_count = 0
+                
+            traceback_string += line
+            
+        if repeated_count > 2:
+            traceback_string += f"    [Previous line repeated {repeated_count - 2} more times]\n"
             
         return "Traceback (most recent call last):\n" + traceback_string
-    
\ No newline at end of file
@@ -1,25 +1,160 @@
-from typing import Callable, Union
+from typing import Callable, Generator as PyGenerator, Iterable, Iterator, Union, Tuple, Optional
+from sys import getrecursionlimit, setrecursionlimit
+from threading import Thread, current_thread, stack_size as thread_stack_size
+from operator import (add as op_add, sub as op_sub, mul as op_mul, truediv as op_truediv,
+                      pow as op_pow, mod as op_mod,
+                      eq as op_eq, ne as op_ne, lt as op_lt, gt as op_gt, le as op_le, ge as op_ge)
 from .node import (Node, 
-                   NumberNode, StringNode, ListNode, DictNode,
+                   NumberNode, StringNode, FStringNode, ListNode, DictNode,
                    BinOpNode, UnaryOpNode,
-                   IfNode, ForNode, WhileNode,
-                   FuncDefNode, CallNode, IndexNode, AccessNode, UpdateNode,
+                   IfNode, ForNode, ForInNode, WhileNode,
+                   FuncDefNode, CallNode, IndexNode, SliceNode, AccessNode, UpdateNode,
                    VarAssignNode, VarDeleteNode,
-                   ReturnNode)
+                   ReturnNode, YieldNode,
+                   InlineArgNode, InlinedCallNode,
+                   CachedExprNode, HoistedExprNode, CommonExprNode, ReusedExprNode,
+                   NumberBinOpNode, LocalAccessNode, GlobalAccessNode)
 from .token import Token, TokenType
 from .keyword import Keyword
 from .runtime import RuntimeResult
 from .context import Context
-from .errors import NSRuntimeError
-from .datatypes import Datatype, Number, String, List, Dict
-from .datatypes.functions import BaseFunction, Function
+from .errors import Error, NSRuntimeError
+from .datatypes import Datatype, Number, String, List, Dict, Range, Array, Table, Row, Deque, MappedFile
+from .datatypes.functions import BaseFunction, Function, BuiltInFunction
+from .datatypes.functions.base_function import pin_frames
+
+# How many times in a row a node has to see the same operand types before it gets quickened
+QUICKEN_THRESHOLD = 8
+
+NUMBER_OPERATIONS: dict[TokenType, Callable] = {
+    TokenType.PLUS: op_add,
+    TokenType.MINUS: op_sub,
+    TokenType.MULT: op_mul,
+    TokenType.DIV: op_truediv,
+    TokenType.POWER: op_pow,
+    TokenType.MOD: op_mod,
+    
+    TokenType.ISEQUALS: lambda a, b: int(a == b),
+    TokenType.NE: lambda a, b: int(a != b),
+    TokenType.LT: lambda a, b: int(a < b),
+    TokenType.GT: lambda a, b: int(a > b),
+    TokenType.LTE: lambda a, b: int(a <= b),
+    TokenType.GTE: lambda a, b: int(a >= b)
+}
+
+# Same comparisons giving back a bool, for conditions that are only checked for being true
+NUMBER_COMPARISONS: dict[TokenType, Callable] = {
+    TokenType.ISEQUALS: op_eq,
+    TokenType.NE: op_ne,
+    TokenType.LT: op_lt,
+    TokenType.GT: op_gt,
+    TokenType.LTE: op_le,
+    TokenType.GTE: op_ge
+}
+
+# Each NakaScript call costs about a dozen Python frames (visit_CallNode -> call -> visit -> visit_ListNode -> ...),
+# so instead of letting Python's recursion limit decide how deep scripts can recurse, the evaluation runs on its own
+# thread with a stack sized for max_call_depth calls, making the limit a matter of memory
+MAX_CALL_DEPTH = 50_000
+PYTHON_FRAMES_PER_CALL = 16
+STACK_BYTES_PER_CALL = 4096
+
+# Whether datatype is the builtin function that name was set to at the start, not a variable holding one
+def is_builtin_binding(name: str, datatype: Datatype) -> bool:
+    return type(datatype) is BuiltInFunction and datatype.name == name and datatype.bound_datatype is None
+
+class EvaluationThread(Thread):
+    def __init__(self, function: Callable, *args):
+        super().__init__(daemon=True)
+        self.function = function
+        self.args = args
+        self.result = None
+        self.exception = None
+        
+    def run(self):
+        try:
+            self.result = self.function(*self.args)
+        except BaseException as e:
+            self.exception = e
 
 class Interpreter:
+    visit_methods: dict[type, Callable] = {}
+    
+    def __init__(self, max_call_depth: int = MAX_CALL_DEPTH):
+        self.max_call_depth = max_call_depth
+    
+    def run(self, node: Node, context: Context) -> RuntimeResult:
+        return self._evaluate(self.visit, node, context)
+    
+    # Runs node once per line with the line and its number bound to line and lineNumber, all on the same thread.
+    # continue goes on to the next line and break stops reading them
+    def run_each_line(self, node: Node, context: Context, lines: Iterable[str]) -> RuntimeResult:
+        return self._evaluate(self._visit_each_line, node, context, lines)
+    
+    def _visit_each_line(self, node: Node, context: Context, lines: Iterable[str]) -> RuntimeResult:
+        rt_result = RuntimeResult()
+        symbol_table = context.symbol_table
+        
+        # The statements are visited one by one, nothing uses the List of their values a script would give back
+        statement_nodes = node.element_nodes if type(node) is ListNode else (node, )
+        
+        # What's declared while running a line is dropped before the next one, so its vars start over like in a loop
+        # body. The names from before the first line stay, that's where what's kept between lines is declared
+        shared_names = set(symbol_table.names()) | {"line", "lineNumber"}
+        
+        for line_number, line in enumerate(lines, 1):
+            symbol_table.set("line", String(line).set_context(context), "symbols")
+            symbol_table.set("lineNumber", Number(line_number).set_context(context), "symbols")
+            
+            for statement_node in statement_nodes:
+                rt_result.register(self.visit(statement_node, context))
+                if rt_result.should_return(): break
+            
+            if rt_result.error: return rt_result
+            if rt_result.loop_should_break: break
+            
+            if symbol_table.count() != len(shared_names):
+                for name in [name for name in symbol_table.names() if name not in shared_names]:
+                    symbol_table.drop(name)
+        
+        return rt_result.success(Number.null)
+    
+    def _evaluate(self, function: Callable, *args) -> RuntimeResult:
+        # Scripts ran by an already running script (run, import) share its thread
+        if isinstance(current_thread(), EvaluationThread):
+            return function(*args)
+        
+        # The recursion limit is for the whole process, it's only raised for as long as the thread runs
+        previous_recursion_limit = getrecursionlimit()
+        setrecursionlimit(max(previous_recursion_limit, self.max_call_depth * PYTHON_FRAMES_PER_CALL))
+        
+        evaluation_thread = EvaluationThread(function, *args)
+        previous_stack_size = thread_stack_size(self.max_call_depth * STACK_BYTES_PER_CALL)
+        
+        try:
+            try:
+                evaluation_thread.start()
+            finally:
+                thread_stack_size(previous_stack_size)
+            
+            evaluation_thread.join()
+        finally:
+            setrecursionlimit(previous_recursion_limit)
+        
+        if evaluation_thread.exception:
+            raise evaluation_thread.exception
+        
+        return evaluation_thread.result
+    
     def visit(self, node: Node, context: Context) -> RuntimeResult:
-        method_name = f"visit_{type(node).__name__}"
-        method: Callable = getattr(self, method_name, self.no_visit_method)
+        node_type = type(node)
+        method: Callable = self.visit_methods.get(node_type)
         
-        return method(node, context)
+        if not method:
+            method = getattr(type(self), f"visit_{node_type.__name__}", type(self).no_visit_method)
+            self.visit_methods[node_type] = method
+        
+        return method(self, node, context)
     
     def no_visit_method(self, node: Node, _):
         raise Exception(f"No visit method defined for {type(node).__name__}.")
@@ -34,6 +169,35 @@ class Interpreter:
             String(node.token.value).set_context(context).set_pos(node.pos_start, node.pos_end)
         )
         
+    def visit_FStringNode(self, node: FStringNode, context: Context) -> RuntimeResult:
+        rt_result = RuntimeResult()
+        literals = node.literals
+        pieces = [literals[0]]
+        
+        for field_node, format_spec, literal in zip(node.field_nodes, node.format_specs, literals[1:]):
+            datatype = rt_result.register(self.visit(field_node, context))
+            if rt_result.should_return(): return rt_result
+            
+            if format_spec is None:
+                pieces.append(str(datatype))
+            elif isinstance(datatype, (Number, String)):
+                try:
+                    pieces.append(format(datatype.value, format_spec))
+                except ValueError:
+                    return rt_result.failure(NSRuntimeError(
+                        f"Invalid format spec '{format_spec}' for '{type(datatype).__name__}'",
+                        field_node.pos_start, field_node.pos_end, context
+                    ))
+            else:
+                return rt_result.failure(NSRuntimeError(
+                    "Format specs can only be used on 'Number' and 'String'",
+                    field_node.pos_start, field_node.pos_end, context
+                ))
+            
+            pieces.append(literal)
+        
+        return rt_result.success(String("".join(pieces)).set_context(context).set_pos(node.pos_start, node.pos_end))
+    
     def visit_ListNode(self, node: ListNode, context: Context) -> RuntimeResult:
         rt_result = RuntimeResult()
         datatype_elements: list[Datatype] = []
@@ -41,7 +205,7 @@ class Interpreter:
         for element_node in node.element_nodes:
             datatype = rt_result.register(self.visit(element_node, context))
             if rt_result.should_return(): return rt_result
-            datatype_elements.append(datatype)
+            datatype_elements.append(datatype.detached())
             
         return rt_result.success(
             List(datatype_elements).set_context(context).set_pos(node.pos_start, node.pos_end)
@@ -49,7 +213,7 @@ class Interpreter:
 
     def visit_DictNode(self, node: DictNode, context: Context) -> RuntimeResult:
         rt_result = RuntimeResult()
-        values: dict[str, Datatype] = {}
+        values: dict[int | float | str, Datatype] = {}
         
         key_tokens = node.key_tokens
         value_nodes = node.value_nodes
@@ -58,7 +222,8 @@ class Interpreter:
             value = rt_result.register(self.visit(value_nodes[i], context))
             if rt_result.should_return(): return rt_result
             
-            values[str(key_tokens.value)] = value
+            key = key_tokens.value if key_tokens.is_type_of(TokenType.NUMBER) else str(key_tokens.value)
+            values[key] = value.detached()
             
         return rt_result.success(
             Dict(values).set_context(context).set_pos(node.pos_start, node.pos_end)
@@ -69,7 +234,9 @@ class Interpreter:
         func_name: str = node.token.value if node.token else "<anon>"
         body_node = node.body_node
         arg_names: list[str] = [arg_name.value for arg_name in node.arg_name_tokens]
-        func_datatype = Function(func_name, body_node, arg_names, node.should_auto_return).set_context(context).set_pos(node.pos_start, node.pos_end)
+        func_datatype = Function(func_name, body_node, arg_names, node.should_auto_return, node.yielding_nodes).set_context(context).set_pos(node.pos_start, node.pos_end)
+        
+        pin_frames(context)
         
         if node.token:
             context.symbol_table.set(func_name, func_datatype, "symbols")
@@ -83,17 +250,28 @@ class Interpreter:
         datatype_to_call = rt_result.register(self.visit(node.node_to_call, context))
         if rt_result.should_return(): return rt_result
         
-        datatype_to_call = datatype_to_call.copy().set_pos(node.pos_start, node.pos_end)
-        
         for arg_node in node.arg_nodes:
             datatype_args.append(rt_result.register(self.visit(arg_node, context)))
             if rt_result.should_return(): return rt_result
+        
+        # Fast path, user functions are run by this interpreter without copying them first
+        if type(datatype_to_call) is Function:
+            if datatype_to_call.body_node is node.tail_call_body and len(datatype_args) == len(datatype_to_call.arg_names):
+                return rt_result.success_tail_call(datatype_args)
+            
+            return_datatype = rt_result.register(datatype_to_call.call(self, datatype_args, node.pos_start, node.pos_end))
+            if rt_result.should_return(): return rt_result
+            
+            return_datatype = return_datatype.copy().set_context(context).set_pos(node.pos_start, node.pos_end)
+            return rt_result.success(return_datatype)
             
         if not isinstance(datatype_to_call, BaseFunction):
             return rt_result.failure(NSRuntimeError(
                 f"'{datatype_to_call.__class__.__name__}' datatypes are not callable.",
                 node.pos_start, node.pos_end, context
             ))
+        
+        datatype_to_call = datatype_to_call.copy().set_pos(node.pos_start, node.pos_end)
             
         return_datatype = rt_result.register(datatype_to_call.execute(datatype_args))
         if rt_result.should_return(): return rt_result
@@ -101,10 +279,84 @@ class Interpreter:
         return_datatype = return_datatype.copy().set_context(context).set_pos(node.pos_start, node.pos_end)
         return rt_result.success(return_datatype)
     
+    def visit_InlinedCallNode(self, node: InlinedCallNode, context: Context) -> RuntimeResult:
+        rt_result = RuntimeResult()
+        
+        datatype_to_call = rt_result.register(self.visit(node.node_to_call, context))
+        if rt_result.should_return(): return rt_result
+        
+        # Guard, the name still refers to the function that got inlined
+        if type(datatype_to_call) is not Function or datatype_to_call.body_node is not node.inlined_function_body:
+            node.__class__ = CallNode
+            return self.visit_CallNode(node, context)
+        
+        datatype_args: list[Datatype] = []
+        
+        for arg_node in node.arg_nodes:
+            datatype_args.append(rt_result.register(self.visit(arg_node, context)))
+            if rt_result.should_return(): return rt_result
+        
+        # Only set once every argument is evaluated, an argument can go through this same call node again
+        node.inlined_arg_values[:] = [arg_datatype.detached() for arg_datatype in datatype_args]
+        
+        return_datatype = rt_result.register(self.visit(node.inlined_body, context))
+        if rt_result.should_return(): return rt_result
+        
+        return_datatype = return_datatype.copy().set_context(context).set_pos(node.pos_start, node.pos_end)
+        return rt_result.success(return_datatype)
+    
+    def visit_InlineArgNode(self, node: InlineArgNode, context: Context) -> RuntimeResult:
+        arg_datatype = node.arg_values[node.index].copy().set_context(context).set_pos(node.pos_start, node.pos_end)
+        return RuntimeResult().success(arg_datatype)
+    
+    def visit_HoistedExprNode(self, node: HoistedExprNode, context: Context) -> RuntimeResult:
+        if (node.cached_context is context and node.cached_loop_runs == node.loop_node.runs and
+            node.cached_mutations == Datatype.mutations):
+            return RuntimeResult().success(node.cached_value.copy().set_context(context).set_pos(node.pos_start, node.pos_end))
+        
+        node.cached_loop_runs = node.loop_node.runs
+        return self.evaluate_cached_expr(node, context)
+    
+    def visit_CommonExprNode(self, node: CommonExprNode, context: Context) -> RuntimeResult:
+        return self.evaluate_cached_expr(node, context)
+    
+    def visit_ReusedExprNode(self, node: ReusedExprNode, context: Context) -> RuntimeResult:
+        common_node = node.common_node
+        
+        # Something in between, like a call of the same function, can have evaluated the common expression elsewhere
+        if common_node.cached_context is not context or common_node.cached_mutations != Datatype.mutations:
+            return self.visit(node.node, context)
+        
+        return RuntimeResult().success(common_node.cached_value.copy().set_context(context).set_pos(node.pos_start, node.pos_end))
+    
+    def evaluate_cached_expr(self, node: CachedExprNode, context: Context) -> RuntimeResult:
+        rt_result = RuntimeResult()
+        mutations = Datatype.mutations
+        node.cached_context = None
+        
+        value = rt_result.register(self.visit(node.node, context))
+        if rt_result.should_return(): return rt_result
+        
+        # The value can only stand for the next evaluations if evaluating it changed nothing
+        if mutations == Datatype.mutations and self.calls_pure_built_ins(node, context):
+            node.cached_value = value
+            node.cached_context = context
+            node.cached_mutations = mutations
+            value = value.copy().set_context(context).set_pos(node.pos_start, node.pos_end)
+        
+        return rt_result.success(value)
+    
+    def calls_pure_built_ins(self, node: CachedExprNode, context: Context) -> bool:
+        for name in node.pure_call_names:
+            built_in_function = context.symbol_table.get(name)
+            if type(built_in_function) is not BuiltInFunction or built_in_function.name != name: return False
+            
+        return True
+    
     def visit_IndexNode(self, node: IndexNode, context: Context) -> RuntimeResult:
         rt_result = RuntimeResult()
         
-        datatype_to_index: Union[String, List, Dict] = rt_result.register(self.visit(node.node_to_index, context))
+        datatype_to_index: Union[String, List, Dict, Range, Array, Table, Row, Deque] = rt_result.register(self.visit(node.node_to_index, context))
         if rt_result.should_return(): return rt_result
         datatype_to_index = datatype_to_index.copy().set_pos(node.pos_start, node.pos_end)
         
@@ -112,7 +364,7 @@ class Interpreter:
         if rt_result.should_return(): return rt_result
         index_datatype = index_datatype.copy().set_pos(node.pos_start, node.pos_end)
 
-        if not isinstance(datatype_to_index, (String, List, Dict)):
+        if not isinstance(datatype_to_index, (String, List, Dict, Range, Array, Table, Row, Deque)):
             return rt_result.failure(NSRuntimeError(
                 f"'{datatype_to_index.__class__.__name__}' datatypes are not indexable.",
                 node.pos_start, node.pos_end, context
@@ -126,6 +378,48 @@ class Interpreter:
         indexed_datatype = indexed_datatype.copy().set_context(context).set_pos(node.pos_start, node.pos_end)
         return rt_result.success(indexed_datatype)
 
+    def visit_SliceNode(self, node: SliceNode, context: Context) -> RuntimeResult:
+        rt_result = RuntimeResult()
+        
+        datatype_to_slice: Datatype = rt_result.register(self.visit(node.node_to_slice, context))
+        if rt_result.should_return(): return rt_result
+        datatype_to_slice = datatype_to_slice.copy().set_pos(node.pos_start, node.pos_end)
+        
+        bounds: list[Optional[int]] = []
+        
+        for bound_node in (node.start_node, node.end_node, node.step_node):
+            if bound_node is None:
+                bounds.append(None)
+                continue
+            
+            bound_datatype = rt_result.register(self.visit(bound_node, context))
+            if rt_result.should_return(): return rt_result
+            
+            if not isinstance(bound_datatype, Number) or not isinstance(bound_datatype.value, int):
+                return rt_result.failure(NSRuntimeError(
+                    "Slice bounds must be 'Number: int'",
+                    bound_node.pos_start, bound_node.pos_end, context
+                ))
+            
+            bounds.append(bound_datatype.value)
+        
+        if bounds[2] == 0:
+            return rt_result.failure(NSRuntimeError(
+                "Step cannot be 0",
+                node.step_node.pos_start, node.step_node.pos_end, context
+            ))
+        
+        if not isinstance(datatype_to_slice, (String, List, Range, Array, MappedFile)):
+            return rt_result.failure(NSRuntimeError(
+                f"'{datatype_to_slice.__class__.__name__}' datatypes are not sliceable.",
+                node.pos_start, node.pos_end, context
+            ))
+        
+        sliced_datatype, error = datatype_to_slice.slice_at(*bounds)
+        if error: return rt_result.failure(error)
+        
+        return rt_result.success(sliced_datatype.set_context(context).set_pos(node.pos_start, node.pos_end))
+
     def visit_AccessNode(self, node: AccessNode, context: Context) -> RuntimeResult:
         rt_result = RuntimeResult()
         
@@ -141,24 +435,80 @@ class Interpreter:
             if error: 
                 return rt_result.failure(error)
         else:
-            accessed_datatype = context.get_symbol(identifier_name)
+            symbol_table, symbols_dict_type = context.symbol_table.find(identifier_name)
             
-            if not accessed_datatype:
+            if not symbol_table or not symbols_dict_type:
                 return rt_result.failure(NSRuntimeError(
                     f"Variable '{identifier_name}' is not defined.",
                     node.pos_start, node.pos_end, context
                 ))
+                
+            accessed_datatype = getattr(symbol_table, symbols_dict_type)[identifier_name]
+            self.observe_access(node, context, symbol_table, symbols_dict_type)
         
         accessed_datatype = accessed_datatype.copy().set_context(context).set_pos(node.pos_start, node.pos_end)
         return rt_result.success(accessed_datatype)
     
+    def observe_access(self, node: AccessNode, context: Context, symbol_table, symbols_dict_type: str):
+        if symbol_table is context.symbol_table:
+            node_type = LocalAccessNode
+        elif not symbol_table.parent:
+            node_type = GlobalAccessNode
+        else:
+            node_type = None
+            
+        if node_type and node.observed_node_type is node_type and node.cached_symbols_type == symbols_dict_type:
+            node.observed_count += 1
+        else:
+            node.observed_count = 0
+            node.observed_node_type = node_type
+            node.cached_symbols_type = symbols_dict_type
+        
+        if node.observed_count >= QUICKEN_THRESHOLD:
+            node.__class__ = node_type
+    
+    def deoptimize_access(self, node: AccessNode, context: Context) -> RuntimeResult:
+        node.__class__ = AccessNode
+        node.observed_count = 0
+        return self.visit_AccessNode(node, context)
+    
+    def visit_LocalAccessNode(self, node: LocalAccessNode, context: Context) -> RuntimeResult:
+        symbols_dict = getattr(context.symbol_table, node.cached_symbols_type)
+        accessed_datatype = symbols_dict.get(node.token.value)
+        
+        if accessed_datatype is None:
+            return self.deoptimize_access(node, context)
+        
+        accessed_datatype = accessed_datatype.copy().set_context(context).set_pos(node.pos_start, node.pos_end)
+        return RuntimeResult().success(accessed_datatype)
+    
+    def visit_GlobalAccessNode(self, node: GlobalAccessNode, context: Context) -> RuntimeResult:
+        identifier_name: str = node.token.value
+        symbol_table = context.symbol_table.resolve(identifier_name)
+        
+        # Guard, no scope between this one and the global one can shadow the variable
+        if not symbol_table or symbol_table.parent:
+            return self.deoptimize_access(node, context)
+            
+        accessed_datatype = getattr(symbol_table, node.cached_symbols_type).get(identifier_name)
+        
+        if accessed_datatype is None:
+            return self.deoptimize_access(node, context)
+        
+        accessed_datatype = accessed_datatype.copy().set_context(context).set_pos(node.pos_start, node.pos_end)
+        return RuntimeResult().success(accessed_datatype)
+    
     def visit_UpdateNode(self, node: UpdateNode, context: Context) -> RuntimeResult:
+        if node.operator_token:
+            return self.compound_update(node, context)
+        
         rt_result = RuntimeResult()
         
         node_or_identifier_to_update: Union[Union[IndexNode, AccessNode], Token] = node.node_or_identifier_to_update
         
         new_datatype = rt_result.register(self.visit(node.new_value_node, context))
         if rt_result.should_return(): return rt_result
+        new_datatype = new_datatype.detached()
         
         if isinstance(node_or_identifier_to_update, IndexNode):
             main_node = node_or_identifier_to_update.node_to_index
@@ -234,16 +584,109 @@ class Interpreter:
         else:
             raise Exception("Somewere went wrong")
 
+    # Compound assignments (+=, -=, ...) resolve what they update once, then apply the operation to its current value.
+    # Operations that change the value in place, like adding to a List, leave it where it is instead of replacing it
+    def compound_update(self, node: UpdateNode, context: Context) -> RuntimeResult:
+        rt_result = RuntimeResult()
+        node_or_identifier_to_update: Union[Union[IndexNode, AccessNode], Token] = node.node_or_identifier_to_update
+        
+        if isinstance(node_or_identifier_to_update, Token):
+            identifier_name: str = node_or_identifier_to_update.value
+            symbols_dict_type, symbols_dict = context.symbol_table.exists_where(identifier_name)
+            
+            if not symbols_dict_type:
+                return rt_result.failure(NSRuntimeError(
+                    f"Variable '{identifier_name}' was not defined.",
+                    node.pos_start, node.pos_end, context
+                ))
+            elif symbols_dict_type == "immutable_symbols":
+                return rt_result.failure(NSRuntimeError(
+                    f"'{identifier_name}' is a constant variable.",
+                    node.pos_start, node.pos_end, context
+                ))
+            elif symbols_dict_type == "persistent_symbols":
+                return rt_result.failure(NSRuntimeError(
+                    f"'{identifier_name}' is a persistent and builtin variable.",
+                    node.pos_start, node.pos_end, context
+                ))
+            
+            current_datatype: Datatype = symbols_dict[identifier_name]
+            
+        else:
+            main_node = node_or_identifier_to_update.node_to_index if isinstance(node_or_identifier_to_update, IndexNode) else node_or_identifier_to_update.node_to_access
+            
+            main_datatype = rt_result.register(self.visit(main_node, context))
+            if rt_result.should_return(): return rt_result
+            main_datatype = main_datatype.copy().set_pos(node.pos_start, node.pos_end)
+            
+            if isinstance(node_or_identifier_to_update, IndexNode):
+                index_datatype: Union[Number, String] = rt_result.register(self.visit(node_or_identifier_to_update.index_node, context))
+                if rt_result.should_return(): return rt_result
+                index_datatype = index_datatype.copy().set_pos(node.pos_start, node.pos_end)
+                
+                if isinstance(main_datatype, String):
+                    return rt_result.failure(NSRuntimeError(
+                        f"'String' datatypes are immutable.",
+                        node.pos_start, node.pos_end, context
+                    ))
+                
+                current_datatype, error = main_datatype.index_at(index_datatype)
+            else:
+                current_datatype, error = main_datatype.access_at(node_or_identifier_to_update.token.value)
+            
+            if error: return rt_result.failure(error)
+        
+        new_datatype: Datatype = rt_result.register(self.visit(node.new_value_node, context))
+        if rt_result.should_return(): return rt_result
+        
+        result_datatype = None
+        
+        if type(current_datatype) is Number and type(new_datatype) is Number:
+            try:
+                result_datatype = Number(NUMBER_OPERATIONS[node.operator_token.type](current_datatype.value, new_datatype.value))
+            except ZeroDivisionError:
+                # Let the generic operation report it
+                pass
+        
+        if not result_datatype:
+            current_datatype = current_datatype.copy().set_context(context).set_pos(node.pos_start, node.pos_end)
+            result_datatype, error = self.operate(node.operator_token, current_datatype, new_datatype)
+            if error: return rt_result.failure(error)
+            
+            # Changed in place
+            if not result_datatype:
+                return rt_result.success(current_datatype)
+        
+        result_datatype.set_context(context).set_pos(node.pos_start, node.pos_end)
+        
+        if isinstance(node_or_identifier_to_update, Token):
+            symbols_dict[identifier_name] = result_datatype
+            return rt_result.success(result_datatype)
+        
+        if isinstance(node_or_identifier_to_update, IndexNode):
+            _, error = main_datatype.update_index_at(index_datatype, result_datatype)
+        else:
+            _, error = main_datatype.update_access_at(node_or_identifier_to_update.token.value, result_datatype)
+            
+        if error: return rt_result.failure(error)
+        return rt_result.success(Number.null)
+
     def visit_VarAssignNode(self, node: VarAssignNode, context: Context) -> RuntimeResult:
         rt_result = RuntimeResult()
         identifier_name: str = node.token.value
         datatype = rt_result.register(self.visit(node.value_node, context))
         
         if rt_result.should_return(): return rt_result
+        datatype = datatype.detached()
         
         symbol_table = context.symbol_table
+        symbols_dict_type, symbols_dict = symbol_table.exists_where(identifier_name)
         
-        if symbol_table.exists(identifier_name):
+        if symbols_dict_type == "symbols" and is_builtin_binding(identifier_name, symbols_dict[identifier_name]):
+            # Builtins are only names in the global table, a variable with the same name replaces them like a
+            # function definition would
+            symbol_table.remove(identifier_name)
+        elif symbols_dict_type:
             return rt_result.failure(NSRuntimeError(
                 f"Variable '{identifier_name}' is already defined.",
                 node.pos_start, node.pos_end, context
@@ -283,6 +726,9 @@ class Interpreter:
         return rt_result.success(Number.null)
     
     def visit_BinOpNode(self, node: BinOpNode, context: Context) -> RuntimeResult:
+        if node.token.type is TokenType.KEYWORD:
+            return self.logical_operation(node, context)
+        
         rt_result = RuntimeResult()
         
         left_datatype: Datatype = rt_result.register(self.visit(node.left_node, context))
@@ -291,45 +737,138 @@ class Interpreter:
         right_datatype: Datatype = rt_result.register(self.visit(node.right_node, context))
         if rt_result.should_return(): return rt_result
         
-        match node.token.type:
+        if type(left_datatype) is Number and type(right_datatype) is Number and node.token.type in NUMBER_OPERATIONS:
+            node.observed_count += 1
+            
+            if node.observed_count >= QUICKEN_THRESHOLD:
+                node.__class__ = NumberBinOpNode
+        else:
+            node.observed_count = 0
+        
+        return self.binary_operation(node, left_datatype, right_datatype, rt_result, context)
+    
+    def visit_NumberBinOpNode(self, node: NumberBinOpNode, context: Context) -> RuntimeResult:
+        rt_result = RuntimeResult()
+        
+        left_datatype: Datatype = rt_result.register(self.visit(node.left_node, context))
+        if rt_result.should_return(): return rt_result
+        
+        right_datatype: Datatype = rt_result.register(self.visit(node.right_node, context))
+        if rt_result.should_return(): return rt_result
+        
+        if type(left_datatype) is Number and type(right_datatype) is Number:
+            try:
+                result = NUMBER_OPERATIONS[node.token.type](left_datatype.value, right_datatype.value)
+                return rt_result.success(Number(result).set_context(context).set_pos(node.pos_start, node.pos_end))
+            except ZeroDivisionError:
+                # Let the generic operation report it
+                return self.binary_operation(node, left_datatype, right_datatype, rt_result, context)
+        
+        # Type guard failed, deoptimize back to the generic node
+        node.__class__ = BinOpNode
+        node.observed_count = 0
+        return self.binary_operation(node, left_datatype, right_datatype, rt_result, context)
+    
+    # and/or only evaluate their right operand when the left one doesn't already decide the result
+    def logical_operation(self, node: BinOpNode, context: Context) -> RuntimeResult:
+        rt_result = RuntimeResult()
+        
+        left_datatype: Datatype = rt_result.register(self.visit(node.left_node, context))
+        if rt_result.should_return(): return rt_result
+        
+        if left_datatype.is_true() != node.token.is_keyword_of(Keyword.AND):
+            # The left operand stands in for the right one, so the result still follows the rules of its datatype
+            right_datatype = left_datatype
+        else:
+            right_datatype: Datatype = rt_result.register(self.visit(node.right_node, context))
+            if rt_result.should_return(): return rt_result
+        
+        return self.binary_operation(node, left_datatype, right_datatype, rt_result, context)
+    
+    # If and while only check their conditions for being true, so comparisons of numbers, and and/or of comparisons,
+    # skip creating the Number they would result in. The value of the RuntimeResult is a bool
+    def visit_condition(self, node: Node, context: Context) -> RuntimeResult:
+        rt_result = RuntimeResult()
+        node_type = type(node)
+        
+        if node_type is NumberBinOpNode and node.token.type in NUMBER_COMPARISONS:
+            left_datatype: Datatype = rt_result.register(self.visit(node.left_node, context))
+            if rt_result.should_return(): return rt_result
+            
+            right_datatype: Datatype = rt_result.register(self.visit(node.right_node, context))
+            if rt_result.should_return(): return rt_result
+            
+            if type(left_datatype) is Number and type(right_datatype) is Number:
+                return rt_result.success(NUMBER_COMPARISONS[node.token.type](left_datatype.value, right_datatype.value))
+            
+            node.__class__ = BinOpNode
+            node.observed_count = 0
+            condition_datatype = rt_result.register(self.binary_operation(node, left_datatype, right_datatype, rt_result, context))
+            
+        elif (node_type is BinOpNode and node.token.type is TokenType.KEYWORD and 
+              self.is_comparison(node.left_node) and self.is_comparison(node.right_node)):
+            left_is_true: bool = rt_result.register(self.visit_condition(node.left_node, context))
+            if rt_result.should_return(): return rt_result
+            
+            if left_is_true != node.token.is_keyword_of(Keyword.AND):
+                return rt_result.success(left_is_true)
+            
+            return self.visit_condition(node.right_node, context)
+        
+        else:
+            condition_datatype = rt_result.register(self.visit(node, context))
+            
+        if rt_result.should_return(): return rt_result
+        return rt_result.success(condition_datatype.is_true())
+    
+    # Comparisons and and/or always result in a Number, which is true the same way a bool is
+    def is_comparison(self, node: Node) -> bool:
+        return isinstance(node, BinOpNode) and (node.token.type in NUMBER_COMPARISONS or node.token.type is TokenType.KEYWORD)
+    
+    def binary_operation(self, node: BinOpNode, left_datatype: Datatype, right_datatype: Datatype, 
+                         rt_result: RuntimeResult, context: Context) -> RuntimeResult:
+        result_datatype, error = self.operate(node.token, left_datatype, right_datatype)
+
+        if error:
+            return rt_result.failure(error)
+        
+        result_datatype = result_datatype or Number.null
+        
+        return rt_result.success(result_datatype.set_context(context).set_pos(node.pos_start, node.pos_end))
+    
+    def operate(self, operator_token: Token, left_datatype: Datatype, right_datatype: Datatype) -> Tuple[Optional[Datatype], Optional[Error]]:
+        match operator_token.type:
             case TokenType.PLUS:
-                result_datatype, error = left_datatype.added_to(right_datatype)
+                return left_datatype.added_to(right_datatype)
             case TokenType.MINUS:
-                result_datatype, error = left_datatype.subtracted_by(right_datatype)
+                return left_datatype.subtracted_by(right_datatype)
             case TokenType.MULT:
-                result_datatype, error = left_datatype.multiplied_by(right_datatype)
+                return left_datatype.multiplied_by(right_datatype)
             case TokenType.DIV:
-                result_datatype, error = left_datatype.divided_by(right_datatype)
+                return left_datatype.divided_by(right_datatype)
             case TokenType.POWER:
-                result_datatype, error = left_datatype.powered_by(right_datatype)
+                return left_datatype.powered_by(right_datatype)
             case TokenType.MOD:
-                result_datatype, error = left_datatype.modulo_by(right_datatype)
+                return left_datatype.modulo_by(right_datatype)
                 
             case TokenType.ISEQUALS:
-                result_datatype, error = left_datatype.is_equal_to(right_datatype)
+                return left_datatype.is_equal_to(right_datatype)
             case TokenType.NE:
-                result_datatype, error = left_datatype.is_not_equal_to(right_datatype)
+                return left_datatype.is_not_equal_to(right_datatype)
             case TokenType.LT:
-                result_datatype, error = left_datatype.is_less_than(right_datatype)
+                return left_datatype.is_less_than(right_datatype)
             case TokenType.GT:
-                result_datatype, error = left_datatype.is_greater_than(right_datatype)
+                return left_datatype.is_greater_than(right_datatype)
             case TokenType.LTE:
-                result_datatype, error = left_datatype.is_less_equal_than(right_datatype)
+                return left_datatype.is_less_equal_than(right_datatype)
             case TokenType.GTE:
-                result_datatype, error = left_datatype.is_greater_equal_than(right_datatype)
+                return left_datatype.is_greater_equal_than(right_datatype)
                     
             case TokenType.KEYWORD:
-                if node.token.is_keyword_of(Keyword.AND):
-                    result_datatype, error = left_datatype.and_with(right_datatype)
-                elif node.token.is_keyword_of(Keyword.OR):
-                    result_datatype, error = left_datatype.or_with(right_datatype)
-
-        if error:
-            return rt_result.failure(error)
-        
-        result_datatype = result_datatype or Number.null
-        
-        return rt_result.success(result_datatype.set_context(context).set_pos(node.pos_start, node.pos_end))
+                if operator_token.is_keyword_of(Keyword.AND):
+                    return left_datatype.and_with(right_datatype)
+                elif operator_token.is_keyword_of(Keyword.OR):
+                    return left_datatype.or_with(right_datatype)
             
     def visit_UnaryOpNode(self, node: UnaryOpNode, context: Context) -> RuntimeResult:
         rt_result = RuntimeResult()
@@ -355,10 +894,10 @@ class Interpreter:
         rt_result = RuntimeResult()
         
         for condition, expr, should_return_null in node.cases:
-            condition_datatype = rt_result.register(self.visit(condition, context))
+            condition_is_true: bool = rt_result.register(self.visit_condition(condition, context))
             if rt_result.should_return(): return rt_result
             
-            if condition_datatype.is_true():
+            if condition_is_true:
                 expr_datatype = rt_result.register(self.visit(expr, context))
                 if rt_result.should_return(): return rt_result
                 return rt_result.success(Number.null if should_return_null else expr_datatype)
@@ -374,6 +913,7 @@ class Interpreter:
     def visit_ForNode(self, node: ForNode, context: Context):
         rt_result = RuntimeResult()
         datatype_elements: list[Datatype] = []
+        node.runs += 1
 
         start_value_number: Number = rt_result.register(self.visit(node.start_value_node, context))
         if rt_result.should_return(): return rt_result
@@ -406,7 +946,41 @@ class Interpreter:
             elif rt_result.loop_should_break:
                 break
             
-            datatype_elements.append(value)
+            if not node.should_return_null: datatype_elements.append(value)
+
+        return rt_result.success(
+            Number.null if node.should_return_null else
+            List(datatype_elements).set_context(context).set_pos(node.pos_start, node.pos_end)
+        )
+
+    def visit_ForInNode(self, node: ForInNode, context: Context):
+        rt_result = RuntimeResult()
+        datatype_elements: list[Datatype] = []
+        node.runs += 1
+        
+        iterable_datatype: Datatype = rt_result.register(self.visit(node.iterable_node, context))
+        if rt_result.should_return(): return rt_result
+        
+        elements, error = iterable_datatype.iterate()
+        if error: return rt_result.failure(error)
+        
+        identifier_name: str = node.token.value
+        symbol_table = context.symbol_table
+        
+        # Elements are bound without copying them, only List and Dict elements get a value of their own
+        for element in elements:
+            if isinstance(element, Error): return rt_result.failure(element)
+            symbol_table.set(identifier_name, element.detached(), "symbols")
+            
+            value = rt_result.register(self.visit(node.body_node, context))
+            if rt_result.an_error_occurred(): return rt_result
+            
+            if rt_result.loop_should_continue:
+                continue
+            elif rt_result.loop_should_break:
+                break
+            
+            if not node.should_return_null: datatype_elements.append(value)
 
         return rt_result.success(
             Number.null if node.should_return_null else
@@ -416,12 +990,13 @@ class Interpreter:
     def visit_WhileNode(self, node: WhileNode, context: Context):
         rt_result = RuntimeResult()
         datatype_elements: list[Datatype] = []
+        node.runs += 1
 
         while True:
-            condition_datatype = rt_result.register(self.visit(node.condition_node, context))
+            condition_is_true: bool = rt_result.register(self.visit_condition(node.condition_node, context))
             if rt_result.should_return(): return rt_result
 
-            if not condition_datatype.is_true(): break
+            if not condition_is_true: break
 
             value = rt_result.register(self.visit(node.body_node, context))
             if rt_result.an_error_occurred(): return rt_result
@@ -431,7 +1006,7 @@ class Interpreter:
             elif rt_result.loop_should_break:
                 break
             
-            datatype_elements.append(value)
+            if not node.should_return_null: datatype_elements.append(value)
 
         return rt_result.success(
             Number.null if node.should_return_null else
@@ -450,8 +1025,177 @@ class Interpreter:
         # Fun Fact: While making it I forgot to return the runtime result in a function about returning, ironic
         return rt_result.success_return(datatype)
 
+    def visit_YieldNode(self, node: YieldNode, context: Context):
+        return RuntimeResult().failure(NSRuntimeError(
+            "'yield' can only be used in blocks, ifs and loops of a function",
+            node.pos_start, node.pos_end, context
+        ))
+
     def visit_ContinueNode(self, *_):
         return RuntimeResult().success_continue()
 
     def visit_BreakNode(self, *_):
         return RuntimeResult().success_break()
+
+    #!================================================================
+    
+    # Generator function bodies run as Python generators, which keep where they stopped between elements on the heap
+    # instead of on the stack. Only the nodes in yielding_nodes can stop halfway, the resume_ methods are their
+    # versions of the visit_ methods, yielding the elements the body yields and returning the usual RuntimeResult
+    def run_generator(self, node: Node, context: Context, yielding_nodes: set[int]) -> Iterator[Datatype]:
+        rt_result = RuntimeResult()
+        
+        rt_result.register((yield from self.resume(node, context, yielding_nodes)))
+        if rt_result.error: yield rt_result.error
+    
+    def resume(self, node: Node, context: Context, yielding_nodes: set[int]) -> PyGenerator[Datatype, None, RuntimeResult]:
+        if id(node) not in yielding_nodes:
+            return self.visit(node, context)
+        
+        return (yield from getattr(self, f"resume_{type(node).__name__}")(node, context, yielding_nodes))
+    
+    def resume_YieldNode(self, node: YieldNode, context: Context, _) -> PyGenerator[Datatype, None, RuntimeResult]:
+        rt_result = RuntimeResult()
+        
+        datatype = rt_result.register(self.visit(node.node_to_yield, context))
+        if rt_result.should_return(): return rt_result
+        
+        yield datatype
+        return rt_result.success(Number.null)
+    
+    def resume_ListNode(self, node: ListNode, context: Context, yielding_nodes: set[int]) -> PyGenerator[Datatype, None, RuntimeResult]:
+        rt_result = RuntimeResult()
+        datatype_elements: list[Datatype] = []
+        
+        for element_node in node.element_nodes:
+            datatype = rt_result.register((yield from self.resume(element_node, context, yielding_nodes)))
+            if rt_result.should_return(): return rt_result
+            datatype_elements.append(datatype.detached())
+            
+        return rt_result.success(
+            List(datatype_elements).set_context(context).set_pos(node.pos_start, node.pos_end)
+        )
+    
+    def resume_IfNode(self, node: IfNode, context: Context, yielding_nodes: set[int]) -> PyGenerator[Datatype, None, RuntimeResult]:
+        rt_result = RuntimeResult()
+        
+        for condition, expr, should_return_null in node.cases:
+            condition_is_true: bool = rt_result.register(self.visit_condition(condition, context))
+            if rt_result.should_return(): return rt_result
+            
+            if condition_is_true:
+                expr_datatype = rt_result.register((yield from self.resume(expr, context, yielding_nodes)))
+                if rt_result.should_return(): return rt_result
+                return rt_result.success(Number.null if should_return_null else expr_datatype)
+            
+        if node.else_case:
+            expr, should_return_null = node.else_case
+            else_datatype = rt_result.register((yield from self.resume(expr, context, yielding_nodes)))
+            if rt_result.should_return(): return rt_result
+            return rt_result.success(Number.null if should_return_null else else_datatype)
+        
+        return rt_result.success(Number.null)
+    
+    def resume_ForNode(self, node: ForNode, context: Context, yielding_nodes: set[int]) -> PyGenerator[Datatype, None, RuntimeResult]:
+        rt_result = RuntimeResult()
+        datatype_elements: list[Datatype] = []
+        node.runs += 1
+
+        start_value_number: Number = rt_result.register(self.visit(node.start_value_node, context))
+        if rt_result.should_return(): return rt_result
+
+        end_value_number: Number = rt_result.register(self.visit(node.end_value_node, context))
+        if rt_result.should_return(): return rt_result
+
+        if node.step_value_node:
+            step_value_number: Number = rt_result.register(self.visit(node.step_value_node, context))
+            if rt_result.should_return(): return rt_result
+        else:
+            step_value_number = Number(1)
+
+        i: int = start_value_number.value
+
+        if step_value_number.value >= 0:
+            condition = lambda: i < end_value_number.value
+        else:
+            condition = lambda: i > end_value_number.value
+        
+        while condition():
+            context.symbol_table.set(node.token.value, Number(i), "symbols")
+            i += step_value_number.value
+            
+            value = rt_result.register((yield from self.resume(node.body_node, context, yielding_nodes)))
+            if rt_result.an_error_occurred(): return rt_result
+            
+            if rt_result.loop_should_continue:
+                continue
+            elif rt_result.loop_should_break:
+                break
+            
+            if not node.should_return_null: datatype_elements.append(value)
+
+        return rt_result.success(
+            Number.null if node.should_return_null else
+            List(datatype_elements).set_context(context).set_pos(node.pos_start, node.pos_end)
+        )
+    
+    def resume_ForInNode(self, node: ForInNode, context: Context, yielding_nodes: set[int]) -> PyGenerator[Datatype, None, RuntimeResult]:
+        rt_result = RuntimeResult()
+        datatype_elements: list[Datatype] = []
+        node.runs += 1
+        
+        iterable_datatype: Datatype = rt_result.register(self.visit(node.iterable_node, context))
+        if rt_result.should_return(): return rt_result
+        
+        elements, error = iterable_datatype.iterate()
+        if error: return rt_result.failure(error)
+        
+        identifier_name: str = node.token.value
+        symbol_table = context.symbol_table
+        
+        for element in elements:
+            if isinstance(element, Error): return rt_result.failure(element)
+            symbol_table.set(identifier_name, element.detached(), "symbols")
+            
+            value = rt_result.register((yield from self.resume(node.body_node, context, yielding_nodes)))
+            if rt_result.an_error_occurred(): return rt_result
+            
+            if rt_result.loop_should_continue:
+                continue
+            elif rt_result.loop_should_break:
+                break
+            
+            if not node.should_return_null: datatype_elements.append(value)
+
+        return rt_result.success(
+            Number.null if node.should_return_null else
+            List(datatype_elements).set_context(context).set_pos(node.pos_start, node.pos_end)
+        )
+    
+    def resume_WhileNode(self, node: WhileNode, context: Context, yielding_nodes: set[int]) -> PyGenerator[Datatype, None, RuntimeResult]:
+        rt_result = RuntimeResult()
+        datatype_elements: list[Datatype] = []
+        node.runs += 1
+
+        while True:
+            condition_is_true: bool = rt_result.register(self.visit_condition(node.condition_node, context))
+            if rt_result.should_return(): return rt_result
+
+            if not condition_is_true: break
+
+            value = rt_result.register((yield from self.resume(node.body_node, context, yielding_nodes)))
+            if rt_result.an_error_occurred(): return rt_result
+            
+            if rt_result.loop_should_continue:
+                continue
+            elif rt_result.loop_should_break:
+                break
+            
+            if not node.should_return_null: datatype_elements.append(value)
+
+        return rt_result.success(
+            Number.null if node.should_return_null else
+            List(datatype_elements).set_context(context).set_pos(node.pos_start, node.pos_end)
+        )
+
+Function.interpreter = Interpreter()
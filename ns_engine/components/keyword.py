@@ -25,6 +25,7 @@ class Keyword(Enum):
     FOR = "for"
     TO = "to"
     STEP = "step"
+    IN = "in"
     WHILE = "while"
     
     CONTINUE = "continue"
@@ -33,5 +34,6 @@ class Keyword(Enum):
     # Other
     END = "end"
     RETURN = "return"
+    YIELD = "yield"
     SELFREF = "inst" # unused
     
\ No newline at end of file
@@ -8,6 +8,19 @@ from .position import Position
 DIGITS = "0123456789"
 LETTERS_DIGITS = LETTERS + DIGITS
 
+ESCAPE_CHARACTERS = {
+    "n": "\n",
+    "t": "\t",
+    "\\": "\\",
+    '"': '"'
+}
+
+# Skipped between tokens, including the indentation at the start of a line and the "\r" of a "\r\n"
+WHITESPACE = " \t\r\f\v"
+
+OPENING_BRACKETS = "([{"
+CLOSING_BRACKETS = ")]}"
+
 class Lexer:
     def __init__(self, source_name: str, source_code: str):
         self.src_name = source_name
@@ -20,8 +33,21 @@ class Lexer:
         self.pos.advance(self.current_char)
         self.current_char = self.src_code[self.pos.index] if self.pos.index < len(self.src_code) else None
         
+    def peek(self) -> Optional[str]:
+        index = self.pos.index + 1
+        return self.src_code[index] if index < len(self.src_code) else None
+        
     def make_tokens(self) -> Tuple[Optional[List[Token]], Optional[Error]]:
+        tokens, error = self._make_tokens_until(None)
+        if error: return None, error
+        
+        tokens.append(Token(TokenType.EOF, pos_start=self.pos))
+        return tokens, None
+    
+    # Tokens up to the first of stop_chars found outside of any bracket opened since, or up to the end
+    def _make_tokens_until(self, stop_chars: Optional[str]) -> Tuple[Optional[List[Token]], Optional[Error]]:
         tokens: list[Token] = []
+        depth = 0
         
         SIMPLE_TOKENS = {
             "(": TokenType.LPAREN,
@@ -53,7 +79,7 @@ class Lexer:
                 TokenType.MULT,
                 ({"char": "=", "token_type": TokenType.MULTEQUAL, "break": True},
                  {"char": "*", "token_type": TokenType.POWER},
-                 {"char": "=", "token_type": TokenType.POWER, "break": True})
+                 {"char": "=", "token_type": TokenType.POWEREQUAL, "break": True})
             ),
             "/": lambda: self._make_token_advanced(
                 TokenType.DIV,
@@ -86,11 +112,20 @@ class Lexer:
         }
         
         while self.current_char != None:
-            if self.current_char in " \t":
+            if stop_chars and depth == 0 and self.current_char in stop_chars:
+                break
+            
+            if self.current_char in WHITESPACE:
                 self.advance()
                 
             elif self.current_char in DIGITS:
                 tokens.append(self._make_token_number())
+            
+            elif self.current_char == "f" and self.peek() == '"':
+                token, error = self._make_token_fstring()
+                
+                if error: return None, error
+                tokens.append(token)
                 
             elif self.current_char in LETTERS + "_":
                 tokens.append(self._make_token_identifier())
@@ -102,6 +137,9 @@ class Lexer:
                 if token: tokens.append(token)
                 
             elif self.current_char in SIMPLE_TOKENS:
+                if self.current_char in OPENING_BRACKETS: depth += 1
+                elif self.current_char in CLOSING_BRACKETS: depth -= 1
+                
                 tokens.append(Token(SIMPLE_TOKENS[self.current_char], pos_start=self.pos))
                 self.advance()
                 
@@ -111,7 +149,6 @@ class Lexer:
                 self.advance()
                 return None, NSIllegalCharacterError(f"'{illegal_char}'", pos_start, self.pos)
         
-        tokens.append(Token(TokenType.EOF, pos_start=self.pos))
         return tokens, None
     
     #! THE ORDER OF THE ITEMS IN THE CONDITIONS TUPLE MATTERS
@@ -168,17 +205,11 @@ class Lexer:
         string = ""
         pos_start = self.pos.copy()
         escape_character = False
-        escape_characters = {
-            "n": "\n",
-            "t": "\t",
-            "\\": "\\",
-            '"': '"'
-        }
         
         self.advance()
         while self.current_char not in (None, "\n") and (self.current_char != '"' or escape_character):
             if escape_character:
-                string += escape_characters.get(self.current_char, self.current_char)
+                string += ESCAPE_CHARACTERS.get(self.current_char, self.current_char)
                 escape_character = False
             else:       
                 if self.current_char == "\\":
@@ -199,6 +230,80 @@ class Lexer:
         
         return Token(TokenType.STRING, string, pos_start, self.pos), None
 
+    # f"...{expr:spec}...", the value is the literal text and (tokens, format spec) of each field in the order they
+    # are written. The tokens of a field are made here, where their positions are known, and parsed by the parser
+    def _make_token_fstring(self) -> Tuple[Optional[Token], Optional[Error]]:
+        parts: list[str | tuple[list[Token], Optional[str]]] = []
+        literal = ""
+        pos_start = self.pos.copy()
+        escape_character = False
+        
+        self.advance()
+        self.advance()
+        while self.current_char not in (None, "\n") and (self.current_char != '"' or escape_character):
+            if escape_character:
+                literal += ESCAPE_CHARACTERS.get(self.current_char, self.current_char)
+                escape_character = False
+            elif self.current_char == "\\":
+                escape_character = True
+            elif self.current_char in "{}" and self.peek() == self.current_char:
+                literal += self.current_char
+                self.advance()
+            elif self.current_char == "{":
+                parts.append(literal)
+                literal = ""
+                
+                field, error = self._make_fstring_field()
+                if error: return None, error
+                parts.append(field)
+            elif self.current_char == "}":
+                illegal_pos_start = self.pos.copy()
+                self.advance()
+                return None, NSIllegalCharacterError("'}' (write '}}' for a '}' in an f-string)", illegal_pos_start, self.pos)
+            else:
+                literal += self.current_char
+            
+            self.advance()
+        
+        if self.current_char != '"':
+            self.advance()
+            return None, NSExpectedCharacterError(
+                "'\"'",
+                pos_start, self.pos
+            )
+        
+        self.advance()
+        parts.append(literal)
+        
+        return Token(TokenType.FSTRING, parts, pos_start, self.pos), None
+    
+    # Leaves the current char on the closing brace of the field
+    def _make_fstring_field(self) -> Tuple[Optional[tuple[list[Token], Optional[str]]], Optional[Error]]:
+        pos_start = self.pos.copy()
+        self.advance()
+        
+        tokens, error = self._make_tokens_until(":}")
+        if error: return None, error
+        
+        format_spec = None
+        
+        if self.current_char == ":":
+            format_spec = ""
+            self.advance()
+            
+            while self.current_char not in (None, "\n", '"', "}"):
+                format_spec += self.current_char
+                self.advance()
+        
+        if self.current_char != "}":
+            return None, NSExpectedCharacterError(
+                "'}'",
+                pos_start, self.pos
+            )
+        
+        tokens.append(Token(TokenType.EOF, pos_start=self.pos))
+        return (tokens, format_spec), None
+
     def _make_token_identifier(self) -> Token:
         identifier_string = ""
         pos_start = self.pos.copy()
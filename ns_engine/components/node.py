@@ -23,6 +23,17 @@ class StringNode(Node):
     def __repr__(self) -> str:
         return f"StringNode(\"{self.token.value}\")"
 
+# The literal text around the fields is split from them once by the lexer and parser, literals has one more entry
+# than field_nodes, the text before each field then the text after the last one
+@dataclass(slots=True)
+class FStringNode(Node):
+    literals: tuple[str, ...]
+    field_nodes: list[Node]
+    format_specs: tuple[str | None, ...]
+
+    def __repr__(self) -> str:
+        return f"FStringNode({self.literals}, {self.field_nodes})"
+
 @dataclass(slots=True)
 class ListNode(Node):
     token: Token = field(default=None, init=False)
@@ -53,6 +64,8 @@ class FuncDefNode(Node):
     arg_name_tokens: list[Token]
     body_node: Node
     should_auto_return: bool
+    # Set by the parser on generator functions, the ids of the body nodes with a yield somewhere inside them
+    yielding_nodes: set[int] = field(default=None, init=False)
 
     def __post_init__(self):
         if self.token:
@@ -76,6 +89,12 @@ class CallNode(Node):
     token: Token = field(default=None, init=False)
     node_to_call: Node
     arg_nodes: list[Node]
+    # Body of the function this call can be a self-recursive tail call of, set by the optimizer
+    tail_call_body: Node = field(default=None, init=False)
+    # Set by the optimizer when the called function gets inlined, see InlinedCallNode
+    inlined_body: Node = field(default=None, init=False)
+    inlined_function_body: Node = field(default=None, init=False)
+    inlined_arg_values: list = field(default=None, init=False)
 
     def __post_init__(self):
         if len(self.arg_nodes) > 0:
@@ -89,6 +108,14 @@ class CallNode(Node):
     def __repr__(self) -> str:
         return f"CallNode({self.node_to_call}, {self.arg_nodes})"
 
+@dataclass(slots=True)
+class InlineArgNode(Node):
+    arg_values: list
+    index: int
+
+    def __repr__(self) -> str:
+        return f"InlineArgNode({self.token.value})"
+
 @dataclass(slots=True)
 class IndexNode(Node):
     token: Token = field(default=None, init=False)
@@ -102,9 +129,28 @@ class IndexNode(Node):
     def __repr__(self) -> str:
         return f"IndexNode({self.node_to_index}, {self.index_node})"
 
+# a[start:end:step], every bound can be left out and is None then
+@dataclass(slots=True)
+class SliceNode(Node):
+    token: Token = field(default=None, init=False)
+    pos_end: Position
+    node_to_slice: Node
+    start_node: Node
+    end_node: Node
+    step_node: Node
+
+    def __post_init__(self):
+        self.pos_start = self.node_to_slice.pos_start
+
+    def __repr__(self) -> str:
+        return f"SliceNode({self.node_to_slice}, {self.start_node}, {self.end_node}, {self.step_node})"
+
 @dataclass(slots=True)
 class AccessNode(Node):
     node_to_access: Node = field(default=None)
+    observed_count: int = field(default=0, init=False)
+    observed_node_type: type = field(default=None, init=False)
+    cached_symbols_type: str = field(default=None, init=False)
 
     def __post_init__(self):
         self.pos_start = (self.node_to_access or self.token).pos_start
@@ -118,12 +164,17 @@ class UpdateNode(Node):
     token: Token = field(default=None, init=False)
     node_or_identifier_to_update: Union[Node, Token]
     new_value_node: Node
+    # Operation of a compound assignment (+=, -=, ...) between the current value and new_value_node
+    operator_token: Token = field(default=None)
 
     def __post_init__(self):
         self.pos_start = self.node_or_identifier_to_update.pos_start
         self.pos_end = self.new_value_node.pos_end
 
     def __repr__(self) -> str:
+        if self.operator_token:
+            return f"UpdateNode({self.node_or_identifier_to_update}, {self.operator_token}, {self.new_value_node})"
+        
         return f"UpdateNode({self.node_or_identifier_to_update}, {self.new_value_node})"
     
 @dataclass(slots=True)
@@ -147,6 +198,7 @@ class VarDeleteNode(Node):
 class BinOpNode(Node):
     left_node: Node
     right_node: Node
+    observed_count: int = field(default=0, init=False)
 
     def __post_init__(self):
         self.pos_start = self.left_node.pos_start
@@ -192,6 +244,8 @@ class ForNode(Node):
     step_value_node: Node
     body_node: Node
     should_return_null: bool
+    # Times the loop was started, what was hoisted out of it is only valid for the run it was evaluated in
+    runs: int = field(default=0, init=False)
 
     def __post_init__(self):
         self.pos_start = self.token.pos_start
@@ -200,12 +254,29 @@ class ForNode(Node):
     def __repr__(self) -> str:
         return f"ForNode({self.start_value_node.token.value}, {self.end_value_node.token.value}, {self.step_value_node.token.value}, {self.body_node})"
 
+@dataclass(slots=True)
+class ForInNode(Node):
+    iterable_node: Node
+    body_node: Node
+    should_return_null: bool
+    # Times the loop was started, what was hoisted out of it is only valid for the run it was evaluated in
+    runs: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        self.pos_start = self.token.pos_start
+        self.pos_end = self.body_node.pos_end
+
+    def __repr__(self) -> str:
+        return f"ForInNode({self.token.value}, {self.iterable_node}, {self.body_node})"
+
 @dataclass(slots=True)
 class WhileNode(Node):
     token: Token = field(default=None, init=False)
     condition_node: Node
     body_node: Node
     should_return_null: bool
+    # Times the loop was started, what was hoisted out of it is only valid for the run it was evaluated in
+    runs: int = field(default=0, init=False)
 
     def __post_init__(self):
         self.pos_start = self.condition_node.pos_start
@@ -224,6 +295,16 @@ class ReturnNode(Node):
     def __repr__(self) -> str:
         return f"ReturnNode({self.node_to_return})"
 
+@dataclass(slots=True)
+class YieldNode(Node):
+    token: Token = field(default=None, init=False)
+    node_to_yield: Node
+    pos_start: Position
+    pos_end: Position
+
+    def __repr__(self) -> str:
+        return f"YieldNode({self.node_to_yield})"
+
 @dataclass(slots=True)
 class ContinueNode(Node):
     token: Token = field(default=None, init=False)
@@ -241,3 +322,61 @@ class BreakNode(Node):
 
     def __repr__(self) -> str:
         return f"BreakNode()"
+
+# Pure expressions whose value the optimizer found can be reused instead of being evaluated again, the value is
+# kept with the context it was evaluated in and the Datatype.mutations it was evaluated at
+
+@dataclass(slots=True)
+class CachedExprNode(Node):
+    token: Token = field(default=None, init=False)
+    node: Node
+    # Builtins called by the expression, checked to still be those builtins before its value gets cached
+    pure_call_names: list[str]
+    cached_value: object = field(default=None, init=False)
+    cached_context: object = field(default=None, init=False)
+    cached_mutations: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        self.pos_start = self.node.pos_start
+        self.pos_end = self.node.pos_end
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.node})"
+
+# Loop invariant expression, evaluated once per run of loop_node
+@dataclass(slots=True)
+class HoistedExprNode(CachedExprNode):
+    loop_node: Node
+    cached_loop_runs: int = field(default=0, init=False)
+
+# First evaluation of an expression repeated later in the same block, always evaluated
+@dataclass(slots=True)
+class CommonExprNode(CachedExprNode):
+    pass
+
+# Repetition of a CommonExprNode, takes its value when it was evaluated in the same context
+@dataclass(slots=True)
+class ReusedExprNode(CachedExprNode):
+    common_node: CommonExprNode
+
+# Quickened nodes, the interpreter rewrites hot generic nodes into these in place (by swapping their class)
+# once it has observed the same operand types enough times, and swaps them back when a type guard fails
+
+@dataclass(slots=True)
+class NumberBinOpNode(BinOpNode):
+    pass
+
+@dataclass(slots=True)
+class LocalAccessNode(AccessNode):
+    pass
+
+@dataclass(slots=True)
+class GlobalAccessNode(AccessNode):
+    pass
+
+# Call whose function body was copied into inlined_body by the optimizer, with its parameters replaced by
+# InlineArgNodes reading the already evaluated arguments, goes back to being a CallNode if the name it calls
+# stops referring to that function
+@dataclass(slots=True)
+class InlinedCallNode(CallNode):
+    pass
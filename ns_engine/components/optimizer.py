@@ -0,0 +1,456 @@
+from typing import Callable, Iterator, Optional, Union
+from copy import copy
+from .node import (Node,
+                   NumberNode, StringNode, FStringNode, ListNode, DictNode,
+                   BinOpNode, UnaryOpNode,
+                   IfNode, ForNode, ForInNode, WhileNode,
+                   FuncDefNode, CallNode, IndexNode, SliceNode, AccessNode, UpdateNode,
+                   VarAssignNode, VarDeleteNode,
+                   ReturnNode, YieldNode,
+                   InlineArgNode, InlinedCallNode,
+                   CachedExprNode, HoistedExprNode, CommonExprNode, ReusedExprNode)
+from .keyword import Keyword
+from .datatypes.functions import pure_built_in_functions
+
+# Passes ran over the tree before it gets interpreted, turn one off to debug a script as it was written
+OPTIMIZATIONS_ENABLED = {
+    "tail_calls": 1,
+    "inlining": 1,
+    "loop_invariants": 1,
+    "common_expressions": 1
+}
+
+# Nodes an inlined function body can be made of, none of them can call anything or change a variable
+INLINABLE_NODE_TYPES = (NumberNode, StringNode, FStringNode, ListNode, DictNode, BinOpNode, UnaryOpNode, IfNode, IndexNode, SliceNode, AccessNode)
+INLINE_MAX_NODES = 24
+
+LOOP_NODE_TYPES = (ForNode, ForInNode, WhileNode)
+
+def iter_child_nodes(node: Node) -> Iterator[Node]:
+    if isinstance(node, ListNode):
+        yield from node.element_nodes
+    elif isinstance(node, FStringNode):
+        yield from node.field_nodes
+    elif isinstance(node, DictNode):
+        yield from node.value_nodes
+    elif isinstance(node, FuncDefNode):
+        yield node.body_node
+    elif isinstance(node, CallNode):
+        yield node.node_to_call
+        yield from node.arg_nodes
+    elif isinstance(node, IndexNode):
+        yield node.node_to_index
+        yield node.index_node
+    elif isinstance(node, SliceNode):
+        yield node.node_to_slice
+        for bound_node in (node.start_node, node.end_node, node.step_node):
+            if bound_node: yield bound_node
+    elif isinstance(node, AccessNode):
+        if node.node_to_access: yield node.node_to_access
+    elif isinstance(node, UpdateNode):
+        if isinstance(node.node_or_identifier_to_update, Node): yield node.node_or_identifier_to_update
+        yield node.new_value_node
+    elif isinstance(node, VarAssignNode):
+        yield node.value_node
+    elif isinstance(node, BinOpNode):
+        yield node.left_node
+        yield node.right_node
+    elif isinstance(node, UnaryOpNode):
+        yield node.node
+    elif isinstance(node, IfNode):
+        for condition, expr, _ in node.cases:
+            yield condition
+            yield expr
+        if node.else_case: yield node.else_case[0]
+    elif isinstance(node, ForNode):
+        yield node.start_value_node
+        yield node.end_value_node
+        if node.step_value_node: yield node.step_value_node
+        yield node.body_node
+    elif isinstance(node, ForInNode):
+        yield node.iterable_node
+        yield node.body_node
+    elif isinstance(node, WhileNode):
+        yield node.condition_node
+        yield node.body_node
+    elif isinstance(node, ReturnNode):
+        if node.node_to_return: yield node.node_to_return
+    elif isinstance(node, YieldNode):
+        yield node.node_to_yield
+    elif isinstance(node, CachedExprNode):
+        yield node.node
+
+# Replaces the children of a node by what transform gives back for them, except for the variable an UpdateNode
+# updates, which isn't evaluated as an expression
+def transform_child_nodes(node: Node, transform: Callable[[Node], Node]):
+    if isinstance(node, ListNode):
+        node.element_nodes = [transform(element_node) for element_node in node.element_nodes]
+    elif isinstance(node, FStringNode):
+        node.field_nodes = [transform(field_node) for field_node in node.field_nodes]
+    elif isinstance(node, DictNode):
+        node.value_nodes = [transform(value_node) for value_node in node.value_nodes]
+    elif isinstance(node, FuncDefNode):
+        node.body_node = transform(node.body_node)
+    elif isinstance(node, CallNode):
+        node.node_to_call = transform(node.node_to_call)
+        node.arg_nodes = [transform(arg_node) for arg_node in node.arg_nodes]
+    elif isinstance(node, IndexNode):
+        node.node_to_index = transform(node.node_to_index)
+        node.index_node = transform(node.index_node)
+    elif isinstance(node, SliceNode):
+        node.node_to_slice = transform(node.node_to_slice)
+        if node.start_node: node.start_node = transform(node.start_node)
+        if node.end_node: node.end_node = transform(node.end_node)
+        if node.step_node: node.step_node = transform(node.step_node)
+    elif isinstance(node, AccessNode):
+        if node.node_to_access: node.node_to_access = transform(node.node_to_access)
+    elif isinstance(node, UpdateNode):
+        node_to_update = node.node_or_identifier_to_update
+        if isinstance(node_to_update, (IndexNode, AccessNode)): transform_child_nodes(node_to_update, transform)
+        node.new_value_node = transform(node.new_value_node)
+    elif isinstance(node, VarAssignNode):
+        node.value_node = transform(node.value_node)
+    elif isinstance(node, BinOpNode):
+        node.left_node = transform(node.left_node)
+        node.right_node = transform(node.right_node)
+    elif isinstance(node, UnaryOpNode):
+        node.node = transform(node.node)
+    elif isinstance(node, IfNode):
+        node.cases = [(transform(condition), transform(expr), should_return_null) for condition, expr, should_return_null in node.cases]
+        if node.else_case: node.else_case = (transform(node.else_case[0]), node.else_case[1])
+    elif isinstance(node, ForNode):
+        node.start_value_node = transform(node.start_value_node)
+        node.end_value_node = transform(node.end_value_node)
+        if node.step_value_node: node.step_value_node = transform(node.step_value_node)
+        node.body_node = transform(node.body_node)
+    elif isinstance(node, ForInNode):
+        node.iterable_node = transform(node.iterable_node)
+        node.body_node = transform(node.body_node)
+    elif isinstance(node, WhileNode):
+        node.condition_node = transform(node.condition_node)
+        node.body_node = transform(node.body_node)
+    elif isinstance(node, ReturnNode):
+        if node.node_to_return: node.node_to_return = transform(node.node_to_return)
+    elif isinstance(node, YieldNode):
+        node.node_to_yield = transform(node.node_to_yield)
+    elif isinstance(node, CachedExprNode):
+        node.node = transform(node.node)
+
+# Children of a node in the order they get evaluated, with whether they always are when the node is
+def iter_evaluated_child_nodes(node: Node) -> Iterator[tuple[Node, bool]]:
+    if isinstance(node, UpdateNode):
+        # Compound assignments read what they update before evaluating the new value
+        if not node.operator_token: yield node.new_value_node, True
+        node_to_update = node.node_or_identifier_to_update
+        if isinstance(node_to_update, Node):
+            for child_node in iter_child_nodes(node_to_update): yield child_node, True
+        if node.operator_token: yield node.new_value_node, True
+    elif isinstance(node, BinOpNode) and node.token.is_keyword_of(Keyword.AND, Keyword.OR):
+        yield node.left_node, True
+        yield node.right_node, False
+    elif isinstance(node, IfNode):
+        for i, child_node in enumerate(iter_child_nodes(node)): yield child_node, i == 0
+    elif isinstance(node, (ForNode, ForInNode)):
+        for child_node in iter_child_nodes(node): yield child_node, child_node is not node.body_node
+    elif isinstance(node, WhileNode):
+        yield node.condition_node, True
+        yield node.body_node, False
+    elif not isinstance(node, FuncDefNode):
+        for child_node in iter_child_nodes(node): yield child_node, True
+
+# The variable a node (re)defines in the symbol table of the context it's evaluated in
+def assigned_name(node: Node) -> Optional[str]:
+    if isinstance(node, (FuncDefNode, VarAssignNode, VarDeleteNode, ForNode, ForInNode)) and node.token:
+        return node.token.value
+    elif isinstance(node, UpdateNode) and not isinstance(node.node_or_identifier_to_update, Node):
+        return node.node_or_identifier_to_update.value
+    
+    return None
+
+def assigned_names(node: Node) -> set[str]:
+    return {name for child_node in iter_function_nodes(node) if (name := assigned_name(child_node))}
+
+# Other code runs while a generator waits at a yield, so what was evaluated before it can be outdated after it
+def contains_yield(node: Node) -> bool:
+    return any(isinstance(child_node, YieldNode) for child_node in iter_function_nodes(node))
+
+def iter_nodes(node: Node) -> Iterator[Node]:
+    nodes_to_visit = [node]
+
+    while nodes_to_visit:
+        node = nodes_to_visit.pop()
+        yield node
+        nodes_to_visit.extend(iter_child_nodes(node))
+
+# Every node of a function body, without going into the functions defined inside it
+def iter_function_nodes(node: Node) -> Iterator[Node]:
+    nodes_to_visit = [node]
+
+    while nodes_to_visit:
+        node = nodes_to_visit.pop()
+        yield node
+
+        if not isinstance(node, FuncDefNode):
+            nodes_to_visit.extend(iter_child_nodes(node))
+
+class Optimizer:
+    def __init__(self, optimizations: dict[str, int] = None):
+        self.optimizations = OPTIMIZATIONS_ENABLED | (optimizations or {})
+
+    def optimize(self, node: Node) -> Node:
+        func_def_nodes = list(self.find_func_defs(node))
+        
+        # How many times each name gets defined anywhere in the script, and every name that can shadow a builtin
+        self.definitions: dict[str, int] = {}
+        for child_node in iter_nodes(node):
+            if name := assigned_name(child_node):
+                self.definitions[name] = self.definitions.get(name, 0) + 1
+                
+        self.defined_names = set(self.definitions)
+        for func_def_node in func_def_nodes:
+            self.defined_names.update(arg_name_token.value for arg_name_token in func_def_node.arg_name_tokens)
+
+        if self.optimizations["tail_calls"]:
+            for func_def_node in func_def_nodes:
+                self.mark_tail_calls(func_def_node)
+
+        if self.optimizations["inlining"]:
+            self.inline_calls(node, func_def_nodes)
+
+        if self.optimizations["loop_invariants"]:
+            for loop_node in [child_node for child_node in iter_nodes(node) if isinstance(child_node, LOOP_NODE_TYPES) and not contains_yield(child_node)]:
+                self.hoist_loop_invariants(loop_node)
+
+        if self.optimizations["common_expressions"]:
+            self.reused_nodes: dict[int, Node] = {}
+            self.available_names: dict[int, set[str]] = {}
+            
+            # Function bodies are evaluated in their own context, so they start with nothing available
+            self.find_common_exprs(node, {})
+            for func_def_node in func_def_nodes:
+                self.find_common_exprs(func_def_node.body_node, {})
+
+            self.common_nodes: dict[int, CommonExprNode] = {
+                id(common_node): CommonExprNode(common_node, self.pure_call_names(common_node))
+                for common_node in self.reused_nodes.values()
+            }
+            node = self.replace_common_exprs(node)
+
+        return node
+
+    def find_func_defs(self, node: Node) -> Iterator[FuncDefNode]:
+        for child_node in iter_nodes(node):
+            if isinstance(child_node, FuncDefNode): yield child_node
+
+    #!================================================================
+
+    def mark_tail_calls(self, node: FuncDefNode):
+        if not node.token or node.yielding_nodes is not None: return
+
+        if node.should_auto_return:
+            self.mark_tail_position(node.body_node, node)
+
+        for function_node in iter_function_nodes(node.body_node):
+            if isinstance(function_node, ReturnNode) and function_node.node_to_return:
+                self.mark_tail_position(function_node.node_to_return, node)
+
+    def mark_tail_position(self, node: Node, func_def_node: FuncDefNode):
+        if isinstance(node, CallNode):
+            if self.is_self_call(node, func_def_node):
+                node.tail_call_body = func_def_node.body_node
+
+        elif isinstance(node, IfNode):
+            # Only single line cases give back their value, blocks give back null
+            for _, expr, should_return_null in node.cases:
+                if not should_return_null: self.mark_tail_position(expr, func_def_node)
+
+            if node.else_case and not node.else_case[1]:
+                self.mark_tail_position(node.else_case[0], func_def_node)
+
+    def is_self_call(self, node: CallNode, func_def_node: FuncDefNode) -> bool:
+        node_to_call = node.node_to_call
+
+        return (
+            isinstance(node_to_call, AccessNode) and not node_to_call.node_to_access and
+            node_to_call.token.value == func_def_node.token.value
+        )
+
+    #!================================================================
+
+    def inline_calls(self, node: Node, func_def_nodes: list[FuncDefNode]):
+        definitions = self.definitions
+        call_nodes = [child_node for child_node in iter_nodes(node) if isinstance(child_node, CallNode)]
+
+        # Functions given a name only once in the whole script, anything else defining it at runtime is caught by
+        # the guard of InlinedCallNode
+        inlinable: dict[str, FuncDefNode] = {
+            func_def_node.token.value: func_def_node for func_def_node in func_def_nodes
+            if func_def_node.token and definitions[func_def_node.token.value] == 1 and self.is_inlinable(func_def_node)
+        }
+
+        for call_node in call_nodes:
+            node_to_call = call_node.node_to_call
+            if not isinstance(node_to_call, AccessNode) or node_to_call.node_to_access: continue
+
+            func_def_node = inlinable.get(node_to_call.token.value)
+            if not func_def_node or len(func_def_node.arg_name_tokens) != len(call_node.arg_nodes): continue
+
+            arg_names = [arg_name_token.value for arg_name_token in func_def_node.arg_name_tokens]
+            call_node.inlined_arg_values = [None] * len(arg_names)
+            call_node.inlined_body = self.substitute_args(func_def_node.body_node, arg_names, call_node.inlined_arg_values)
+            call_node.inlined_function_body = func_def_node.body_node
+            call_node.__class__ = InlinedCallNode
+
+    def is_inlinable(self, node: FuncDefNode) -> bool:
+        if not node.should_auto_return: return False
+
+        node_count = 0
+        for body_node in iter_function_nodes(node.body_node):
+            node_count += 1
+            if node_count > INLINE_MAX_NODES or type(body_node) not in INLINABLE_NODE_TYPES: return False
+
+        return True
+
+    # Copy of an inlinable body with its parameters read from the values the inlined call evaluated
+    def substitute_args(self, node: Node, arg_names: list[str], arg_values: list) -> Node:
+        if isinstance(node, AccessNode) and not node.node_to_access and node.token.value in arg_names:
+            inline_arg_node = InlineArgNode(node.token, arg_values, arg_names.index(node.token.value))
+            inline_arg_node.pos_start, inline_arg_node.pos_end = node.pos_start, node.pos_end
+            return inline_arg_node
+        
+        node = copy(node)
+        transform_child_nodes(node, lambda child_node: self.substitute_args(child_node, arg_names, arg_values))
+        return node
+
+    #!================================================================
+
+    # Effect analysis, an expression is pure when evaluating it changes nothing and only depends on variables and
+    # datatypes, the interpreter still checks at runtime that no datatype changed while evaluating it
+    def is_pure(self, node: Node) -> bool:
+        if isinstance(node, (NumberNode, StringNode, FStringNode, AccessNode, BinOpNode, UnaryOpNode, IndexNode, SliceNode)):
+            return all(self.is_pure(child_node) for child_node in iter_child_nodes(node))
+        elif type(node) is CallNode:
+            return self.is_pure_call(node) and all(self.is_pure(arg_node) for arg_node in node.arg_nodes)
+
+        return False
+
+    def is_pure_call(self, node: CallNode) -> bool:
+        node_to_call = node.node_to_call
+
+        return (
+            isinstance(node_to_call, AccessNode) and not node_to_call.node_to_access and
+            node_to_call.token.value in pure_built_in_functions and node_to_call.token.value not in self.defined_names
+        )
+
+    # Expressions worth caching, variables and literals are as fast to evaluate as a cached value
+    def is_cacheable(self, node: Node) -> bool:
+        if isinstance(node, (NumberNode, StringNode)) or (isinstance(node, AccessNode) and not node.node_to_access):
+            return False
+
+        return self.is_pure(node)
+
+    def free_names(self, node: Node) -> set[str]:
+        return {
+            child_node.token.value for child_node in iter_nodes(node)
+            if isinstance(child_node, AccessNode) and not child_node.node_to_access
+        }
+
+    def pure_call_names(self, node: Node) -> list[str]:
+        return list({child_node.node_to_call.token.value for child_node in iter_nodes(node) if isinstance(child_node, CallNode)})
+
+    def expr_key(self, node: Node) -> tuple:
+        token = node.token
+        token_key = (token.type, type(token.value), token.value) if token else None
+        
+        # Only the bounds written are children, a[1:] and a[:1] must not get the same key
+        if isinstance(node, SliceNode):
+            token_key = (node.start_node is not None, node.end_node is not None, node.step_node is not None)
+        # The token of an f-string holds the tokens of its fields, the text around them is what tells them apart
+        elif isinstance(node, FStringNode):
+            token_key = (node.literals, node.format_specs)
+
+        return (type(node), token_key, *[self.expr_key(child_node) for child_node in iter_child_nodes(node)])
+
+    #!================================================================
+
+    # Loop invariant code motion, pure expressions of a loop reading no variable the loop assigns are only
+    # evaluated the first time a run of the loop reaches them
+    def hoist_loop_invariants(self, node: Union[ForNode, ForInNode, WhileNode]):
+        loop_assigned_names = assigned_names(node)
+        hoist = lambda child_node: self.hoist(child_node, loop_assigned_names, node)
+
+        if isinstance(node, WhileNode):
+            node.condition_node = hoist(node.condition_node)
+
+        node.body_node = hoist(node.body_node)
+
+    def hoist(self, node: Node, loop_assigned_names: set[str], loop_node: Union[ForNode, ForInNode, WhileNode]) -> Node:
+        if isinstance(node, (FuncDefNode, CachedExprNode)):
+            return node
+
+        if self.is_cacheable(node) and not (self.free_names(node) & loop_assigned_names):
+            return HoistedExprNode(node, self.pure_call_names(node), loop_node)
+
+        transform_child_nodes(node, lambda child_node: self.hoist(child_node, loop_assigned_names, loop_node))
+        return node
+
+    #!================================================================
+
+    # Common subexpression elimination, a pure expression evaluated again before any variable it reads was assigned
+    # takes the value of the first evaluation. available maps the expressions evaluated so far on every path to the
+    # current node to the node that evaluated them
+    def find_common_exprs(self, node: Node, available: dict[tuple, Node]):
+        if isinstance(node, (FuncDefNode, CachedExprNode)):
+            pass
+
+        elif self.is_cacheable(node):
+            key = self.expr_key(node)
+            common_node = available.get(key)
+
+            if common_node:
+                self.reused_nodes[id(node)] = common_node
+                return
+
+            for child_node, is_always_evaluated in iter_evaluated_child_nodes(node):
+                self.find_common_exprs(child_node, available if is_always_evaluated else dict(available))
+
+            available[key] = node
+            self.available_names[id(node)] = self.free_names(node)
+            return
+
+        else:
+            if isinstance(node, LOOP_NODE_TYPES): self.kill_loop_names(available, node)
+
+            for child_node, is_always_evaluated in iter_evaluated_child_nodes(node):
+                if is_always_evaluated:
+                    self.find_common_exprs(child_node, available)
+                else:
+                    self.find_common_exprs(child_node, dict(available))
+                    self.kill_names(available, assigned_names(child_node))
+                    if contains_yield(child_node): available.clear()
+
+            if isinstance(node, LOOP_NODE_TYPES): self.kill_loop_names(available, node)
+            if isinstance(node, YieldNode): available.clear()
+
+        if name := assigned_name(node):
+            self.kill_names(available, {name})
+
+    def kill_loop_names(self, available: dict[tuple, Node], node: Node):
+        if contains_yield(node):
+            available.clear()
+        else:
+            self.kill_names(available, assigned_names(node))
+
+    def kill_names(self, available: dict[tuple, Node], names: set[str]):
+        for key, common_node in list(available.items()):
+            if self.available_names[id(common_node)] & names: del available[key]
+
+    def replace_common_exprs(self, node: Node) -> Node:
+        common_node = self.reused_nodes.get(id(node))
+        if common_node:
+            return ReusedExprNode(node, self.pure_call_names(node), self.common_nodes[id(common_node)])
+
+        transform_child_nodes(node, self.replace_common_exprs)
+
+        common_expr_node = self.common_nodes.get(id(node))
+        return common_expr_node or node
@@ -0,0 +1,84 @@
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, TextIO
+import sys
+
+# When the text written to an Output reaches its target
+LINE = "line"           # Every print, like a terminal
+SIZE = "size"           # Once buffer_size characters are waiting, like a pipe or file
+EXPLICIT = "explicit"   # Only on flush() and when the script ends
+
+FLUSH_POLICIES = (LINE, SIZE, EXPLICIT)
+BUFFER_SIZE = 1 << 16
+
+# Where print writes to. The text is buffered as pieces and joined once per flush, so a whole batch of prints reaches
+# the target as a single write. The target is a file-like object or a callback given the text, sys.stdout at the time
+# of the flush when there's none
+class Output:
+    __slots__ = ("target", "policy", "buffer_size", "pieces", "size")
+
+    def __init__(self, target: Optional[TextIO | Callable[[str], Any]] = None, policy: str = None,
+                 buffer_size: int = BUFFER_SIZE):
+        if policy is not None and policy not in FLUSH_POLICIES:
+            raise ValueError(f"Unknown flush policy '{policy}', expected one of {', '.join(FLUSH_POLICIES)}")
+
+        self.target = target
+        self.policy = policy or self._default_policy()
+        self.buffer_size = buffer_size
+        self.pieces: list[str] = []
+        self.size = 0
+
+    def __repr__(self) -> str:
+        return f"Output({self.target or 'stdout'}, {self.policy})"
+
+    def _default_policy(self) -> str:
+        target = self.target or sys.stdout
+        is_terminal = getattr(target, "isatty", None)
+        return LINE if is_terminal and is_terminal() else SIZE
+
+    def write(self, text: str):
+        self.pieces.append(text)
+        self.size += len(text)
+
+        if self.policy == LINE or (self.policy == SIZE and self.size >= self.buffer_size):
+            self.flush()
+
+    def flush(self):
+        if not self.pieces: return
+
+        text = "".join(self.pieces)
+        self.pieces.clear()
+        self.size = 0
+
+        target = self.target or sys.stdout
+        write = getattr(target, "write", None)
+
+        if write is None:
+            target(text)
+            return
+
+        write(text)
+        if hasattr(target, "flush"): target.flush()
+
+# The Output of the script running now, scripts ran by it (run, import) write to the same one
+channel = Output()
+
+@contextmanager
+def redirected(output: Optional[Output]) -> Iterator[Output]:
+    global channel
+
+    if output is None:
+        try:
+            yield channel
+        finally:
+            channel.flush()
+        return
+
+    previous = channel
+    previous.flush()
+    channel = output
+
+    try:
+        yield output
+    finally:
+        output.flush()
+        channel = previous
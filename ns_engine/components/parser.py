@@ -1,20 +1,30 @@
 from dataclasses import dataclass, field
-from typing import Callable, Self, Optional
+from typing import Callable, Self, Optional, Union
 from .token import Token, TokenType
 from .keyword import Keyword
 from .node import (Node, 
-                   NumberNode, StringNode, ListNode, DictNode,
+                   NumberNode, StringNode, FStringNode, ListNode, DictNode,
                    BinOpNode, UnaryOpNode, 
-                   IfNode, ForNode, WhileNode,
-                   FuncDefNode, CallNode, IndexNode, AccessNode, UpdateNode,
+                   IfNode, ForNode, ForInNode, WhileNode,
+                   FuncDefNode, CallNode, IndexNode, SliceNode, AccessNode, UpdateNode,
                    VarAssignNode, VarDeleteNode,
-                   ReturnNode, ContinueNode, BreakNode)
+                   ReturnNode, YieldNode, ContinueNode, BreakNode)
 from .errors import Error, NSInvalidSyntaxError
 from ..utils.expected import expected
 from ..utils.debug import DebugMessage
 
 debug_message = DebugMessage()
 
+# The operation each compound assignment does with the updated value
+COMPOUND_ASSIGNMENT_OPERATORS = {
+    TokenType.PLUSEQUAL: TokenType.PLUS,
+    TokenType.MINUSEQUAL: TokenType.MINUS,
+    TokenType.MULTEQUAL: TokenType.MULT,
+    TokenType.DIVEQUAL: TokenType.DIV,
+    TokenType.MODEQUAL: TokenType.MOD,
+    TokenType.POWEREQUAL: TokenType.POWER
+}
+
 @dataclass(slots=True)
 class ParseResult:
     error: Error = field(default=None, init=False)
@@ -65,6 +75,8 @@ class Parser:
     tokens: list[Token]
     token_index: int = field(default=-1, init=False)
     current_token: Token = field(default=None, init=False)
+    # Yields found in each function being parsed, innermost last
+    function_yield_nodes: list[list[YieldNode]] = field(default_factory=list, init=False)
     
     def __post_init__(self):
         self.advance()
@@ -201,6 +213,22 @@ class Parser:
                 expr
             ))
 
+        elif self.current_token.is_keyword_of(Keyword.YIELD):
+            if not self.function_yield_nodes:
+                return p_result.failure(NSInvalidSyntaxError(
+                    "'yield' can only be used inside a function",
+                    self.current_token.pos_start, self.current_token.pos_end
+                ))
+            
+            self.advance_register_advancement(p_result, False)
+            
+            expr: Node = p_result.register(self.expr())
+            if p_result.error: return p_result
+            
+            yield_node = YieldNode(pos_start, self.current_token.pos_end.copy(), expr)
+            self.function_yield_nodes[-1].append(yield_node)
+            return p_result.success(yield_node)
+
         elif self.current_token.is_keyword_of(Keyword.CONTINUE):
             self.advance_register_advancement(p_result, False)
             return p_result.success(ContinueNode(
@@ -216,7 +244,7 @@ class Parser:
         expr = p_result.register(self.expr())
         if p_result.error:
             return p_result.failure(NSInvalidSyntaxError(
-                expected(Keyword.RETURN, Keyword.CONTINUE, Keyword.BREAK, Keyword.SETVAR, Keyword.DELETEVAR,
+                expected(Keyword.RETURN, Keyword.YIELD, Keyword.CONTINUE, Keyword.BREAK, Keyword.SETVAR, Keyword.DELETEVAR,
                          Keyword.NOT, Keyword.IF, Keyword.FOR, Keyword.WHILE, Keyword.SETFUNCTION,
                          TokenType.NUMBER, TokenType.PLUS, TokenType.MINUS, TokenType.IDENTIFIER, TokenType.LPAREN, TokenType.LSQUARE
                          ),
@@ -390,8 +418,16 @@ class Parser:
             elif self.current_token.is_type_of(TokenType.LSQUARE):
                 self.advance_register_advancement(p_result, False)
                 
-                index_node: Node = p_result.register(self.expr())
-                if p_result.error: return p_result
+                index_node: Node = None
+                
+                if not self.current_token.is_type_of(TokenType.COLON):
+                    index_node = p_result.register(self.expr())
+                    if p_result.error: return p_result
+                
+                if self.current_token.is_type_of(TokenType.COLON):
+                    atom = p_result.register(self.slice(atom, index_node))
+                    if p_result.error: return p_result
+                    continue
 
                 if not self.current_token.is_type_of(TokenType.RSQUARE):
                     return p_result.failure(
@@ -404,14 +440,10 @@ class Parser:
                 self.advance_register_advancement(p_result, False)
                 atom = IndexNode(atom, index_node)
                 
-                if self.current_token.is_type_of(TokenType.EQUALS):
-                    self.advance_register_advancement(p_result, False)
-                    expr = p_result.register(self.expr())
-                    
+                if self.current_token.is_type_of(TokenType.EQUALS, *COMPOUND_ASSIGNMENT_OPERATORS):
+                    atom = p_result.register(self.update(atom))
                     if p_result.error: return p_result
                     
-                    atom = UpdateNode(atom, expr)
-                    
             elif self.current_token.is_type_of(TokenType.DOT):
                 self.advance_register_advancement(p_result, False)
                 
@@ -428,19 +460,86 @@ class Parser:
                 self.advance_register_advancement(p_result, False)
                 atom = AccessNode(attribute_name_token, atom)
                 
-                if self.current_token.is_type_of(TokenType.EQUALS):
-                    self.advance_register_advancement(p_result, False)
-                    expr = p_result.register(self.expr())
-                    
+                if self.current_token.is_type_of(TokenType.EQUALS, *COMPOUND_ASSIGNMENT_OPERATORS):
+                    atom = p_result.register(self.update(atom))
                     if p_result.error: return p_result
-                    
-                    atom = UpdateNode(atom, expr)
                 
             else:
                 break
 
         return p_result.success(atom)
 
+    def fstring_expr(self) -> ParseResult:
+        p_result = ParseResult()
+        token = self.current_token
+        field_nodes: list[Node] = []
+        format_specs: list[Optional[str]] = []
+        
+        # Past the f-string first, so errors in its fields are the ones reported
+        self.advance_register_advancement(p_result, False)
+        
+        # The lexer made the tokens of each field, each one is parsed on its own as one expression
+        for tokens, format_spec in token.value[1::2]:
+            field_parser = Parser(tokens)
+            field_result = field_parser.expr()
+            if field_result.error: return p_result.failure(field_result.error)
+            
+            if not field_parser.current_token.is_type_of(TokenType.EOF):
+                return p_result.failure(NSInvalidSyntaxError(
+                    expected(TokenType.RBRACE),
+                    field_parser.current_token.pos_start, field_parser.current_token.pos_end
+                ))
+            
+            field_nodes.append(field_result.node)
+            format_specs.append(format_spec)
+        
+        return p_result.success(FStringNode(token, tuple(token.value[::2]), field_nodes, tuple(format_specs)))
+    
+    # The rest of a[start:end:step] once its start was parsed, the current token being the first colon
+    def slice(self, node_to_slice: Node, start_node: Optional[Node]) -> ParseResult:
+        p_result = ParseResult()
+        bound_nodes: list[Optional[Node]] = [start_node]
+        
+        while self.current_token.is_type_of(TokenType.COLON) and len(bound_nodes) < 3:
+            self.advance_register_advancement(p_result, False)
+            
+            if self.current_token.is_type_of(TokenType.COLON, TokenType.RSQUARE):
+                bound_nodes.append(None)
+                continue
+            
+            bound_nodes.append(p_result.register(self.expr()))
+            if p_result.error: return p_result
+        
+        if not self.current_token.is_type_of(TokenType.RSQUARE):
+            return p_result.failure(
+                NSInvalidSyntaxError(
+                    expected(TokenType.RSQUARE),
+                    self.current_token.pos_start, self.current_token.pos_end
+                )
+            )
+        
+        pos_end = self.current_token.pos_end
+        self.advance_register_advancement(p_result, False)
+        
+        start_node, end_node, step_node = bound_nodes + [None] * (3 - len(bound_nodes))
+        return p_result.success(SliceNode(pos_end, node_to_slice, start_node, end_node, step_node))
+    
+    def update(self, node_or_identifier_to_update: Union[Node, Token]) -> ParseResult:
+        p_result = ParseResult()
+        assignment_token = self.current_token
+        operator_token = None
+        
+        if assignment_token.type in COMPOUND_ASSIGNMENT_OPERATORS:
+            operator_token = Token(COMPOUND_ASSIGNMENT_OPERATORS[assignment_token.type], 
+                                   pos_start=assignment_token.pos_start, pos_end=assignment_token.pos_end)
+        
+        self.advance_register_advancement(p_result, False)
+        
+        expr = p_result.register(self.expr())
+        if p_result.error: return p_result
+        
+        return p_result.success(UpdateNode(node_or_identifier_to_update, expr, operator_token))
+
     def atom(self) -> ParseResult:
         p_result = ParseResult()
         token = self.current_token
@@ -452,20 +551,20 @@ class Parser:
         elif token.is_type_of(TokenType.STRING):
             self.advance_register_advancement(p_result, False)
             return p_result.success(StringNode(token))
+        
+        elif token.is_type_of(TokenType.FSTRING):
+            fstring_node = p_result.register(self.fstring_expr())
+            if p_result.error: return p_result
+            return p_result.success(fstring_node)
                
         elif token.is_type_of(TokenType.IDENTIFIER):
             self.advance_register_advancement(p_result, False)
             
-            if self.current_token.is_type_of(TokenType.EQUALS):
-                var_name_token = token
-            
-                self.advance_register_advancement(p_result, False)
-                
-                expr = p_result.register(self.expr())
-                
+            if self.current_token.is_type_of(TokenType.EQUALS, *COMPOUND_ASSIGNMENT_OPERATORS):
+                update_node = p_result.register(self.update(token))
                 if p_result.error: return p_result
-                    
-                return p_result.success(UpdateNode(var_name_token, expr))
+                
+                return p_result.success(update_node)
             else:
                 return p_result.success(AccessNode(token))
         
@@ -601,10 +700,10 @@ class Parser:
             self.advance_register_advancement(p_result, False)
             return p_result.success(DictNode(pos_start, self.current_token.pos_end.copy(), key_tokens, value_nodes))
         
-        if not self.current_token.is_type_of(TokenType.IDENTIFIER, TokenType.STRING):
+        if not self.current_token.is_type_of(TokenType.IDENTIFIER, TokenType.STRING, TokenType.NUMBER):
             self.reverse(to_reverse - 1)
             return p_result.failure(NSInvalidSyntaxError(
-                expected(TokenType.IDENTIFIER, TokenType.STRING),
+                expected(TokenType.IDENTIFIER, TokenType.STRING, TokenType.NUMBER),
                 self.current_token.pos_start, self.current_token.pos_end
             ))
         
@@ -636,10 +735,10 @@ class Parser:
         while self.current_token.is_type_of(TokenType.COMMA):
             to_reverse = self.advance_register_advancement(p_result, True)
             
-            if not self.current_token.is_type_of(TokenType.IDENTIFIER, TokenType.STRING):
+            if not self.current_token.is_type_of(TokenType.IDENTIFIER, TokenType.STRING, TokenType.NUMBER):
                 self.reverse(to_reverse - 1)
                 return p_result.failure(NSInvalidSyntaxError(
-                    expected(TokenType.IDENTIFIER, TokenType.STRING),
+                    expected(TokenType.IDENTIFIER, TokenType.STRING, TokenType.NUMBER),
                     self.current_token.pos_start, self.current_token.pos_end
                 ))
             
@@ -801,9 +900,18 @@ class Parser:
         var_name_token = self.current_token
         self.advance_register_advancement(p_result, False)
 
+        if self.current_token.is_keyword_of(Keyword.IN):
+            self.advance_register_advancement(p_result, False)
+            
+            iterable_node: Node = p_result.register(self.expr())
+            if p_result.error: return p_result
+            
+            make_for_node = lambda body_node, should_return_null: ForInNode(var_name_token, iterable_node, body_node, should_return_null)
+            return self.for_expr_body(p_result, make_for_node)
+
         if not self.current_token.is_type_of(TokenType.EQUALS):
             return p_result.failure(NSInvalidSyntaxError(
-                expected(TokenType.EQUALS),
+                expected(TokenType.EQUALS, Keyword.IN),
                 self.current_token.pos_start, self.current_token.pos_end
             ))
         
@@ -831,6 +939,10 @@ class Parser:
         else:
             step_value_node = None
 
+        make_for_node = lambda body_node, should_return_null: ForNode(var_name_token, start_value_node, end_value_node, step_value_node, body_node, should_return_null)
+        return self.for_expr_body(p_result, make_for_node)
+    
+    def for_expr_body(self, p_result: ParseResult, make_for_node: Callable[[Node, bool], Node]) -> ParseResult:
         if not self.current_token.is_keyword_of(Keyword.THEN):
             return p_result.failure(NSInvalidSyntaxError(
                 expected(Keyword.THEN),
@@ -854,12 +966,12 @@ class Parser:
 
             self.advance_register_advancement(p_result, False)
 
-            return p_result.success(ForNode(var_name_token, start_value_node, end_value_node, step_value_node, body_node, True))
+            return p_result.success(make_for_node(body_node, True))
 
         body_node: Node = p_result.register(self.statement())
         if p_result.error: return p_result
 
-        return p_result.success(ForNode(var_name_token, start_value_node, end_value_node, step_value_node, body_node, False))
+        return p_result.success(make_for_node(body_node, False))
 
     def while_expr(self) -> ParseResult:
         p_result = ParseResult()
@@ -969,6 +1081,46 @@ class Parser:
         
         self.advance_register_advancement(p_result, False)
         
+        self.function_yield_nodes.append([])
+        p_result = self.func_def_body(p_result, var_name_token, arg_name_tokens)
+        yield_nodes = self.function_yield_nodes.pop()
+        
+        if p_result.error or not yield_nodes: return p_result
+        
+        func_def_node: FuncDefNode = p_result.node
+        func_def_node.yielding_nodes = set()
+        self.find_yielding_nodes(func_def_node.body_node, func_def_node.yielding_nodes)
+        
+        for yield_node in yield_nodes:
+            if id(yield_node) not in func_def_node.yielding_nodes:
+                return p_result.failure(NSInvalidSyntaxError(
+                    "'yield' can only be used in blocks, ifs and loops of a function",
+                    yield_node.pos_start, yield_node.pos_end
+                ))
+        
+        return p_result
+    
+    # Generator bodies are run by the interpreter resuming only the nodes a yield can be in, which are statements of
+    # blocks, ifs and loops, so each of them gets marked on the way down to a yield
+    def find_yielding_nodes(self, node: Node, yielding_nodes: set[int]) -> bool:
+        if isinstance(node, ListNode):
+            child_nodes = node.element_nodes
+        elif isinstance(node, IfNode):
+            child_nodes = [expr for _, expr, _ in node.cases] + ([node.else_case[0]] if node.else_case else [])
+        elif isinstance(node, (ForNode, ForInNode, WhileNode)):
+            child_nodes = [node.body_node]
+        else:
+            child_nodes = []
+        
+        contains_yield = isinstance(node, YieldNode)
+        
+        for child_node in child_nodes:
+            if self.find_yielding_nodes(child_node, yielding_nodes): contains_yield = True
+        
+        if contains_yield: yielding_nodes.add(id(node))
+        return contains_yield
+    
+    def func_def_body(self, p_result: ParseResult, var_name_token: Optional[Token], arg_name_tokens: list[Token]) -> ParseResult:
         if self.current_token.is_type_of(TokenType.RIGHTARROW):
             self.advance_register_advancement(p_result, False)
             
@@ -14,6 +14,7 @@ class RuntimeResult:
     error: Error = field(default=None, init=False)
     loop_should_continue: bool = field(default=False, init=False)
     loop_should_break: bool = field(default=False, init=False)
+    tail_call_args: list[Datatype] = field(default=None, init=False)
 
     def reset(self) -> None:
         self.value = None
@@ -21,12 +22,14 @@ class RuntimeResult:
         self.error = None
         self.loop_should_continue = False
         self.loop_should_break = False
+        self.tail_call_args = None
         
     def register(self, result: Self) -> Datatype:
         self.error = result.error
         self.func_return_value = result.func_return_value
         self.loop_should_continue = result.loop_should_continue
         self.loop_should_break = result.loop_should_break
+        self.tail_call_args = result.tail_call_args
         
         return result.value
     
@@ -40,6 +43,11 @@ class RuntimeResult:
         self.func_return_value = value
         return self
     
+    def success_tail_call(self, args: list[Datatype]) -> Self:
+        self.reset()
+        self.tail_call_args = args
+        return self
+    
     def success_continue(self) -> Self:
         self.reset()
         self.loop_should_continue = True
@@ -60,7 +68,8 @@ class RuntimeResult:
             self.error or
             self.func_return_value or
             self.loop_should_continue or
-            self.loop_should_break
+            self.loop_should_break or
+            self.tail_call_args is not None
         )
         
     def an_error_occurred(self) -> bool:
@@ -1,11 +1,16 @@
 from dataclasses import dataclass, field
-from typing import Self, Tuple, Optional
+from typing import Iterator, Self, Tuple, Optional
 from gc import collect as gc_collect
 from .datatypes import Datatype, Number, convert_to_datatype 
 from .datatypes.functions import BuiltInFunction, built_in_functions
 
 SYMBOLS_DICT = dict[str, Datatype]
 
+# Bumped every time a name starts or stops being defined in some symbol table, invalidating the lookups
+# cached for that name. Function frames chain to the caller's table, so without the cache every lookup
+# of a global from a deep recursion would walk the whole call chain
+definition_epochs: dict[str, int] = {}
+
 @dataclass(slots=True)
 class SymbolTable:
     symbols: SYMBOLS_DICT = field(default_factory=dict, init=False)
@@ -13,6 +18,7 @@ class SymbolTable:
     persistent_symbols: SYMBOLS_DICT = field(default_factory=dict, init=False)
     
     parent: Self = field(default=None)
+    resolved: dict[str, Tuple[Optional[Self], int]] = field(default_factory=dict, init=False)
     
     def __repr__(self) -> str:
         return f"SymbolTable({len(self.symbols)} symbols, {len(self.immutable_symbols)} immutable_symbols, {len(self.persistent_symbols)} persistent_symbols)"
@@ -25,25 +31,39 @@ class SymbolTable:
         return symbols_dict
     
     def get(self, name: str) -> Optional[Datatype]:
-        _, symbols_dict = self.exists_where(name)
-        
-        value = symbols_dict.get(name) if symbols_dict else None
+        symbol_table = self.resolve(name)
+        if not symbol_table: return None
         
-        if not value and self.parent:
-            value = self.parent.get(name)
-            
-        return value
+        _, symbols_dict = symbol_table.exists_where(name)
+        return symbols_dict.get(name)
     
     def set(self, name: str, value: Datatype, type: str):
         if not isinstance(value, Datatype):
             value = convert_to_datatype(value)
+        if not self.defines(name):
+            definition_epochs[name] = definition_epochs.get(name, 0) + 1
         self._get_symbols_dict(type)[name] = value
         
     def remove(self, name: str):
         _, symbols_dict = self.exists_where(name)
         del symbols_dict[name]
+        definition_epochs[name] = definition_epochs.get(name, 0) + 1
         gc_collect()
         
+    # Like remove, without collecting the garbage, for names removed all the time
+    def drop(self, name: str):
+        _, symbols_dict = self.exists_where(name)
+        del symbols_dict[name]
+        definition_epochs[name] = definition_epochs.get(name, 0) + 1
+    
+    def names(self) -> Iterator[str]:
+        yield from self.immutable_symbols
+        yield from self.symbols
+        yield from self.persistent_symbols
+    
+    def count(self) -> int:
+        return len(self.immutable_symbols) + len(self.symbols) + len(self.persistent_symbols)
+        
     def exists(self, name: str) -> bool:
         symbols_dict_name, _ = self.exists_where(name)
         return symbols_dict_name != None
@@ -59,9 +79,57 @@ class SymbolTable:
             if name in v: return k, v
             
         return None, None
-    
+
+    def defines(self, name: str) -> bool:
+        return name in self.immutable_symbols or name in self.symbols or name in self.persistent_symbols
+
+    def resolve(self, name: str) -> Optional[Self]:
+        epoch = definition_epochs.get(name, 0)
+        unresolved: list[Self] = []
+        symbol_table = self
+        
+        while symbol_table:
+            if symbol_table.defines(name): break
+            
+            cached = symbol_table.resolved.get(name)
+            if cached and cached[1] == epoch:
+                # A table emptied without bumping the epoch can't be trusted, walk from here again instead
+                if cached[0] is None or cached[0].defines(name):
+                    symbol_table = cached[0]
+                    break
+                
+                del symbol_table.resolved[name]
+            
+            unresolved.append(symbol_table)
+            symbol_table = symbol_table.parent
+            
+        for unresolved_symbol_table in unresolved:
+            unresolved_symbol_table.resolved[name] = (symbol_table, epoch)
+            
+        return symbol_table
+
+    def find(self, name: str) -> Tuple[Optional[Self], Optional[str]]:
+        symbol_table = self.resolve(name)
+        if not symbol_table: return None, None
+        
+        symbols_dict_type, _ = symbol_table.exists_where(name)
+        if not symbols_dict_type: return None, None
+        
+        return symbol_table, symbols_dict_type
+
     def clear(self, type: str):
         self._get_symbols_dict(type).clear()
+    
+    # Empties every symbols dict for the table to be reused, bumping the names it had so no lookup cached through it
+    # stays valid
+    def reset(self):
+        for symbols_dict in (self.immutable_symbols, self.symbols, self.persistent_symbols):
+            for name in symbols_dict:
+                definition_epochs[name] = definition_epochs.get(name, 0) + 1
+            
+            symbols_dict.clear()
+        
+        self.resolved.clear()
 
 def setup_starter_symbol_table(**extras) -> SymbolTable:
     symbol_table = SymbolTable()
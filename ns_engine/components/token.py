@@ -27,12 +27,12 @@ class TokenType(Enum):
 
     # Assignment operators
     EQUALS = "="
-    PLUSEQUAL = "+=" # unused
-    MINUSEQUAL = "-=" # unused
-    MULTEQUAL = "*=" # unused
-    POWEREQUAL = "**=" # unused
-    DIVEQUAL = "/=" # unused
-    MODEQUAL = "%=" # unused
+    PLUSEQUAL = "+="
+    MINUSEQUAL = "-="
+    MULTEQUAL = "*="
+    POWEREQUAL = "**="
+    DIVEQUAL = "/="
+    MODEQUAL = "%="
     
     # Parentheses, Square  & Braces
     LPAREN = "("
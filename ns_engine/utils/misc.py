@@ -1,6 +1,7 @@
-from os import name as os_name, getcwd as os_getcwd, chdir as os_chdir
+from os import name as os_name, getcwd as os_getcwd, chdir as os_chdir, fstat as os_fstat
 from os.path import abspath as osp_abspath, isfile as osp_isfile
 from contextlib import contextmanager
+from mmap import mmap, ACCESS_READ
 from re import compile as re_compile
 
 def set_console_title(title):
@@ -29,25 +30,21 @@ def temp_cwd(temp_dir: str):
     finally:
         os_chdir(original_dir)
     
-def clean_filetextdata(text: str) -> str:
-    new_text_in_lines = []
-    
-    for text_line in text.split("\n"):
-        text_line = text_line.strip()
-        # if not text_line: continue
-        new_text_in_lines.append(text_line)
-
-    return "\n".join(new_text_in_lines)
-    
-def get_filedata(filename: str) -> str:
+# The file is mapped and decoded straight from the mapping, so the str given to the lexer is the only copy of the
+# source. It's kept as it is, indentation and "\r" are skipped by the lexer and errors point at the real columns
+def load_source(filename: str) -> str:
     file_abspath = osp_abspath(filename)
     
     #! It's not in a try-except block by design
     if not osp_isfile(file_abspath):
         raise FileNotFoundError(f"The provided path is not a file: '{file_abspath}'")
+    
+    with open(file_abspath, "rb") as f:
+        # Empty files can't be mapped
+        if not os_fstat(f.fileno()).st_size: return ""
         
-    with open(file_abspath, "r", encoding="utf-8") as f:
-        return clean_filetextdata(f.read())
+        with mmap(f.fileno(), 0, access=ACCESS_READ) as mapped:
+            return str(mapped, "utf-8")
 
 def look_like_path(string: str) -> bool:
     path_pattern = re_compile(
@@ -0,0 +1,586 @@
+from typing import Any, Iterable, Iterator, Optional, Self
+from operator import index as op_index
+
+# Persistent structures behind List and Dict. Their nodes are never changed once built, every update copies only the
+# path down to what changed and shares the rest, so copying a whole structure is just sharing its root.
+# Vector and HashMap are handles over those roots, updating one rebinds its own root and leaves every copy untouched
+
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+HASH_MASK = (1 << 64) - 1
+
+_MISSING = object()
+
+def _new_path(level: int, node: tuple) -> tuple:
+    while level:
+        node = (node, )
+        level -= BITS
+    return node
+
+# Vector, a trie of 32 wide nodes holding the elements in its leaves, plus a tail leaf where appends land
+class Vector:
+    __slots__ = ("_count", "_shift", "_root", "_tail")
+
+    def __init__(self, items: Iterable[Any] = ()):
+        items = tuple(items)
+        count = len(items)
+
+        # Everything fits in the tail
+        if count <= WIDTH:
+            self._count = count
+            self._shift = BITS
+            self._root = ()
+            self._tail = items
+            return
+
+        tail_offset = self._tail_offset_of(count)
+
+        nodes = [items[i:i + WIDTH] for i in range(0, tail_offset, WIDTH)]
+        shift = BITS
+
+        while len(nodes) > WIDTH:
+            nodes = [tuple(nodes[i:i + WIDTH]) for i in range(0, len(nodes), WIDTH)]
+            shift += BITS
+
+        self._count = count
+        self._shift = shift
+        self._root = tuple(nodes)
+        self._tail = items[tail_offset:]
+
+    def __repr__(self) -> str:
+        return f"Vector({list(self)})"
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Any]:
+        # Small vectors are only a tail, iterating it directly skips making a generator
+        if not self._root:
+            return iter(self._tail)
+        return self._iter_leaves()
+
+    def _iter_leaves(self) -> Iterator[Any]:
+        for start in range(0, self._tail_offset(), WIDTH):
+            yield from self._leaf_for(start)
+        yield from self._tail
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Vector):
+            return NotImplemented
+        if self.shares_contents(other):
+            return True
+        return self._count == other._count and all(a == b for a, b in zip(self, other))
+
+    # Copies nothing was changed in since share their nodes, so they hold the same elements without looking at them
+    def shares_contents(self, other: Self) -> bool:
+        return self._root is other._root and self._tail is other._tail
+
+    __hash__ = None
+
+    def __getitem__(self, i: int) -> Any:
+        i = self._checked_index(i)
+        return self._leaf_for(i)[i & MASK]
+
+    def __setitem__(self, i: int, value: Any):
+        i = self._checked_index(i)
+
+        if i >= self._tail_offset():
+            tail = self._tail
+            index = i & MASK
+            self._tail = tail[:index] + (value, ) + tail[index + 1:]
+        else:
+            self._root = self._set_in(self._shift, self._root, i, value)
+
+    @staticmethod
+    def _tail_offset_of(count: int) -> int:
+        return 0 if count < WIDTH else ((count - 1) >> BITS) << BITS
+
+    def _tail_offset(self) -> int:
+        return self._tail_offset_of(self._count)
+
+    def _checked_index(self, i: int) -> int:
+        i = op_index(i)
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("Vector index out of range")
+        return i
+
+    def _leaf_for(self, i: int) -> tuple:
+        if i >= self._tail_offset():
+            return self._tail
+
+        node = self._root
+        for level in range(self._shift, 0, -BITS):
+            node = node[(i >> level) & MASK]
+        return node
+
+    def _set_in(self, level: int, node: tuple, i: int, value: Any) -> tuple:
+        index = (i >> level) & MASK
+        child = value if not level else self._set_in(level - BITS, node[index], i, value)
+        return node[:index] + (child, ) + node[index + 1:]
+
+    def _push_tail(self, level: int, node: tuple, tail: tuple) -> tuple:
+        index = ((self._count - 1) >> level) & MASK
+
+        if level == BITS:
+            child = tail
+        elif index < len(node):
+            child = self._push_tail(level - BITS, node[index], tail)
+        else:
+            child = _new_path(level - BITS, tail)
+
+        return node[:index] + (child, ) + node[index + 1:]
+
+    def _pop_tail(self, level: int, node: tuple) -> Optional[tuple]:
+        index = ((self._count - 2) >> level) & MASK
+
+        if level > BITS:
+            child = self._pop_tail(level - BITS, node[index])
+            if child is None:
+                return node[:index] or None
+            return node[:index] + (child, )
+
+        return node[:index] or None
+
+    def copy(self) -> Self:
+        copy = Vector.__new__(Vector)
+        copy._count = self._count
+        copy._shift = self._shift
+        copy._root = self._root
+        copy._tail = self._tail
+        return copy
+
+    # Like slicing a list, but the elements aren't copied, see VectorSlice
+    def sliced(self, start: Optional[int], stop: Optional[int], step: Optional[int]) -> "Vector":
+        return VectorSlice.over(self.copy(), range(self._count)[start:stop:step])
+
+    def append(self, value: Any):
+        if len(self._tail) < WIDTH:
+            self._tail += (value, )
+            self._count += 1
+            return
+
+        # The tail is full, it becomes a leaf of the trie, which grows a level once its root is full
+        if (self._count >> BITS) > (1 << self._shift):
+            self._root = (self._root, _new_path(self._shift, self._tail))
+            self._shift += BITS
+        else:
+            self._root = self._push_tail(self._shift, self._root, self._tail)
+
+        self._tail = (value, )
+        self._count += 1
+
+    def extend(self, items: Iterable[Any]):
+        items = tuple(items)
+
+        # Rebuilding is linear, appending one by one costs a tail copy each
+        if len(items) > self._count:
+            self.__init__((*self, *items))
+            return
+
+        for item in items:
+            self.append(item)
+
+    def pop(self, i: int = -1) -> Any:
+        i = self._checked_index(i)
+
+        if i != self._count - 1:
+            items = list(self)
+            value = items.pop(i)
+            self.__init__(items)
+            return value
+
+        value = self._tail[-1]
+
+        if len(self._tail) > 1:
+            self._tail = self._tail[:-1]
+        elif self._count == 1:
+            self.__init__()
+            return value
+        else:
+            tail = self._leaf_for(self._count - 2)
+            root = self._pop_tail(self._shift, self._root) or ()
+
+            if self._shift > BITS and len(root) == 1:
+                root = root[0]
+                self._shift -= BITS
+
+            self._root = root
+            self._tail = tail
+
+        self._count -= 1
+        return value
+
+# Elements of a Vector at the indices of a range, read from the source's nodes where they are. The source is a copy
+# of the sliced Vector, so changing that one doesn't change the slice. The first change of the slice itself builds
+# the plain Vector it then is from its elements
+class VectorSlice(Vector):
+    __slots__ = ("_source", "_indices")
+
+    @classmethod
+    def over(cls, source: Vector, indices: range) -> Self:
+        vector_slice = cls.__new__(cls)
+        vector_slice._source = source
+        vector_slice._indices = indices
+        vector_slice._count = len(indices)
+        vector_slice._shift = BITS
+        vector_slice._root = None
+        vector_slice._tail = None
+        return vector_slice
+
+    def _own(self):
+        if self._source is not None:
+            items = tuple(self)
+            self._source = self._indices = None
+            Vector.__init__(self, items)
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._source is None:
+            return Vector.__iter__(self)
+
+        indices = self._indices
+        if indices.step == 1:
+            return self._iter_run(indices.start, indices.stop)
+        return map(self._source.__getitem__, indices)
+
+    # Consecutive elements are read a whole leaf at a time
+    def _iter_run(self, start: int, stop: int) -> Iterator[Any]:
+        source = self._source
+
+        while start < stop:
+            leaf = source._leaf_for(start)
+            offset = start & MASK
+            run = leaf[offset:offset + stop - start]
+            yield from run
+            start += len(run)
+
+    def shares_contents(self, other: Vector) -> bool:
+        if self._source is None:
+            return Vector.shares_contents(self, other)
+
+        return (
+            type(other) is VectorSlice and other._source is not None and
+            self._source.shares_contents(other._source) and self._indices == other._indices
+        )
+
+    def __getitem__(self, i: int) -> Any:
+        if self._source is None:
+            return Vector.__getitem__(self, i)
+
+        return self._source[self._indices[self._checked_index(i)]]
+
+    def __setitem__(self, i: int, value: Any):
+        self._checked_index(i)
+        self._own()
+        Vector.__setitem__(self, i, value)
+
+    def copy(self) -> Vector:
+        if self._source is None:
+            return Vector.copy(self)
+
+        return VectorSlice.over(self._source, self._indices)
+
+    def sliced(self, start: Optional[int], stop: Optional[int], step: Optional[int]) -> Vector:
+        if self._source is None:
+            return Vector.sliced(self, start, stop, step)
+
+        return VectorSlice.over(self._source, self._indices[start:stop:step])
+
+    def append(self, value: Any):
+        self._own()
+        Vector.append(self, value)
+
+    def extend(self, items: Iterable[Any]):
+        self._own()
+        Vector.extend(self, items)
+
+    def pop(self, i: int = -1) -> Any:
+        self._checked_index(i)
+        self._own()
+        return Vector.pop(self, i)
+
+# HAMT nodes. A BitmapNode only holds the children whose 5 bits of the hash are set in its bitmap, each being either
+# a (key, value) leaf or another node. Keys sharing their whole hash end up together in a CollisionNode
+class _BitmapNode:
+    __slots__ = ("bitmap", "children")
+
+    def __init__(self, bitmap: int, children: tuple):
+        self.bitmap = bitmap
+        self.children = children
+
+class _CollisionNode:
+    __slots__ = ("key_hash", "children")
+
+    def __init__(self, key_hash: int, children: tuple):
+        self.key_hash = key_hash
+        self.children = children
+
+_EMPTY_NODE = _BitmapNode(0, ())
+
+def _hash_of(key: Any) -> int:
+    return hash(key) & HASH_MASK
+
+def _pair_node(child1: Any, hash1: int, child2: Any, hash2: int, shift: int) -> Any:
+    if hash1 == hash2:
+        return _CollisionNode(hash1, (child1, child2))
+
+    index1 = (hash1 >> shift) & MASK
+    index2 = (hash2 >> shift) & MASK
+
+    if index1 == index2:
+        return _BitmapNode(1 << index1, (_pair_node(child1, hash1, child2, hash2, shift + BITS), ))
+
+    children = (child1, child2) if index1 < index2 else (child2, child1)
+    return _BitmapNode((1 << index1) | (1 << index2), children)
+
+def _hamt_get(node: Any, key: Any, key_hash: int) -> Any:
+    shift = 0
+
+    while True:
+        if type(node) is _CollisionNode:
+            if node.key_hash == key_hash:
+                for k, v in node.children:
+                    if k == key: return v
+            return _MISSING
+
+        bit = 1 << ((key_hash >> shift) & MASK)
+        if not node.bitmap & bit:
+            return _MISSING
+
+        child = node.children[(node.bitmap & (bit - 1)).bit_count()]
+
+        if type(child) is tuple:
+            return child[1] if child[0] == key else _MISSING
+
+        node = child
+        shift += BITS
+
+def _hamt_set(node: Any, key: Any, key_hash: int, value: Any, shift: int) -> Any:
+    leaf = (key, value)
+
+    if type(node) is _CollisionNode:
+        if node.key_hash != key_hash:
+            return _pair_node(node, node.key_hash, leaf, key_hash, shift)
+
+        for i, (k, _) in enumerate(node.children):
+            if k == key:
+                return _CollisionNode(key_hash, node.children[:i] + (leaf, ) + node.children[i + 1:])
+        return _CollisionNode(key_hash, node.children + (leaf, ))
+
+    bit = 1 << ((key_hash >> shift) & MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    children = node.children
+
+    if not node.bitmap & bit:
+        return _BitmapNode(node.bitmap | bit, children[:index] + (leaf, ) + children[index:])
+
+    child = children[index]
+
+    if type(child) is not tuple:
+        child = _hamt_set(child, key, key_hash, value, shift + BITS)
+    elif child[0] == key:
+        child = leaf
+    else:
+        child = _pair_node(child, _hash_of(child[0]), leaf, key_hash, shift + BITS)
+
+    return _BitmapNode(node.bitmap, children[:index] + (child, ) + children[index + 1:])
+
+# Builds the nodes of many (key, value, hash) leaves at once, instead of copying the path down to each one in turn
+def _hamt_build(leaves: list[tuple[Any, Any, int]], shift: int) -> Any:
+    first_hash = leaves[0][2]
+
+    if shift and all(leaf[2] == first_hash for leaf in leaves):
+        return _CollisionNode(first_hash, tuple((key, value) for key, value, _ in leaves))
+
+    buckets: dict[int, list] = {}
+    for leaf in leaves:
+        index = (leaf[2] >> shift) & MASK
+        bucket = buckets.get(index)
+
+        if bucket is None:
+            buckets[index] = [leaf]
+        else:
+            bucket.append(leaf)
+
+    bitmap = 0
+    children = []
+
+    for index in sorted(buckets):
+        bucket = buckets[index]
+        bitmap |= 1 << index
+        children.append(bucket[0][:2] if len(bucket) == 1 else _hamt_build(bucket, shift + BITS))
+
+    return _BitmapNode(bitmap, tuple(children))
+
+# Gives back the node without the key, a lone leaf when only one is left below the root, or None once empty
+def _hamt_remove(node: Any, key: Any, key_hash: int, shift: int) -> Any:
+    if type(node) is _CollisionNode:
+        children = tuple(child for child in node.children if child[0] != key)
+        return children[0] if len(children) == 1 else _CollisionNode(node.key_hash, children)
+
+    bit = 1 << ((key_hash >> shift) & MASK)
+    index = (node.bitmap & (bit - 1)).bit_count()
+    child = node.children[index]
+
+    if type(child) is not tuple:
+        child = _hamt_remove(child, key, key_hash, shift + BITS)
+
+        if child is not None:
+            return _BitmapNode(node.bitmap, node.children[:index] + (child, ) + node.children[index + 1:])
+
+    bitmap = node.bitmap & ~bit
+    children = node.children[:index] + node.children[index + 1:]
+
+    if not children:
+        return None
+    if shift and len(children) == 1 and type(children[0]) is tuple:
+        return children[0]
+
+    return _BitmapNode(bitmap, children)
+
+# HashMap, a HAMT from each key to the slot of its entry in a Vector of (key, value) entries, which keeps the keys in
+# insertion order. Removed entries leave an empty slot behind until there are enough of them to compact the entries
+class HashMap:
+    __slots__ = ("_index", "_entries", "_count")
+
+    def __init__(self, items: Iterable[Any] = ()):
+        # A dict drops the repeated keys the same way setting them one by one would
+        pairs = dict(items.items() if hasattr(items, "items") else items)
+
+        self._index = _hamt_build([(key, slot, _hash_of(key)) for slot, key in enumerate(pairs)], 0) if pairs else _EMPTY_NODE
+        self._entries = Vector(pairs.items())
+        self._count = len(pairs)
+
+    def __repr__(self) -> str:
+        return f"HashMap({dict(self.items())})"
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[Any]:
+        for entry in self._entries:
+            if entry is not None:
+                yield entry[0]
+
+    def __contains__(self, key: Any) -> bool:
+        return _hamt_get(self._index, key, _hash_of(key)) is not _MISSING
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, HashMap):
+            return NotImplemented
+        if self.shares_contents(other):
+            return True
+        if self._count != other._count:
+            return False
+
+        for key, value in self.items():
+            other_value = other.get(key, _MISSING)
+            if other_value is _MISSING or not other_value == value: return False
+
+        return True
+
+    __hash__ = None
+
+    def shares_contents(self, other: Self) -> bool:
+        return self._index is other._index and self._entries.shares_contents(other._entries)
+
+    def __getitem__(self, key: Any) -> Any:
+        slot = _hamt_get(self._index, key, _hash_of(key))
+        if slot is _MISSING:
+            raise KeyError(key)
+        return self._entries[slot][1]
+
+    def __setitem__(self, key: Any, value: Any):
+        key_hash = _hash_of(key)
+        slot = _hamt_get(self._index, key, key_hash)
+
+        if slot is not _MISSING:
+            self._entries[slot] = (key, value)
+            return
+
+        self._index = _hamt_set(self._index, key, key_hash, len(self._entries), 0)
+        self._entries.append((key, value))
+        self._count += 1
+
+    def __delitem__(self, key: Any):
+        key_hash = _hash_of(key)
+        slot = _hamt_get(self._index, key, key_hash)
+        if slot is _MISSING:
+            raise KeyError(key)
+
+        self._index = _hamt_remove(self._index, key, key_hash, 0) or _EMPTY_NODE
+        self._entries[slot] = None
+        self._count -= 1
+
+        if len(self._entries) > 2 * self._count + WIDTH:
+            self.__init__(tuple(self.items()))
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        slot = _hamt_get(self._index, key, _hash_of(key))
+        return default if slot is _MISSING else self._entries[slot][1]
+
+    def keys(self) -> Iterator[Any]:
+        return iter(self)
+
+    def values(self) -> Iterator[Any]:
+        for entry in self._entries:
+            if entry is not None:
+                yield entry[1]
+
+    def items(self) -> Iterator[tuple[Any, Any]]:
+        for entry in self._entries:
+            if entry is not None:
+                yield entry
+
+    def update(self, items: Any):
+        items = tuple(items.items() if hasattr(items, "items") else items)
+
+        for key, value in items:
+            self[key] = value
+
+    def copy(self) -> Self:
+        copy = HashMap.__new__(HashMap)
+        copy._index = self._index
+        copy._entries = self._entries.copy()
+        copy._count = self._count
+        return copy
+
+# Not persistent, for structures like deque and heapq lists that only change in place. Copies share the items and
+# count how many of them do, the first one changed while they're shared copies them for itself, so copying is free
+# and only a copy that's changed pays for it, once
+class CopyOnWrite:
+    __slots__ = ("items", "_owners")
+
+    def __init__(self, items: Any, _owners: list[int] = None):
+        self.items = items
+        self._owners = _owners or [1]
+
+    def __repr__(self) -> str:
+        return f"CopyOnWrite({self.items!r}, {self._owners[0]} owners)"
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.items)
+
+    def __getitem__(self, i: Any) -> Any:
+        return self.items[i]
+
+    def copy(self) -> Self:
+        self._owners[0] += 1
+        return CopyOnWrite(self.items, self._owners)
+
+    # The items, copied first if anything else still shares them
+    def writable(self) -> Any:
+        owners = self._owners
+
+        if owners[0] > 1:
+            owners[0] -= 1
+            self.items = self.items.copy()
+            self._owners = [1]
+
+        return self.items
@@ -0,0 +1,47 @@
+from typing import Self
+
+# Concatenations giving at least this many characters build a Rope instead of a new str
+ROPE_THRESHOLD = 256
+
+# Text made of pieces only joined into a str once it's needed. Ropes share their list of pieces, a rope is the first
+# count pieces of it, so the rope made last from it can add a piece in place instead of copying the text so far
+class Rope:
+    __slots__ = ("pieces", "count", "length", "flat")
+
+    def __init__(self, pieces: list[str], length: int):
+        self.pieces = pieces
+        self.count = len(pieces)
+        self.length = length
+        self.flat = None
+
+    def __repr__(self) -> str:
+        return f"Rope({self.count} pieces, {self.length} characters)"
+
+    def __len__(self) -> int:
+        return self.length
+
+    def flatten(self) -> str:
+        if self.flat is None:
+            pieces = self.pieces
+            self.flat = "".join(pieces if self.count == len(pieces) else pieces[:self.count])
+        return self.flat
+
+    def concatenated(self, text: str) -> Self:
+        pieces = self.pieces
+
+        # Another concatenation already added its piece after this rope's ones
+        if self.count != len(pieces):
+            pieces = pieces[:self.count]
+
+        pieces.append(text)
+        return Rope(pieces, self.length + len(text))
+
+def concatenate(left: str | Rope, right: str | Rope) -> str | Rope:
+    if type(right) is Rope:
+        right = right.flatten()
+
+    if type(left) is Rope:
+        return left.concatenated(right)
+
+    length = len(left) + len(right)
+    return left + right if length < ROPE_THRESHOLD else Rope([left, right], length)
@@ -25,4 +25,5 @@ def string_with_arrows(text: str, pos_start: Position, pos_end: Position):
         index_end = text.find("\n", index_start + 1)
         if index_end < 0: index_end = len(text)
 
-    return result.replace("\t", "")
+    # A tab is one column, like any other character
+    return result.replace("\t", " ").replace("\r", "")
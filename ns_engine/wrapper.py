@@ -1,12 +1,14 @@
-from typing import Tuple, Optional
+from typing import Iterable, Tuple, Optional
 from os.path import abspath as osp_abspath, dirname as osp_dirname
 from .components.lexer import Lexer
 from .components.parser import Parser
-from .components.interpreter import Interpreter
+from .components.interpreter import Interpreter, MAX_CALL_DEPTH
+from .components.optimizer import Optimizer
 from .components.token import Token, TokenType
 from .components.context import Context
 from .components.errors import Error
 from .components.node import Node
+from .components.output import Output, BUFFER_SIZE, redirected
 from .components.datatypes import List
 from .components.symbol_table import setup_starter_symbol_table
 from .utils.misc import temp_cwd
@@ -23,7 +25,7 @@ def is_valid_tokens(tokens: list[Token]) -> bool:
         
     return False
         
-def generate_ast(src_filename: str, src_data: str)-> Tuple[Optional[Node], Optional[Error]]:
+def generate_ast(src_filename: str, src_data: str, optimizations: dict[str, int] = None)-> Tuple[Optional[Node], Optional[Error]]:
     lexer = Lexer(src_filename, src_data)
     tokens, error = lexer.make_tokens()
     if error: 
@@ -33,23 +35,38 @@ def generate_ast(src_filename: str, src_data: str)-> Tuple[Optional[Node], Optio
     
     parser = Parser(tokens)
     ast = parser.parse()
-    return ast.node, ast.error
+    if ast.error:
+        return None, ast.error
+    
+    optimizer = Optimizer(optimizations)
+    return optimizer.optimize(ast.node), None
+
+def _output_of(kwargs: dict) -> Optional[Output]:
+    # Print goes to the output of the script running this one unless told otherwise, see Output
+    if any(name in kwargs for name in ("output", "flush_policy", "buffer_size")):
+        return Output(kwargs.get("output"), kwargs.get("flush_policy"), kwargs.get("buffer_size", BUFFER_SIZE))
+    
+    return None
+
+def _new_context(src_filename: str, abs_filepath: str, kwargs: dict) -> Context:
+    context = Context(kwargs.get("ctx_name", "__main__"))
+    context.symbol_table = setup_starter_symbol_table(__file__=abs_filepath) if src_filename != "<shell>" else shell_symbol_table
+    return context
 
 def interpret(src_filename: str, src_data: str, **kwargs) -> Tuple[Optional[List], Optional[Error], Optional[Context]]:
     abs_filepath = osp_abspath(src_filename)
     dir_filepath = osp_dirname(abs_filepath)
     
-    with temp_cwd(kwargs.get("cwd", dir_filepath)):
-        node, error = generate_ast(src_filename, src_data)
+    with temp_cwd(kwargs.get("cwd", dir_filepath)), redirected(_output_of(kwargs)):
+        node, error = generate_ast(src_filename, src_data, kwargs.get("optimizations"))
         if error: 
             return None, error, None
         elif not node: 
             return None, None, None
         
-        interpreter = Interpreter()
-        context = Context(kwargs.get("ctx_name", "__main__"))
-        context.symbol_table = setup_starter_symbol_table(__file__=abs_filepath) if src_filename != "<shell>" else shell_symbol_table
-        result = interpreter.visit(node, context)
+        interpreter = Interpreter(kwargs.get("max_call_depth", MAX_CALL_DEPTH))
+        context = _new_context(src_filename, abs_filepath, kwargs)
+        result = interpreter.run(node, context)
         
         # hey look, it's the walrus operator
         if cnp := kwargs.get("ctx_name_post", False):
@@ -57,6 +74,41 @@ def interpret(src_filename: str, src_data: str, **kwargs) -> Tuple[Optional[List
         
         return result.value, result.error, context
 
+# Runs src_data once for every line, like awk. It's parsed once, begin_data runs before the first line and end_data
+# after the last one, all of them sharing the same variables. Lines are given without their newline
+def interpret_each_line(src_filename: str, src_data: str, lines: Iterable[str],
+                        begin_data: str = None, end_data: str = None, **kwargs) -> Tuple[Optional[Error], Optional[Context]]:
+    abs_filepath = osp_abspath(src_filename)
+    dir_filepath = osp_dirname(abs_filepath)
+    
+    with temp_cwd(kwargs.get("cwd", dir_filepath)), redirected(_output_of(kwargs)):
+        nodes: list[Optional[Node]] = []
+        
+        for filename, data in (("<begin>", begin_data), (src_filename, src_data), ("<end>", end_data)):
+            node, error = generate_ast(filename, data, kwargs.get("optimizations")) if data else (None, None)
+            if error: return error, None
+            nodes.append(node)
+        
+        begin_node, node, end_node = nodes
+        interpreter = Interpreter(kwargs.get("max_call_depth", MAX_CALL_DEPTH))
+        context = _new_context(src_filename, abs_filepath, kwargs)
+        
+        if begin_node:
+            result = interpreter.run(begin_node, context)
+            if result.error: return result.error, context
+        
+        if node:
+            lines = (line[:-1] if line[-1:] == "\n" else line for line in lines)
+            result = interpreter.run_each_line(node, context, lines)
+            if result.error: return result.error, context
+        
+        if end_node:
+            result = interpreter.run(end_node, context)
+            if result.error: return result.error, context
+        
+        return None, context
+
 __all__ = [
-    "interpret"
+    "interpret",
+    "interpret_each_line"
 ]